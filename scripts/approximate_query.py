@@ -0,0 +1,189 @@
+"""
+scripts/approximate_query.py
+
+Approximate cube aggregates with confidence intervals, from the sale sample.
+
+Exploratory questions such as "sales by campaign by category" don't need an
+exact ``create_olap_cube`` over all history. ``approximate_aggregate`` answers
+them from the stratified sample maintained by the ETL (scripts/sale_sample.py),
+weighting every sampled sale by its stratum's population / sample size, and
+returns each cell's sum, count and mean with a confidence interval.
+
+Callers can trade accuracy for speed. With an ``error_target`` the estimate
+starts from the first rows of every stratum's sample (a smaller uniform
+sample) and doubles them until every cell's sum is within the target
+relative error; with a ``latency_budget_s`` it stops doubling before the
+next step would run past the budget. Without either it uses the whole sample.
+"""
+
+import pathlib
+import statistics
+import sys
+import time
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts.warehouse import DB_PATH, read_sql  # noqa: E402
+from scripts.dimension_cache import get_dimension_cache  # noqa: E402
+
+# Constants
+DEFAULT_CONFIDENCE: float = 0.95
+START_ROWS_PER_STRATUM: int = 100  # first step of a progressive estimate
+SAMPLE_DIMENSIONS: List[str] = ["campaign_name", "category", "payment_type", "store_id", "Month", "Year"]
+SAMPLE_QUERY = """
+SELECT ss.*, st.population, d.month AS Month, d.year AS Year
+FROM sale_sample ss
+JOIN sale_stratum st ON ss.stratum = st.stratum
+LEFT JOIN date d ON ss.date_key = d.date_key
+"""
+
+
+class ApproximateResult(NamedTuple):
+    """Estimated cube cells and how they were computed."""
+
+    cube: pd.DataFrame
+    rows_per_stratum: int  # sample rows used from each stratum
+    relative_error: float  # largest half-width / |sum| over the cells
+    complete: bool  # True if the whole sample was used
+
+
+def load_sample(db_path: pathlib.Path = DB_PATH) -> pd.DataFrame:
+    """
+    Read the sale sample with its stratum sizes and the usual cube dimensions.
+
+    Returns:
+        pd.DataFrame: Sampled sales ordered by stratum and priority, with ``sample_rank``
+            (1 = lowest priority in its stratum).
+    """
+    try:
+        sample_df = read_sql(SAMPLE_QUERY, db_path=db_path)
+    except Exception as e:
+        logger.error(f"Error loading the sale sample: {e}")
+        raise
+    sample_df = get_dimension_cache(db_path).enrich(sample_df, ["campaign_name"])
+    sample_df = sample_df.sort_values(["stratum", "priority"], kind="stable", ignore_index=True)
+    sample_df["sample_rank"] = sample_df.groupby("stratum").cumcount() + 1
+    return sample_df
+
+
+def _stratum_variance(
+    population: pd.Series, sample_size: pd.Series, total: pd.Series, squares: pd.Series
+) -> pd.Series:
+    # Variance of the estimated total of z over one stratum, from the sum and sum of
+    # squares of z over its sample (z is 0 for sampled sales outside the cell)
+    spread = (squares - total**2 / sample_size) / (sample_size - 1)
+    variance = population**2 * (1 - sample_size / population) * spread / sample_size
+    return variance.where(sample_size > 1, 0.0).clip(lower=0.0)
+
+
+def estimate_cells(
+    sample_df: pd.DataFrame,
+    dimensions: List[str],
+    measure: str = "sale_amount",
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> pd.DataFrame:
+    """
+    Estimate sum, count and mean of a measure per cell from a stratified sample.
+
+    Args:
+        sample_df (pd.DataFrame): Sample rows with ``stratum`` and ``population`` columns.
+        dimensions (list): Columns to group by, e.g. ["campaign_name", "category"].
+        measure (str): Column to aggregate.
+        confidence (float): Confidence level of the intervals.
+
+    Returns:
+        pd.DataFrame: One row per cell with ``<measure>_sum``, ``<measure>_mean`` and
+            ``sale_id_count``, each with ``_low`` and ``_high`` interval bounds.
+    """
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    strata = sample_df.groupby("stratum").agg(n=("population", "size"), population=("population", "first"))
+    values = sample_df[measure].astype(float)
+    parts = sample_df[["stratum", *dimensions]].assign(y=values, y2=values**2)
+    cells = parts.groupby(["stratum", *dimensions]).agg(c=("y", "size"), s=("y", "sum"), q=("y2", "sum"))
+    cells = cells.join(strata, on="stratum")
+    weight = cells["population"] / cells["n"]
+
+    cells["sum"] = weight * cells["s"]
+    cells["count"] = weight * cells["c"]
+    cells["sum_var"] = _stratum_variance(cells["population"], cells["n"], cells["s"], cells["q"])
+    cells["count_var"] = _stratum_variance(cells["population"], cells["n"], cells["c"], cells["c"])
+    totals = cells.groupby(dimensions)[["sum", "count"]].sum()
+
+    # Mean = sum / count; its variance comes from the residuals y - mean within the cell
+    mean = cells.join((totals["sum"] / totals["count"]).rename("mean"), on=dimensions)["mean"]
+    residual_total = cells["s"] - mean * cells["c"]
+    residual_squares = cells["q"] - 2 * mean * cells["s"] + mean**2 * cells["c"]
+    cells["mean_var"] = _stratum_variance(cells["population"], cells["n"], residual_total, residual_squares)
+    variances = cells.groupby(dimensions)[["sum_var", "count_var", "mean_var"]].sum()
+
+    cube = pd.DataFrame(index=totals.index)
+    half_widths = {
+        f"{measure}_sum": (totals["sum"], z * np.sqrt(variances["sum_var"])),
+        f"{measure}_mean": (totals["sum"] / totals["count"], z * np.sqrt(variances["mean_var"]) / totals["count"]),
+        "sale_id_count": (totals["count"], z * np.sqrt(variances["count_var"])),
+    }
+    for name, (estimate, half_width) in half_widths.items():
+        cube[name] = estimate
+        cube[f"{name}_low"] = estimate - half_width
+        cube[f"{name}_high"] = estimate + half_width
+    return cube.reset_index()
+
+
+def relative_error(cube: pd.DataFrame, measure: str = "sale_amount") -> float:
+    """Return the largest interval half-width relative to the estimated sum over the cells."""
+    estimate = cube[f"{measure}_sum"].abs()
+    half_width = (cube[f"{measure}_sum_high"] - cube[f"{measure}_sum_low"]) / 2
+    errors = half_width[estimate > 0] / estimate[estimate > 0]
+    return float(errors.max()) if not errors.empty else 0.0
+
+
+def approximate_aggregate(
+    sample_df: pd.DataFrame,
+    dimensions: List[str],
+    measure: str = "sale_amount",
+    confidence: float = DEFAULT_CONFIDENCE,
+    error_target: Optional[float] = None,
+    latency_budget_s: Optional[float] = None,
+) -> ApproximateResult:
+    """
+    Estimate cube cells from the sample, within an error target or latency budget.
+
+    Args:
+        sample_df (pd.DataFrame): The sample from load_sample().
+        dimensions (list): Columns to group by.
+        measure (str): Column to aggregate.
+        confidence (float): Confidence level of the intervals.
+        error_target (float, optional): Stop once every cell's sum is within this relative error.
+        latency_budget_s (float, optional): Stop before the next refinement would exceed this time.
+
+    Returns:
+        ApproximateResult: The estimated cells and the precision reached.
+    """
+    started = time.monotonic()
+    max_rows = int(sample_df["sample_rank"].max()) if not sample_df.empty else 0
+    progressive = error_target is not None or latency_budget_s is not None
+    rows = min(START_ROWS_PER_STRATUM, max_rows) if progressive else max_rows
+    while True:
+        step_started = time.monotonic()
+        cube = estimate_cells(sample_df[sample_df["sample_rank"] <= rows], dimensions, measure, confidence)
+        error = relative_error(cube, measure)
+        now = time.monotonic()
+        if rows >= max_rows or (error_target is not None and error <= error_target):
+            break
+        # The next step reads twice the rows, so expect it to take about twice as long
+        if latency_budget_s is not None and now + 2 * (now - step_started) > started + latency_budget_s:
+            break
+        rows = min(rows * 2, max_rows)
+    logger.info(
+        f"Approximate aggregate by {dimensions}: {rows} rows per stratum, "
+        f"relative error {error:.3f} in {time.monotonic() - started:.3f}s."
+    )
+    return ApproximateResult(cube, rows, error, rows >= max_rows)
@@ -0,0 +1,214 @@
+"""
+scripts/bitmap_index.py
+
+Bitmap indexes over the low-cardinality sales dimensions for fast slicing.
+
+For each dimension (campaign_name, category, payment_type, store_id, region)
+every distinct value gets a bitset with one bit per sale row, packed eight
+rows to a byte. A slice such as
+``campaign_name=SUMMER SALE and category in (CLOTHING, SPORTS)`` is answered
+by OR-ing the bitsets of the values within a dimension and AND-ing across
+dimensions (whole-byte NumPy operations), then aggregating the measure
+columns over only the selected rows.
+
+olap_cubing builds the index from the sales it cubes and saves it next to the
+cube (``<cube>.bitmaps.npz``, zlib-compressed, so sparse bitsets take little
+space on disk). Row-level columns (sale_amount, date_key) are stored with it.
+
+Bits are set directly in the packed arrays, so building, appending and
+taking rows never materialize a one-byte-per-row matrix for every value.
+"""
+
+import os
+import pathlib
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Constants
+SLICE_DIMENSIONS: List[str] = ["campaign_name", "category", "payment_type", "store_id", "region"]
+ROW_COLUMNS: List[str] = ["sale_amount", "date_key"]
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+Filters = Dict[str, Union[object, Sequence[object]]]
+
+
+def bitmap_index_path(cube_path: pathlib.Path) -> pathlib.Path:
+    """Return the bitmap index file saved next to a cube file."""
+    return cube_path.with_name(f"{cube_path.stem}.bitmaps.npz")
+
+
+def _n_bytes(n_rows: int) -> int:
+    return (n_rows + 7) // 8
+
+
+def _set_bits(bits: np.ndarray, codes: np.ndarray, rows: np.ndarray) -> None:
+    """Set bit ``rows[i]`` of bitset ``codes[i]`` in place (most significant bit first, like np.packbits)."""
+    np.bitwise_or.at(bits, (codes, rows >> 3), (0x80 >> (rows & 7)).astype(np.uint8))
+
+
+def _shift_into(target: np.ndarray, bits: np.ndarray, start_row: int) -> None:
+    """OR packed bitsets into target starting at row ``start_row`` (target's bits from there on must be 0)."""
+    start, shift = divmod(start_row, 8)
+    if shift == 0:
+        target[:, start:start + bits.shape[1]] |= bits
+        return
+    wide = bits.astype(np.uint16)
+    width = target.shape[1] - start
+    target[:, start:start + bits.shape[1]] |= (wide >> shift).astype(np.uint8)[:, :width]
+    spill = ((wide << (8 - shift)) & 0xFF).astype(np.uint8)[:, :width - 1]
+    target[:, start + 1:start + 1 + spill.shape[1]] |= spill
+
+
+class BitmapIndex:
+    """
+    Packed bitsets per dimension value, plus row-level columns to aggregate.
+
+    Parameters:
+        n_rows (int): Number of indexed rows.
+        bitmaps (dict): Dimension -> (values, bits), where ``values`` are the distinct values as
+            strings and ``bits`` is a uint8 array of shape (len(values), ceil(n_rows / 8)).
+        columns (dict): Column name -> array of length n_rows, e.g. sale_amount.
+    """
+
+    def __init__(self, n_rows: int, bitmaps: Dict[str, tuple], columns: Dict[str, np.ndarray]):
+        self.n_rows = n_rows
+        self.bitmaps = bitmaps
+        self.columns = columns
+        self._positions = {
+            dimension: {value: position for position, value in enumerate(values)}
+            for dimension, (values, _) in bitmaps.items()
+        }
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        dimensions: Iterable[str] = SLICE_DIMENSIONS,
+        columns: Iterable[str] = ROW_COLUMNS,
+    ) -> "BitmapIndex":
+        """Index the given dimensions of a frame (missing values are in no bitset)."""
+        n_rows = len(df)
+        bitmaps = {}
+        for dimension in dimensions:
+            codes, uniques = pd.factorize(df[dimension])
+            rows = np.flatnonzero(codes >= 0)
+            bits = np.zeros((len(uniques), _n_bytes(n_rows)), dtype=np.uint8)
+            _set_bits(bits, codes[rows], rows)
+            bitmaps[dimension] = (np.asarray(uniques).astype(str), bits)
+        return cls(n_rows, bitmaps, {name: df[name].to_numpy() for name in columns})
+
+    def select(self, filters: Optional[Filters] = None) -> np.ndarray:
+        """
+        Return the packed row mask matching every filter.
+
+        Args:
+            filters (dict): Dimension -> value or list of values (OR-ed); dimensions are AND-ed.
+                Values are matched by their string form, so store_id=403 and "403" are the same.
+
+        Raises:
+            ValueError: If a dimension is not indexed.
+        """
+        mask = np.full(_n_bytes(self.n_rows), 0xFF, dtype=np.uint8)
+        if self.n_rows % 8:
+            mask[-1] = (0xFF << (8 - self.n_rows % 8)) & 0xFF  # padding bits stay 0
+        for dimension, wanted in (filters or {}).items():
+            if dimension not in self.bitmaps:
+                raise ValueError(f"Dimension '{dimension}' is not indexed. Use one of {list(self.bitmaps)}.")
+            values, bits = self.bitmaps[dimension]
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            positions = [self._positions[dimension][str(value)] for value in wanted
+                         if str(value) in self._positions[dimension]]
+            matched = np.bitwise_or.reduce(bits[positions], axis=0) if positions else np.zeros_like(mask)
+            mask &= matched
+        return mask
+
+    def count(self, mask: np.ndarray) -> int:
+        """Return the number of rows in a packed mask."""
+        return int(_POPCOUNT[mask].sum(dtype=np.int64))
+
+    def positions(self, mask: np.ndarray) -> np.ndarray:
+        """Return the row positions in a packed mask."""
+        return np.flatnonzero(np.unpackbits(mask, count=self.n_rows))
+
+    def aggregate(self, filters: Optional[Filters] = None, column: str = "sale_amount") -> Dict[str, float]:
+        """Return the row count and the sum of a column over the rows matching the filters."""
+        selected = self.positions(self.select(filters))
+        return {"count": len(selected), "sum": float(self.columns[column][selected].sum())}
+
+    def aggregate_by(
+        self, dimension: str, filters: Optional[Filters] = None, column: str = "sale_amount"
+    ) -> Dict[str, Dict[str, float]]:
+        """Return count and sum per value of one dimension, over the rows matching the filters."""
+        if dimension not in self.bitmaps:
+            raise ValueError(f"Dimension '{dimension}' is not indexed. Use one of {list(self.bitmaps)}.")
+        mask = self.select(filters)
+        values, bits = self.bitmaps[dimension]
+        result = {}
+        for value, value_bits in zip(values, bits):
+            selected = self.positions(mask & value_bits)
+            if len(selected):
+                result[str(value)] = {"count": len(selected), "sum": float(self.columns[column][selected].sum())}
+        return result
+
+    def take(self, keep: np.ndarray) -> "BitmapIndex":
+        """
+        Return an index over only the rows where the boolean array ``keep`` is True.
+
+        Each bitset is unpacked on its own, so at most one row-sized scratch array
+        exists at a time.
+        """
+        n_rows = int(keep.sum())
+        new_rows = np.cumsum(keep) - 1
+        bitmaps = {}
+        for dimension, (values, bits) in self.bitmaps.items():
+            taken = np.zeros((len(values), _n_bytes(n_rows)), dtype=np.uint8)
+            for code, value_bits in enumerate(bits):
+                rows = np.flatnonzero(np.unpackbits(value_bits, count=self.n_rows))
+                rows = new_rows[rows[keep[rows]]]
+                _set_bits(taken, np.full(len(rows), code), rows)
+            bitmaps[dimension] = (values, taken)
+        return BitmapIndex(n_rows, bitmaps, {name: array[keep] for name, array in self.columns.items()})
+
+    def append(self, other: "BitmapIndex") -> "BitmapIndex":
+        """Return an index over this index's rows followed by another index's rows (bit-shifted, never unpacked)."""
+        n_rows = self.n_rows + other.n_rows
+        bitmaps = {}
+        for dimension, (values, bits) in self.bitmaps.items():
+            other_values, other_bits = other.bitmaps[dimension]
+            merged_values = np.union1d(values, other_values)
+            merged = np.zeros((len(merged_values), _n_bytes(n_rows)), dtype=np.uint8)
+            merged[np.searchsorted(merged_values, values), :bits.shape[1]] = bits
+            shifted = np.zeros((len(other_values), merged.shape[1]), dtype=np.uint8)
+            _shift_into(shifted, other_bits, self.n_rows)
+            merged[np.searchsorted(merged_values, other_values)] |= shifted
+            bitmaps[dimension] = (merged_values, merged)
+        columns = {name: np.concatenate([array, other.columns[name]]) for name, array in self.columns.items()}
+        return BitmapIndex(n_rows, bitmaps, columns)
+
+    def save(self, path: pathlib.Path) -> None:
+        """Save the index atomically (compressed .npz)."""
+        arrays = {"n_rows": np.array(self.n_rows)}
+        for dimension, (values, bits) in self.bitmaps.items():
+            arrays[f"values:{dimension}"] = values
+            arrays[f"bits:{dimension}"] = bits
+        for name, array in self.columns.items():
+            arrays[f"column:{name}"] = array
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "wb") as file:
+            np.savez_compressed(file, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "BitmapIndex":
+        """Load an index saved with save()."""
+        with np.load(path) as data:
+            bitmaps, columns = {}, {}
+            for key in data.files:
+                kind, _, name = key.partition(":")
+                if kind == "values":
+                    bitmaps[name] = (data[key], data[f"bits:{name}"])
+                elif kind == "column":
+                    columns[name] = data[key]
+            return cls(int(data["n_rows"]), bitmaps, columns)
@@ -0,0 +1,127 @@
+"""
+scripts/campaign_facts.py
+
+Precomputed campaign attribution facts for the data warehouse.
+
+Each sale is attributed to the campaign active on its date through the
+date dimension (whose campaign_id comes from an interval join on the
+campaign start and end dates). The ETL then stores:
+
+- ``campaign.campaign_length``: days each campaign ran. For NO CAMPAIGN it is
+  the number of days in the sales calendar not covered by any campaign.
+- ``campaign_day_sales``: one row per campaign per day with the sale count,
+  total and the campaign-relative sale (total / campaign_length).
+- ``sale_campaign``: a view giving every sale its attributed campaign,
+  campaign_length and campaign_relative_sale.
+
+Reports read these directly instead of rescanning the sale table per row.
+"""
+
+import pathlib
+import sqlite3
+import sys
+from typing import List, Optional, Tuple
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts.date_dimension import NO_CAMPAIGN_ID  # noqa: E402
+from scripts import sale_partitions  # noqa: E402
+
+SALE_CAMPAIGN_VIEW_SQL = """
+CREATE VIEW IF NOT EXISTS sale_campaign AS
+SELECT
+    s.sale_id,
+    s.date_key,
+    d.campaign_id,
+    c.campaign_length,
+    s.sale_amount,
+    s.sale_amount * 1.0 / c.campaign_length AS campaign_relative_sale
+FROM sale s
+JOIN date d ON s.date_key = d.date_key
+JOIN campaign c ON d.campaign_id = c.campaign_id
+"""
+
+
+def _date_key_range(column: str, start_key: Optional[int], end_key: Optional[int]) -> Tuple[str, List[int]]:
+    """Return a WHERE clause limiting column to [start_key, end_key] and its parameters, or no clause."""
+    if start_key is None or end_key is None:
+        return "", []
+    return f"WHERE {column} BETWEEN ? AND ?", [start_key, end_key]
+
+
+def update_campaign_lengths(cursor: sqlite3.Cursor, suffix: str = "") -> None:
+    """Set campaign.campaign_length from the campaign dates and the date dimension."""
+    cursor.execute(
+        f"""
+        UPDATE campaign{suffix}
+        SET campaign_length = CAST(julianday(end_date) - julianday(start_date) AS INTEGER) + 1
+        WHERE campaign_id != ?
+        """,
+        (NO_CAMPAIGN_ID,),
+    )
+    cursor.execute(
+        f"""
+        UPDATE campaign{suffix}
+        SET campaign_length = (SELECT COUNT(*) FROM date{suffix} WHERE campaign_active = 0)
+        WHERE campaign_id = ?
+        """,
+        (NO_CAMPAIGN_ID,),
+    )
+
+
+def refresh_campaign_day_sales(
+    cursor: sqlite3.Cursor,
+    suffix: str = "",
+    start_key: Optional[int] = None,
+    end_key: Optional[int] = None,
+) -> None:
+    """
+    Rebuild campaign_day_sales rows, for every day or only for a date_key range.
+
+    Args:
+        cursor (sqlite3.Cursor): Writer cursor.
+        suffix (str): Table suffix, e.g. the ETL's shadow suffix during a full load.
+        start_key (int, optional): First date_key to refresh. Refreshes all days if omitted.
+        end_key (int, optional): Last date_key to refresh.
+    """
+    sale_source = sale_partitions.sale_source(cursor, suffix)
+    where, params = _date_key_range("date_key", start_key, end_key)
+    sale_where, sale_params = _date_key_range("s.date_key", start_key, end_key)
+    cursor.execute(f"DELETE FROM campaign_day_sales{suffix} {where}", params)
+    cursor.execute(
+        f"""
+        INSERT INTO campaign_day_sales{suffix} (campaign_id, date_key, sale_count, sale_amount_sum)
+        SELECT d.campaign_id, s.date_key, COUNT(*), SUM(s.sale_amount)
+        FROM {sale_source} s
+        JOIN date{suffix} d ON s.date_key = d.date_key
+        {sale_where}
+        GROUP BY d.campaign_id, s.date_key
+        """,
+        sale_params,
+    )
+    # Lengths can change for every day (NO CAMPAIGN grows with the calendar), so restamp them all
+    cursor.execute(
+        f"""
+        UPDATE campaign_day_sales{suffix}
+        SET campaign_length = (
+                SELECT c.campaign_length FROM campaign{suffix} c
+                WHERE c.campaign_id = campaign_day_sales{suffix}.campaign_id
+            )
+        """
+    )
+    cursor.execute(
+        f"""
+        UPDATE campaign_day_sales{suffix}
+        SET campaign_relative_sale = sale_amount_sum * 1.0 / NULLIF(campaign_length, 0)
+        """
+    )
+    logger.info("Campaign day sales refreshed.")
+
+
+def create_sale_campaign_view(cursor: sqlite3.Cursor) -> None:
+    """Create the per-sale campaign attribution view if it doesn't exist."""
+    cursor.execute(SALE_CAMPAIGN_VIEW_SQL)
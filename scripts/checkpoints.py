@@ -0,0 +1,136 @@
+"""
+scripts/checkpoints.py
+
+Checkpoint/restart support for long-running prep and load jobs.
+
+- Data prep writes each cleaned chunk to its own part file and records it in a
+  JSON manifest next to the parts. A rerun on the same raw file skips every
+  chunk already in the manifest; the parts are combined into the prepared
+  file only once all chunks are done.
+- The warehouse load records each committed step (and the row offset of the
+  sales loaded so far) in a ``load_checkpoint`` table, in the same transaction
+  as the rows themselves. A rerun on the same prepared files keeps the shadow
+  tables and resumes after the last committed step; a step is therefore
+  either fully applied or not at all.
+
+Both checkpoints are tied to a signature of their input files, so changed
+inputs always start from zero.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import sqlite3
+import sys
+from typing import Dict, Iterable, List, Optional, Union
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+
+# Constants
+MANIFEST_NAME: str = "manifest.json"
+LOAD_CHECKPOINT_TABLE: str = "load_checkpoint"
+
+
+def file_signature(paths: Iterable[Union[str, pathlib.Path]]) -> str:
+    """Return a sha256 over the contents of the given files (the checkpoint's input identity)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkManifest:
+    """
+    Completed-chunk manifest for a chunked prep job.
+
+    Parameters:
+        chunk_dir (Path): Directory holding the part files and the manifest.
+        signature (str): Signature of the input; a manifest for another input is discarded.
+    """
+
+    def __init__(self, chunk_dir: pathlib.Path, signature: str):
+        self.chunk_dir = chunk_dir
+        self.signature = signature
+        self.path = chunk_dir.joinpath(MANIFEST_NAME)
+        self.completed: Dict[int, str] = {}
+        if self.path.exists():
+            manifest = json.loads(self.path.read_text())
+            if manifest.get("signature") == signature:
+                self.completed = {int(index): name for index, name in manifest["chunks"].items()}
+                logger.info(f"Resuming from {len(self.completed)} completed chunks in {chunk_dir}")
+            else:
+                logger.info(f"Input changed since the last run; discarding chunks in {chunk_dir}")
+                shutil.rmtree(chunk_dir)
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+
+    def is_done(self, index: int) -> bool:
+        """Return True if chunk ``index`` was already prepared."""
+        return index in self.completed
+
+    def part_path(self, index: int) -> pathlib.Path:
+        """Return the part file path for chunk ``index``."""
+        return self.chunk_dir.joinpath(f"part-{index:05d}.csv")
+
+    def mark_done(self, index: int) -> None:
+        """Record chunk ``index`` as prepared (its part file must already be written)."""
+        self.completed[index] = self.part_path(index).name
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps({"signature": self.signature, "chunks": self.completed}))
+        os.replace(tmp_path, self.path)
+
+    def part_paths(self) -> List[pathlib.Path]:
+        """Return the completed part files in chunk order."""
+        return [self.chunk_dir.joinpath(self.completed[index]) for index in sorted(self.completed)]
+
+    def clear(self) -> None:
+        """Remove the part files and manifest once the job has finished."""
+        shutil.rmtree(self.chunk_dir, ignore_errors=True)
+
+
+def create_load_checkpoint_table(cursor: sqlite3.Cursor) -> None:
+    """Create the load checkpoint table if it doesn't exist."""
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {LOAD_CHECKPOINT_TABLE} (
+            step TEXT PRIMARY KEY,
+            signature TEXT NOT NULL,
+            rows_done INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+
+
+def read_load_checkpoints(cursor: sqlite3.Cursor, signature: str) -> Optional[Dict[str, int]]:
+    """
+    Return the committed steps of an interrupted load of the same inputs.
+
+    Returns:
+        dict or None: Step name -> rows done, or None if there is nothing to resume.
+    """
+    create_load_checkpoint_table(cursor)
+    rows = cursor.execute(f"SELECT step, signature, rows_done FROM {LOAD_CHECKPOINT_TABLE}").fetchall()
+    if not rows or any(row[1] != signature for row in rows):
+        return None
+    return {step: rows_done for step, _, rows_done in rows}
+
+
+def save_load_checkpoint(cursor: sqlite3.Cursor, step: str, signature: str, rows_done: int = 0) -> None:
+    """Record a load step; commit it in the same transaction as the step's rows."""
+    cursor.execute(
+        f"INSERT OR REPLACE INTO {LOAD_CHECKPOINT_TABLE} (step, signature, rows_done) VALUES (?, ?, ?)",
+        (step, signature, rows_done),
+    )
+
+
+def clear_load_checkpoints(cursor: sqlite3.Cursor) -> None:
+    """Forget the load checkpoints (the load has been swapped in or is starting over)."""
+    cursor.execute(f"DROP TABLE IF EXISTS {LOAD_CHECKPOINT_TABLE}")
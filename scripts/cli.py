@@ -0,0 +1,151 @@
+"""
+scripts/cli.py
+
+Single command-line entry point for the pipeline.
+
+Run from anywhere (the working directory is switched to the project root):
+
+    python -m scripts.cli prep
+    python -m scripts.cli load
+    python -m scripts.cli load-sales sales_data_prepared.csv
+    python -m scripts.cli compact
+    python -m scripts.cli cube
+    python -m scripts.cli report
+    python -m scripts.cli watch
+    python -m scripts.cli serve
+    python -m scripts.cli import-budget
+
+This module imports only the standard library. Each subcommand's module (and
+with it pandas, matplotlib and the logger, which opens logs/) is imported
+only when that subcommand runs, so ``--help`` and small scheduled jobs don't
+pay for libraries they never use. ``import-budget`` imports the CLI and
+then each subcommand's module in a fresh interpreter. It fails if the CLI
+takes more than IMPORT_BUDGET_MS or pulls in any heavy library, or if a
+subcommand module takes more than SUBCOMMAND_BUDGET_MS or pulls in a heavy
+library beyond pandas, numpy and the logger (matplotlib, for instance, is
+only imported when a chart is drawn).
+"""
+
+import argparse
+import importlib
+import os
+import pathlib
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Constants
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+IMPORT_BUDGET_MS: float = 100.0  # cumulative import time of this module in a fresh interpreter
+SUBCOMMAND_BUDGET_MS: float = 1000.0  # cumulative import time of one subcommand's module, pandas included
+HEAVY_MODULES: Tuple[str, ...] = ("pandas", "numpy", "matplotlib", "loguru")
+SUBCOMMAND_HEAVY_MODULES: Tuple[str, ...] = ("pandas", "numpy", "loguru")  # every subcommand needs these
+
+
+class Command(NamedTuple):
+    """A subcommand: the module and function it runs, imported on demand."""
+
+    module: str
+    function: str
+    help: str
+    takes_file: bool = False
+
+
+COMMANDS: Dict[str, Command] = {
+    "prep": Command("scripts.data_prep", "main", "Clean the raw CSV files into data/prepared."),
+    "load": Command("scripts.etl_to_dw", "load_data_to_db", "Load the prepared files into the warehouse."),
+    "load-sales": Command(
+        "scripts.etl_to_dw", "load_new_sales_to_db", "Incrementally load a prepared sales file.", takes_file=True
+    ),
+    "compact": Command("scripts.etl_to_dw", "compact_sales", "Merge staged incremental sales into the partitions."),
+    "cube": Command("scripts.olap_cubing", "main", "Build the OLAP cube from the warehouse."),
+    "report": Command("scripts.olap_sales_per_campaign", "main", "Render the sales-per-campaign reports."),
+    "watch": Command("scripts.watch_ingest", "main", "Ingest new sales files dropped into data/raw."),
+    "serve": Command("scripts.report_service", "main", "Run the HTTP report service."),
+}
+
+
+def measure_import(module: str = "scripts.cli") -> Tuple[float, List[str]]:
+    """
+    Import a module in a fresh interpreter and report its cost.
+
+    Returns:
+        tuple: (cumulative import time in milliseconds, heavy modules it loaded).
+    """
+    probe = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1])
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return cumulative_us / 1000, heavy
+
+
+def _within_budget(module: str, budget_ms: float, allowed: Tuple[str, ...]) -> bool:
+    """Print one module's import cost and return True if it is within budget and loads no unexpected heavy library."""
+    elapsed_ms, heavy = measure_import(module)
+    unexpected = [name for name in heavy if name not in allowed]
+    print(f"{module} import: {elapsed_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    if unexpected:
+        print(f"Heavy modules imported by {module}: {', '.join(unexpected)}")
+    return elapsed_ms <= budget_ms and not unexpected
+
+
+def check_import_budget(
+    budget_ms: float = IMPORT_BUDGET_MS, subcommand_budget_ms: float = SUBCOMMAND_BUDGET_MS
+) -> bool:
+    """Check the CLI's and every subcommand module's import cost; return True if all are within budget."""
+    within_budget = _within_budget("scripts.cli", budget_ms, ())
+    for module in sorted({command.module for command in COMMANDS.values()}):
+        within_budget = _within_budget(module, subcommand_budget_ms, SUBCOMMAND_HEAVY_MODULES) and within_budget
+    return within_budget
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser; no subcommand module is imported here."""
+    parser = argparse.ArgumentParser(prog="python -m scripts.cli", description="Smart sales pipeline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, command in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=command.help)
+        if command.takes_file:
+            subparser.add_argument("file_name", help="File name in data/prepared.")
+    budget = subparsers.add_parser("import-budget", help="Check the CLI and subcommand import times.")
+    budget.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    budget.add_argument("--subcommand-budget-ms", type=float, default=SUBCOMMAND_BUDGET_MS)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse the arguments and run the chosen subcommand."""
+    args = build_parser().parse_args(argv)
+    if args.command == "import-budget":
+        return 0 if check_import_budget(args.budget_ms, args.subcommand_budget_ms) else 1
+
+    # The pipeline scripts use paths relative to the project root
+    os.chdir(PROJECT_ROOT)
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.append(str(PROJECT_ROOT))
+
+    command = COMMANDS[args.command]
+    function = getattr(importlib.import_module(command.module), command.function)
+    if command.takes_file:
+        function(args.file_name)
+    else:
+        function()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+scripts/columnar_sidecar.py
+
+Binary columnar sidecar for the numeric columns of a prepared CSV file.
+
+Data prep writes each numeric sales column (ids, amounts, bonus points and the
+sale date as an integer date_key) to its own ``.npy`` file in a
+``<file>.columns`` directory next to the CSV. Readers open the columns with
+``np.load(mmap_mode="r")``: they get ``np.memmap`` arrays backed directly by
+the file, so there is no text parsing or copying and the pages are shared
+through the OS page cache by every process reading them. The ETL reads
+prepared sales through ``read_prepared_sales``, which only parses the text
+columns of the CSV while the sidecar is current.
+
+A ``schema.json`` written last records the CSV size and modification time;
+the sidecar is only used while it matches the CSV it was built from.
+"""
+
+import json
+import os
+import pathlib
+import sys
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts.date_dimension import to_date_key  # noqa: E402
+
+# Constants
+SALES_NUMERIC_COLUMNS: Dict[str, str] = {
+    "transactionid": "int64",
+    "customerid": "int64",
+    "productid": "int64",
+    "storeid": "int64",
+    "campaignid": "int64",
+    "saleamount": "float64",
+    "bonuspoints": "int64",
+}
+DATE_KEY_COLUMN: str = "date_key"  # sidecar name of the integer sale date
+SCHEMA_NAME: str = "schema.json"
+
+
+def sidecar_dir(csv_path: Union[str, pathlib.Path]) -> pathlib.Path:
+    """Return the sidecar directory for a prepared CSV file."""
+    csv_path = pathlib.Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}.columns")
+
+
+def _csv_stamp(csv_path: pathlib.Path) -> Dict[str, int]:
+    stat = csv_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _column_array(values: pd.Series, dtype: str) -> np.ndarray:
+    values = pd.to_numeric(values, errors="coerce")
+    if values.isna().any():
+        # Integers can't hold missing values; keep them as NaN
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return values.to_numpy(dtype=dtype)
+
+
+def numeric_arrays(
+    df: pd.DataFrame, columns: Dict[str, str] = SALES_NUMERIC_COLUMNS, date_column: Optional[str] = "saledate"
+) -> Dict[str, np.ndarray]:
+    """Convert the numeric columns (and the ISO date column, as date_key) of a prepared frame to arrays."""
+    arrays = {name: _column_array(df[name], dtype) for name, dtype in columns.items() if name in df.columns}
+    if date_column and date_column in df.columns:
+        arrays[DATE_KEY_COLUMN] = _column_array(to_date_key(df[date_column]), "int32")
+    return arrays
+
+
+def write_sidecar(
+    df: pd.DataFrame,
+    csv_path: Union[str, pathlib.Path],
+    columns: Dict[str, str] = SALES_NUMERIC_COLUMNS,
+    date_column: Optional[str] = "saledate",
+) -> pathlib.Path:
+    """
+    Write the numeric columns of a just-saved prepared frame as memory-mappable arrays.
+
+    Args:
+        df (pd.DataFrame): The frame that was written to ``csv_path``.
+        csv_path (str or Path): The prepared CSV file.
+        columns (dict): Column name -> NumPy dtype to store (missing columns are skipped).
+        date_column (str, optional): ISO date column stored as an integer ``date_key``.
+
+    Returns:
+        Path: The sidecar directory.
+    """
+    csv_path = pathlib.Path(csv_path)
+    directory = sidecar_dir(csv_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    schema_path = directory.joinpath(SCHEMA_NAME)
+    schema_path.unlink(missing_ok=True)  # readers ignore the sidecar while it is rewritten
+
+    arrays = numeric_arrays(df, columns, date_column)
+    for name, array in arrays.items():
+        np.save(directory.joinpath(f"{name}.npy"), array)
+
+    schema = {
+        "rows": len(df),
+        "columns": {name: str(array.dtype) for name, array in arrays.items()},
+        "source": _csv_stamp(csv_path),
+    }
+    tmp_path = schema_path.with_name(f"{SCHEMA_NAME}.tmp")
+    tmp_path.write_text(json.dumps(schema))
+    os.replace(tmp_path, schema_path)
+    logger.info(f"Columnar sidecar with {len(arrays)} columns written to {directory}")
+    return directory
+
+
+def read_columns(
+    csv_path: Union[str, pathlib.Path], columns: Optional[Iterable[str]] = None
+) -> Dict[str, np.memmap]:
+    """
+    Open sidecar columns of a prepared CSV as read-only memory-mapped arrays.
+
+    Args:
+        csv_path (str or Path): The prepared CSV file.
+        columns (iterable, optional): Columns to open; all sidecar columns if omitted.
+
+    Returns:
+        dict: Column name -> np.memmap.
+
+    Raises:
+        FileNotFoundError: If there is no sidecar for the file.
+        ValueError: If the sidecar is stale or lacks a requested column.
+    """
+    csv_path = pathlib.Path(csv_path)
+    directory = sidecar_dir(csv_path)
+    schema = json.loads(directory.joinpath(SCHEMA_NAME).read_text())
+    if schema["source"] != _csv_stamp(csv_path):
+        raise ValueError(f"Columnar sidecar {directory} is stale; rerun data prep.")
+
+    names = list(schema["columns"]) if columns is None else list(columns)
+    missing = [name for name in names if name not in schema["columns"]]
+    if missing:
+        raise ValueError(f"Columns not in sidecar {directory}: {missing}")
+    return {name: np.load(directory.joinpath(f"{name}.npy"), mmap_mode="r") for name in names}
+
+
+def read_prepared_sales(csv_path: Union[str, pathlib.Path]) -> pd.DataFrame:
+    """
+    Read a prepared sales file with an integer ``date_key`` column.
+
+    While the sidecar is current only the text columns are parsed from the CSV;
+    the numeric columns and date_key come from the memory-mapped arrays.
+    Otherwise the whole CSV is parsed and date_key is derived from saledate.
+
+    Args:
+        csv_path (str or Path): The prepared CSV file.
+
+    Returns:
+        pd.DataFrame: The prepared columns in file order, then date_key (Int64) if there is a saledate.
+    """
+    csv_path = pathlib.Path(csv_path)
+    try:
+        arrays = read_columns(csv_path)
+    except (FileNotFoundError, ValueError) as e:
+        logger.info(f"Reading {csv_path} as text: {e}")
+        df = pd.read_csv(csv_path)
+        if "saledate" in df.columns:
+            df[DATE_KEY_COLUMN] = to_date_key(df["saledate"])
+        return df
+
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    df = pd.read_csv(csv_path, usecols=[name for name in header if name not in arrays])
+    for name in header:
+        if name in arrays:
+            df[name] = arrays[name]
+    df[DATE_KEY_COLUMN] = pd.Series(arrays[DATE_KEY_COLUMN], index=df.index).astype("Int64")
+    return df[header + [DATE_KEY_COLUMN]]
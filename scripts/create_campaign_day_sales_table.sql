@@ -0,0 +1,11 @@
+CREATE TABLE IF NOT EXISTS campaign_day_sales (
+    campaign_id INTEGER,
+    date_key INTEGER,
+    sale_count INTEGER,
+    sale_amount_sum REAL,
+    campaign_length INTEGER,
+    campaign_relative_sale REAL,
+    PRIMARY KEY (campaign_id, date_key),
+    FOREIGN KEY (campaign_id) REFERENCES campaign (campaign_id),
+    FOREIGN KEY (date_key) REFERENCES date (date_key)
+);
\ No newline at end of file
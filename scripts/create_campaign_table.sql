@@ -2,5 +2,6 @@ CREATE TABLE IF NOT EXISTS campaign (
     campaign_id INTEGER PRIMARY KEY,
     campaign_name TEXT,
     start_date TEXT,
-    end_date TEXT
+    end_date TEXT,
+    campaign_length INTEGER
 );
\ No newline at end of file
@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS customer_history (
+    customer_key INTEGER PRIMARY KEY,
+    customer_id INTEGER,
+    name TEXT,
+    region TEXT,
+    join_date TEXT,
+    loyalty_points INTEGER,
+    gender TEXT,
+    row_hash TEXT,
+    valid_from TEXT,
+    valid_to TEXT,
+    is_current INTEGER
+);
\ No newline at end of file
@@ -0,0 +1,11 @@
+CREATE TABLE IF NOT EXISTS customer_summary (
+    customer_id INTEGER PRIMARY KEY,
+    total_spent REAL,
+    transaction_count INTEGER,
+    first_purchase_key INTEGER,
+    last_purchase_key INTEGER,
+    bonus_points INTEGER,
+    FOREIGN KEY (customer_id) REFERENCES customer (customer_id),
+    FOREIGN KEY (first_purchase_key) REFERENCES date (date_key),
+    FOREIGN KEY (last_purchase_key) REFERENCES date (date_key)
+);
\ No newline at end of file
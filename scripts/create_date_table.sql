@@ -0,0 +1,14 @@
+CREATE TABLE IF NOT EXISTS date (
+    date_key INTEGER PRIMARY KEY,
+    full_date TEXT,
+    day INTEGER,
+    month INTEGER,
+    quarter INTEGER,
+    year INTEGER,
+    weekday INTEGER,
+    weekday_name TEXT,
+    month_name TEXT,
+    is_weekend INTEGER,
+    campaign_active INTEGER,
+    campaign_id INTEGER
+);
\ No newline at end of file
@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS product_history (
+    product_key INTEGER PRIMARY KEY,
+    product_id INTEGER,
+    product_name TEXT,
+    category TEXT,
+    unit_price REAL,
+    stock INTEGER,
+    supplier TEXT,
+    row_hash TEXT,
+    valid_from TEXT,
+    valid_to TEXT,
+    is_current INTEGER
+);
\ No newline at end of file
@@ -0,0 +1,14 @@
+CREATE TABLE IF NOT EXISTS sale_delta (
+    delta_id INTEGER PRIMARY KEY,
+    period TEXT,
+    sale_id INTEGER,
+    customer_id INTEGER,
+    product_id INTEGER,
+    store_id INTEGER,
+    campaign_id INTEGER,
+    sale_amount REAL,
+    sale_date TEXT,
+    date_key INTEGER,
+    bonus_points INTEGER,
+    payment_type TEXT
+);
\ No newline at end of file
@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS sale_dimension_key (
+    sale_id INTEGER,
+    date_key INTEGER,
+    customer_key INTEGER,
+    product_key INTEGER,
+    PRIMARY KEY (sale_id, date_key)
+);
\ No newline at end of file
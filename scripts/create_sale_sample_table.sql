@@ -0,0 +1,15 @@
+CREATE TABLE IF NOT EXISTS sale_sample (
+    sale_id INTEGER PRIMARY KEY,
+    stratum TEXT,
+    priority REAL,
+    customer_id INTEGER,
+    product_id INTEGER,
+    store_id INTEGER,
+    campaign_id INTEGER,
+    category TEXT,
+    sale_amount REAL,
+    date_key INTEGER,
+    bonus_points INTEGER,
+    payment_type TEXT,
+    FOREIGN KEY (stratum) REFERENCES sale_stratum (stratum)
+);
\ No newline at end of file
@@ -0,0 +1,4 @@
+CREATE TABLE IF NOT EXISTS sale_stratum (
+    stratum TEXT PRIMARY KEY,
+    population INTEGER
+);
\ No newline at end of file
@@ -6,9 +6,11 @@ CREATE TABLE IF NOT EXISTS sale (
     campaign_id INTEGER,
     sale_amount REAL,
     sale_date TEXT,
+    date_key INTEGER,
     bonus_points INTEGER,
     payment_type TEXT,
     FOREIGN KEY (customer_id) REFERENCES customer (customer_id),
     FOREIGN KEY (product_id) REFERENCES product (product_id),
-    FOREIGN KEY (campaign_id) REFERENCES campaign (campaign_id)
+    FOREIGN KEY (campaign_id) REFERENCES campaign (campaign_id),
+    FOREIGN KEY (date_key) REFERENCES date (date_key)
 );
\ No newline at end of file
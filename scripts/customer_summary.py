@@ -0,0 +1,143 @@
+"""
+scripts/customer_summary.py
+
+Materialized customer lifetime-value aggregate.
+
+``customer_summary`` holds one row per customer with total_spent,
+transaction_count, first/last purchase date keys and bonus points. The full
+load builds it once from the sales; incremental loads apply only the delta
+of the new sales. An index on total_spent turns the top-customers dashboard
+query into an index range scan instead of a scan and sort of every sale.
+"""
+
+import pathlib
+import sqlite3
+import sys
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts import sale_partitions  # noqa: E402
+from scripts.warehouse import dataframe_rows  # noqa: E402
+
+# Constants
+INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_customer_summary_total_spent ON customer_summary (total_spent DESC)"
+TOP_CUSTOMERS_QUERY = """
+SELECT c.name, cs.total_spent
+FROM customer_summary cs
+JOIN customer c ON cs.customer_id = c.customer_id
+ORDER BY cs.total_spent DESC
+LIMIT ?
+"""
+UPSERT_SQL = """
+INSERT INTO customer_summary
+    (customer_id, total_spent, transaction_count, first_purchase_key, last_purchase_key, bonus_points)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (customer_id) DO UPDATE SET
+    total_spent = total_spent + excluded.total_spent,
+    transaction_count = transaction_count + excluded.transaction_count,
+    first_purchase_key = COALESCE(MIN(first_purchase_key, excluded.first_purchase_key),
+                                  first_purchase_key, excluded.first_purchase_key),
+    last_purchase_key = COALESCE(MAX(last_purchase_key, excluded.last_purchase_key),
+                                 last_purchase_key, excluded.last_purchase_key),
+    bonus_points = bonus_points + excluded.bonus_points
+"""
+BOUNDS_BATCH_SIZE = 500  # customers whose purchase keys are recomputed per query
+
+
+def rebuild_customer_summary(cursor: sqlite3.Cursor, suffix: str = "") -> None:
+    """Build customer_summary from all sales (used by the full load)."""
+    source = sale_partitions.sale_source(cursor, suffix)
+    cursor.execute(f"DELETE FROM customer_summary{suffix}")
+    cursor.execute(
+        f"""
+        INSERT INTO customer_summary{suffix}
+            (customer_id, total_spent, transaction_count, first_purchase_key, last_purchase_key, bonus_points)
+        SELECT customer_id, SUM(sale_amount), COUNT(*), MIN(date_key), MAX(date_key), SUM(bonus_points)
+        FROM {source}
+        GROUP BY customer_id
+        """
+    )
+    logger.info("Customer summary rebuilt.")
+
+
+def create_indexes(cursor: sqlite3.Cursor) -> None:
+    """Create the customer_summary indexes on the live table."""
+    cursor.execute(INDEX_SQL)
+
+
+def _customer_totals(sales_df: pd.DataFrame, sign: int) -> pd.DataFrame:
+    grouped = sales_df.groupby("customer_id")
+    return pd.DataFrame(
+        {
+            "total_spent": grouped["sale_amount"].sum() * sign,
+            "transaction_count": grouped.size() * sign,
+            "first_purchase_key": grouped["date_key"].min(),
+            "last_purchase_key": grouped["date_key"].max(),
+            "bonus_points": grouped["bonus_points"].sum() * sign,
+        }
+    )
+
+
+def apply_sales_delta(cursor: sqlite3.Cursor, added_df: pd.DataFrame, replaced_df: pd.DataFrame) -> None:
+    """
+    Update customer_summary from new sales only.
+
+    Args:
+        cursor (sqlite3.Cursor): Writer cursor.
+        added_df (pd.DataFrame): Sales being written (warehouse column names). A sale_id
+            sent more than once counts once, with its last row.
+        replaced_df (pd.DataFrame): Existing sales those rows replace; their amounts are
+            subtracted.
+
+    Run after the new sales are written. New sales only widen the first/last
+    purchase keys; customers who lost a replaced sale get theirs recomputed from
+    their remaining sales, and customers left without sales are removed.
+    """
+    if added_df.empty:
+        return
+    added_df = added_df.drop_duplicates("sale_id", keep="last")
+    removed = _customer_totals(replaced_df, -1).assign(first_purchase_key=pd.NA, last_purchase_key=pd.NA)
+    delta = pd.concat([_customer_totals(added_df, 1), removed]).groupby(level=0).agg(
+        {
+            "total_spent": "sum",
+            "transaction_count": "sum",
+            "first_purchase_key": "min",
+            "last_purchase_key": "max",
+            "bonus_points": "sum",
+        }
+    )
+    cursor.executemany(UPSERT_SQL, dataframe_rows(delta.reset_index()))
+    if not replaced_df.empty:
+        refresh_purchase_keys(cursor, replaced_df["customer_id"].dropna().unique().tolist())
+    logger.info(f"Customer summary updated for {len(delta)} customers.")
+
+
+def refresh_purchase_keys(cursor: sqlite3.Cursor, customer_ids: list) -> None:
+    """Recompute first/last purchase keys of the given customers from the sale view; drop rows without sales."""
+    for start in range(0, len(customer_ids), BOUNDS_BATCH_SIZE):
+        batch = [int(customer_id) for customer_id in customer_ids[start:start + BOUNDS_BATCH_SIZE]]
+        placeholders = ", ".join("?" for _ in batch)
+        bounds = cursor.execute(
+            f"""
+            SELECT MIN(date_key), MAX(date_key), customer_id
+            FROM {sale_partitions.SALE_VIEW}
+            WHERE customer_id IN ({placeholders})
+            GROUP BY customer_id
+            """,
+            batch,
+        ).fetchall()
+        cursor.executemany(
+            "UPDATE customer_summary SET first_purchase_key = ?, last_purchase_key = ? WHERE customer_id = ?",
+            bounds,
+        )
+        cursor.execute(
+            f"DELETE FROM customer_summary WHERE customer_id IN ({placeholders}) AND transaction_count <= 0",
+            batch,
+        )
+
@@ -3,8 +3,12 @@ Module 2: Initial Script to Verify Project Setup
 File: scripts/data_prep.py
 """
 
+import functools
+import itertools
+import os
 import pathlib
 import sys
+from typing import Tuple
 import pandas as pd
 
 # For local imports, temporarily add project root to Python sys.path
@@ -15,25 +19,24 @@ if str(PROJECT_ROOT) not in sys.path:
 # Now we can import local modules
 from utils.logger import logger
 from scripts.data_scrubber import DataScrubber
+from scripts.checkpoints import ChunkManifest, file_signature
+from scripts.columnar_sidecar import write_sidecar
+from scripts.stage_pipeline import run_stages
+from scripts.raw_ingest import column_kinds, dataset_for_file, read_raw_csv
 
 # Constants
 DATA_DIR: pathlib.Path = PROJECT_ROOT.joinpath("data")
 RAW_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("raw")
 PREPARED_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("prepared")
+CHUNKS_DIR: pathlib.Path = PREPARED_DATA_DIR.joinpath(".chunks")
+PREP_CHUNK_SIZE: int = 100_000  # raw rows cleaned per checkpointed chunk
+PREP_WORKERS: int = os.cpu_count() or 1  # processes cleaning chunks while others are read and written
+
+# Variant spellings mapped to one canonical value per string column
+COLUMN_SYNONYMS: dict = {
+    "paymenttype": {"CREDIT CARD": "CREDIT", "CASH PAYMENT": "CASH", "CHEQUE": "CHECK"},
+}
 
-def read_raw_data(file_name: str) -> pd.DataFrame:
-    """Read raw data from CSV."""
-    file_path: pathlib.Path = RAW_DATA_DIR.joinpath(file_name)
-    try:
-        logger.info(f"Reading raw data from {file_path}.")
-        return pd.read_csv(file_path)
-    except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
-        return pd.DataFrame()  # Return an empty DataFrame if the file is not found
-    except Exception as e:
-        logger.error(f"Error reading {file_path}: {e}")
-        return pd.DataFrame()  # Return an empty DataFrame if any other error occurs
-    
 def save_prepared_data(df: pd.DataFrame, file_name: str) -> None:
     """
     Save cleaned data to CSV.
@@ -43,44 +46,13 @@ def save_prepared_data(df: pd.DataFrame, file_name: str) -> None:
     df.to_csv(file_path, index=False)
     logger.info(f"Data saved to {file_path}")
 
-def process_data(file_name: str) -> None:
-    """Process raw data by reading it into a pandas DataFrame object."""
-    df = read_raw_data(file_name)
+def clean_data(df: pd.DataFrame, file_name: str) -> pd.DataFrame:
+    """Clean raw rows (a whole file or one chunk of it) into the prepared format."""
     df_scrubber = DataScrubber(df)
     logger.info(f"Data before cleaning: {df_scrubber.check_data_consistency_before_cleaning()}")
 
-    #Expected column names and formatting
-    products_column_info = {
-        "productid": "id",
-        "productname": "str",
-        "category": "str",
-        "unitprice": "float",
-        "stock": "int",
-        "supplier": "str"
-    }
-    customers_column_info = {
-        "customerid": "id",
-        "name": "str",
-        "region": "str",
-        "joindate": "datetime",
-        "loyaltypoints": "str",
-        "gender": "str"
-    }
-    sales_column_info = {
-        "transactionid": "id",
-        "saledate": "datetime",
-        "customerid": "id",
-        "productid": "id",
-        "storeid": "id",
-        "campaignid": "id",
-        "saleamount": "float",
-        "bonuspoints": "int",
-        "paymenttype": "str"
-    }
-
-    column_info = sales_column_info if "sales" in file_name else \
-                  products_column_info if "products" in file_name else \
-                  customers_column_info
+    #Expected column names and formatting (from the raw schema registry)
+    column_info = column_kinds(dataset_for_file(file_name))
 
     #Column titles should be in lowercase
     original_columns = df.columns.tolist()
@@ -116,7 +88,7 @@ def process_data(file_name: str) -> None:
         if col in df.columns:
             if dtype == "str":
                 df = df_scrubber.convert_column_to_new_data_type(col, str)
-                df = df_scrubber.format_column_strings_to_upper_and_trim(col)
+                df = df_scrubber.canonicalize_column_strings(col, synonyms=COLUMN_SYNONYMS.get(col))
             elif dtype == "float":
                 df = df_scrubber.convert_column_to_new_data_type(col, float)
             elif dtype == "int":
@@ -145,8 +117,55 @@ def process_data(file_name: str) -> None:
     '''
     logger.info(f"Data after cleaning: {df_scrubber.check_data_consistency_after_cleaning()}")
 
-    # Save cleaned data
-    save_prepared_data(df, file_name.replace(".csv", "_prepared.csv"))
+    return df
+
+def clean_chunk(item: Tuple[int, pd.DataFrame], file_name: str) -> Tuple[int, pd.DataFrame]:
+    """Clean one numbered chunk (module level so worker processes can run it)."""
+    index, chunk = item
+    return index, clean_data(chunk, file_name)
+
+def process_data(file_name: str) -> None:
+    """
+    Clean a raw file chunk by chunk and save the prepared file.
+
+    Reading, cleaning and writing run as overlapping stages with bounded queues
+    between them. Each cleaned chunk is written to a part file and recorded in
+    a manifest, so a rerun after a failure resumes after the last completed
+    chunk instead of starting from zero. The prepared file is written only once
+    every chunk is done.
+    """
+    file_path: pathlib.Path = RAW_DATA_DIR.joinpath(file_name)
+    try:
+        manifest = ChunkManifest(CHUNKS_DIR.joinpath(file_path.stem), file_signature([file_path]))
+        # Only the registry's columns are parsed; header drift is logged, not fatal
+        with read_raw_csv(file_path, chunksize=PREP_CHUNK_SIZE) as reader:
+            logger.info(f"Reading raw data from {file_path}.")
+
+            def write_chunk(item):
+                index, df = item
+                df.to_csv(manifest.part_path(index), index=False)
+                manifest.mark_done(index)
+
+            # Reading the next chunk, cleaning this one and writing the last one overlap
+            pending = ((index, chunk) for index, chunk in enumerate(reader) if not manifest.is_done(index))
+            # Only start worker processes when there is more than one chunk to clean
+            head = list(itertools.islice(pending, 2))
+            workers = PREP_WORKERS if len(head) > 1 else 1
+            clean = functools.partial(clean_chunk, file_name=file_name)
+            run_stages(itertools.chain(head, pending), clean, write_chunk, workers=workers)
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
+        return
+
+    # Chunks were de-duplicated on their own; drop duplicates that span chunks
+    df = pd.concat([pd.read_csv(part_path) for part_path in manifest.part_paths()], ignore_index=True)
+    df = df.drop_duplicates()
+    prepared_file_name = file_name.replace(".csv", "_prepared.csv")
+    save_prepared_data(df, prepared_file_name)
+    if "sales" in file_name:
+        # Numeric columns as memory-mappable arrays for fast repeated reads
+        write_sidecar(df, PREPARED_DATA_DIR.joinpath(prepared_file_name))
+    manifest.clear()
 
 
 
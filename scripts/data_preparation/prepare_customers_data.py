@@ -11,6 +11,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 #Import from the project
 from utils.logger import logger
+from scripts.raw_ingest import read_raw_csv
 
 # Constants
 DATA_DIR: pathlib.Path = PROJECT_ROOT.joinpath("data")
@@ -21,12 +22,13 @@ PREPARED_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("prepared")
 
 def read_raw_data(file_name: str) -> pd.DataFrame:
     """
-    Reads a raw data file and returns a pandas DataFrame
+    Reads a raw data file and returns a pandas DataFrame of its registry columns,
+    under their canonical lowercase names
     """
     logger.info(f"FUNCTION START: read_raw_data file: {file_name}")
     file_path = RAW_DATA_DIR.joinpath(file_name)
     logger.info(f"Reading data from: {file_path}")
-    df = pd.read_csv(file_path)
+    df = read_raw_csv(file_path)
     logger.info(f"Loaded dataframe with {len(df)} rows and {len(df.columns)} columns")
     return df
 
@@ -63,14 +65,16 @@ def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     
     # TODO: Fill or drop missing values based on business rules
     # Example:
-    df['Name'].fillna('Unknown', inplace=True)
-    df['Region'].fillna('Unknown', inplace=True)
-    df['JoinDate'].fillna('0/0/0000', inplace=True)
-    df['LoyaltyPoints'].fillna('0', inplace=True)
-    df['Gender'].fillna('Unknown', inplace=True)
+    df['name'] = df['name'].fillna('Unknown')
+    df['region'] = df['region'].fillna('Unknown')
+    df['joindate'] = df['joindate'].fillna('0/0/0000')
+    df['loyaltypoints'] = df['loyaltypoints'].fillna(0)
+    df['gender'] = df['gender'].fillna('Unknown')
     logger.info(f"Blank values filled in")
-    df.dropna(subset=['CustomerID'], inplace=True)
+    df.dropna(subset=['customerid'], inplace=True)
     logger.info(f"Records with missing CustomerID dropped")
+    # Ids are read as floats so missing ones survive until here
+    df[['customerid']] = df[['customerid']].astype('int64')
     
     # Log missing values count after handling
     missing_after = df.isna().sum().sum()
@@ -88,9 +92,9 @@ def remove_outliers(df: pd.DataFrame) -> pd.DataFrame:
     # TODO: Define numeric columns and apply rules for outlier removal
     # Example:
     # Convert LoyaltyPoints to numeric, coercing errors to NaN
-    df['LoyaltyPoints'] = pd.to_numeric(df['LoyaltyPoints'], errors='coerce')
+    df['loyaltypoints'] = pd.to_numeric(df['loyaltypoints'], errors='coerce')
     # Checks for LoyaltyPoints values outside the range of 0 to 1,000,000
-    df = df[(df['LoyaltyPoints'] >= 0) & (df['LoyaltyPoints'] < 1000000)]
+    df = df[(df['loyaltypoints'] >= 0) & (df['loyaltypoints'] < 1000000)]
     
     """
     # Checks for gender values that are not 'F', 'M', or 'O'
@@ -125,15 +129,6 @@ def main() -> None:
     # Log initial dataframe information
     logger.info(f"Initial dataframe columns: {', '.join(df.columns.tolist())}")
     logger.info(f"Initial dataframe shape: {df.shape}")
-    
-    # Clean column names
-    original_columns = df.columns.tolist()
-    df.columns = df.columns.str.strip()
-    
-    # Log if any column names changed
-    changed_columns = [f"{old} -> {new}" for old, new in zip(original_columns, df.columns) if old != new]
-    if changed_columns:
-        logger.info(f"Cleaned column names: {', '.join(changed_columns)}")
 
     # Remove duplicates
     df = remove_duplicates(df)
@@ -11,22 +11,31 @@ if str(PROJECT_ROOT) not in sys.path:
 
 #Import from the project
 from utils.logger import logger
+from scripts.raw_ingest import read_raw_csv
+from scripts.validation_rules import apply_rules, range_rule
 
 # Constants
 DATA_DIR: pathlib.Path = PROJECT_ROOT.joinpath("data")
 RAW_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("raw")
 PREPARED_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("prepared")
 
+# Business rules checked by validate_data (one vectorized mask per rule)
+PRODUCTS_RULES = [
+    range_rule("unitprice", min_value=0),
+    range_rule("stock", min_value=0),
+]
+
 # Functions
 
 def read_raw_data(file_name: str) -> pd.DataFrame:
     """
-    Reads a raw data file and returns a pandas DataFrame
+    Reads a raw data file and returns a pandas DataFrame of its registry columns,
+    under their canonical lowercase names
     """
     logger.info(f"FUNCTION START: read_raw_data file: {file_name}")
     file_path = RAW_DATA_DIR.joinpath(file_name)
     logger.info(f"Reading data from: {file_path}")
-    df = pd.read_csv(file_path)
+    df = read_raw_csv(file_path)
     logger.info(f"Loaded dataframe with {len(df)} rows and {len(df.columns)} columns")
     return df
 
@@ -64,14 +73,16 @@ def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     
     # TODO: Fill or drop missing values based on business rules
     # Example:
-    df['productname'].fillna('Unknown', inplace=True)
-    df['supplier'].fillna('Unknown', inplace=True)
-    df['category'].fillna('General', inplace=True)
-    df['unitprice'].fillna(df['unitprice'].median(), inplace=True)
-    df['stock'].fillna(0, inplace=True)
+    df['productname'] = df['productname'].fillna('Unknown')
+    df['supplier'] = df['supplier'].fillna('Unknown')
+    df['category'] = df['category'].fillna('General')
+    df['unitprice'] = df['unitprice'].fillna(df['unitprice'].median())
+    df['stock'] = df['stock'].fillna(0).astype('int64')
     logger.info(f"Blank values filled in")
     df.dropna(subset=['productid'], inplace=True)
     logger.info(f"Records with missing CustomerID dropped")
+    # Ids are read as floats so missing ones survive until here
+    df[['productid']] = df[['productid']].astype('int64')
     
     # Log missing values count after handling
     missing_after = df.isna().sum().sum()
@@ -135,21 +146,7 @@ def validate_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     logger.info(f"FUNCTION START: validate_data with dataframe shape={df.shape}")
     
-    # TODO: Implement data validation rules specific to products
-    # Suggestion: Check for valid values in critical fields
-    # Example:
-    invalid_prices = df[df['unitprice'] < 0].shape[0]
-    logger.info(f"Found {invalid_prices} products with negative prices")
-    df = df[df['unitprice'] >= 0]
-    invalid_stock = df[df['stock'] < 0].shape[0]
-    logger.info(f"Found {invalid_stock} products with negative stock")
-    df = df[df['stock'] >= 0]
-
-    df.columns = df.columns.str.strip()
-    expected_columns = ['productid', 'productname', 'category', 'unitprice', 'stock', 'supplier']
-    if list(df.columns) != expected_columns:
-        df = df.drop(columns=[col for col in df.columns if col not in expected_columns])
-        logger.info(f"Removed columns not in {expected_columns}")
+    df = apply_rules(df, PRODUCTS_RULES, quarantine_file_name="products_data_quarantine.csv")
 
     logger.info("Data validation complete")
     return df
@@ -175,15 +172,6 @@ def main() -> None:
     # Log initial dataframe information
     logger.info(f"Initial dataframe columns: {', '.join(df.columns.tolist())}")
     logger.info(f"Initial dataframe shape: {df.shape}")
-    
-    # Clean column names
-    original_columns = df.columns.tolist()
-    df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
-    
-    # Log if any column names changed
-    changed_columns = [f"{old} -> {new}" for old, new in zip(original_columns, df.columns) if old != new]
-    if changed_columns:
-        logger.info(f"Cleaned column names: {', '.join(changed_columns)}")
 
     # Process data
     df = remove_duplicates(df)
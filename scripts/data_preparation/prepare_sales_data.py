@@ -11,22 +11,31 @@ if str(PROJECT_ROOT) not in sys.path:
 
 #Import from the project
 from utils.logger import logger
+from scripts.raw_ingest import read_raw_csv
+from scripts.validation_rules import apply_rules, range_rule
 
 # Constants
 DATA_DIR: pathlib.Path = PROJECT_ROOT.joinpath("data")
 RAW_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("raw")
 PREPARED_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("prepared")
 
+# Business rules checked by validate_data (one vectorized mask per rule)
+SALES_RULES = [
+    range_rule("saleamount", min_value=0),
+    range_rule("bonuspoints", min_value=0),
+]
+
 # Functions
 
 def read_raw_data(file_name: str) -> pd.DataFrame:
     """
-    Reads a raw data file and returns a pandas DataFrame
+    Reads a raw data file and returns a pandas DataFrame of its registry columns,
+    under their canonical lowercase names
     """
     logger.info(f"FUNCTION START: read_raw_data file: {file_name}")
     file_path = RAW_DATA_DIR.joinpath(file_name)
     logger.info(f"Reading data from: {file_path}")
-    df = pd.read_csv(file_path)
+    df = read_raw_csv(file_path)
     logger.info(f"Loaded dataframe with {len(df)} rows and {len(df.columns)} columns")
     return df
 
@@ -64,10 +73,10 @@ def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     
     # TODO: Fill or drop missing values based on business rules
     # Example:
-    df['saledate'].fillna('0/0/0000', inplace=True)
-    df['saleamount'].fillna(df['saleamount'].median(), inplace=True)
-    df['bonuspoints'].fillna(df['bonuspoints'].median(), inplace=True)
-    df['paymenttype'].fillna('Unknown', inplace=True)
+    df['saledate'] = df['saledate'].fillna('0/0/0000')
+    df['saleamount'] = df['saleamount'].fillna(df['saleamount'].median())
+    df['bonuspoints'] = df['bonuspoints'].fillna(df['bonuspoints'].median()).round().astype('int64')
+    df['paymenttype'] = df['paymenttype'].fillna('Unknown')
     logger.info(f"Blank values filled in")
     df.dropna(subset=['customerid'], inplace=True)
     df.dropna(subset=['transactionid'], inplace=True)
@@ -75,6 +84,9 @@ def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     df.dropna(subset=['storeid'], inplace=True)
     df.dropna(subset=['campaignid'], inplace=True)
     logger.info(f"Records with missing IDs dropped")
+    # Ids are read as floats so missing ones survive until here
+    id_columns = ['transactionid', 'customerid', 'productid', 'storeid', 'campaignid']
+    df[id_columns] = df[id_columns].astype('int64')
     
     # Log missing values count after handling
     missing_after = df.isna().sum().sum()
@@ -92,7 +104,7 @@ def remove_outliers(df: pd.DataFrame) -> pd.DataFrame:
     # TODO: Define numeric columns and apply rules for outlier removal
     # Example:
     # Convert to numeric, coercing errors to NaN
-    df['saleaamount'] = pd.to_numeric(df['saleamount'], errors='coerce')  
+    df['saleamount'] = pd.to_numeric(df['saleamount'], errors='coerce')
     # Checks for values outside the range
     for col in ['saleamount']:
         if col in df.columns and df[col].dtype in ['int64', 'float64']:
@@ -137,21 +149,7 @@ def validate_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     logger.info(f"FUNCTION START: validate_data with dataframe shape={df.shape}")
     
-    # TODO: Implement data validation rules specific to products
-    # Suggestion: Check for valid values in critical fields
-    # Example:
-    invalid_prices = df[df['saleamount'] < 0].shape[0]
-    logger.info(f"Found {invalid_prices} products with negative prices")
-    df = df[df['saleamount'] >= 0]
-    invalid_bonuspoints = df[df['bonuspoints'] < 0].shape[0]
-    logger.info(f"Found {invalid_bonuspoints} products with negative bonuspoints")
-    df = df[df['bonuspoints'] >= 0]
-
-    df.columns = df.columns.str.strip()
-    expected_columns = ['transactionid', 'saledate', 'customerid', 'productid', 'storeid', 'campaignid', 'saleamount', 'bonuspoints', 'paymenttype']
-    if list(df.columns) != expected_columns:
-        df = df.drop(columns=[col for col in df.columns if col not in expected_columns])
-        logger.info(f"Removed columns not in {expected_columns}")
+    df = apply_rules(df, SALES_RULES, quarantine_file_name="sales_data_quarantine.csv")
 
     logger.info("Data validation complete")
     return df
@@ -177,15 +175,6 @@ def main() -> None:
     # Log initial dataframe information
     logger.info(f"Initial dataframe columns: {', '.join(df.columns.tolist())}")
     logger.info(f"Initial dataframe shape: {df.shape}")
-    
-    # Clean column names
-    original_columns = df.columns.tolist()
-    df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
-    
-    # Log if any column names changed
-    changed_columns = [f"{old} -> {new}" for old, new in zip(original_columns, df.columns) if old != new]
-    if changed_columns:
-        logger.info(f"Cleaned column names: {', '.join(changed_columns)}")
 
     # Process data
     #df = validate_data(df)
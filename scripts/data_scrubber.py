@@ -16,7 +16,7 @@ See the associated test script in the tests folder.
 
 import io
 import pandas as pd
-from typing import Dict, Tuple, Union, List
+from typing import Callable, Dict, Optional, Tuple, Union, List
 
 class DataScrubber:
     def __init__(self, df: pd.DataFrame):
@@ -125,11 +125,7 @@ class DataScrubber:
         Raises:
             ValueError: If the specified column not found in the DataFrame.
         """
-        try:
-            self.df[column] = self.df[column].str.lower().str.strip()
-            return self.df
-        except KeyError:
-            raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+        return self._transform_distinct_strings(column, lambda values: values.str.lower().str.strip())
         
     def format_column_strings_to_upper_and_trim(self, column: str) -> pd.DataFrame:
         """
@@ -144,13 +140,60 @@ class DataScrubber:
         Raises:
             ValueError: If the specified column not found in the DataFrame.
         """
+        return self._transform_distinct_strings(column, lambda values: values.str.upper().str.strip())
+
+    def canonicalize_column_strings(self, column: str, upper: bool = True, unicode_form: Optional[str] = "NFKC",
+                                    synonyms: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Canonicalize strings in a specified column: Unicode-normalize, trim, collapse inner whitespace,
+        change case and map synonyms (e.g. {"CREDIT CARD": "CREDIT"}) to one spelling.
+
+        Only the distinct values are normalized, so the cost scales with the number of
+        distinct values rather than the number of rows.
+
+        Parameters:
+            column (str): Name of the column to canonicalize.
+            upper (bool, optional): Uppercase if True, lowercase if False. Default is True.
+            unicode_form (str, optional): Unicode normalization form, or None to skip. Default is 'NFKC'.
+            synonyms (dict, optional): Variant spelling -> canonical value. Keys are canonicalized
+                the same way as the column, so their case and spacing do not matter.
+
+        Returns:
+            pd.DataFrame: Updated DataFrame with the canonicalized string column.
+
+        Raises:
+            ValueError: If the specified column not found in the DataFrame.
+        """
+        def canonical(values: pd.Series) -> pd.Series:
+            if unicode_form:
+                values = values.str.normalize(unicode_form)
+            values = values.str.split().str.join(" ")
+            return values.str.upper() if upper else values.str.lower()
+
+        def canonical_with_synonyms(values: pd.Series) -> pd.Series:
+            values = canonical(values)
+            if synonyms:
+                variants = canonical(pd.Series(list(synonyms.keys()), dtype=object))
+                values = values.replace(dict(zip(variants, synonyms.values())))
+            return values
+
+        return self._transform_distinct_strings(column, canonical_with_synonyms)
+
+    def _transform_distinct_strings(self, column: str, transform: Callable[[pd.Series], pd.Series]) -> pd.DataFrame:
+        """
+        Apply a string transform to each distinct value of a column once and map the results back.
+
+        The column is factorized into integer codes and its distinct values; the transform runs
+        on the distinct values only and the result is gathered back to every row by code.
+        Missing values stay missing.
+        """
         try:
-            # TODO: Fix the following logic to call str.upper() and str.strip() on the given column 
-            # HINT: See previous function for an example
-            self.df[column] = self.df[column].str.upper().str.strip()
-            return self.df
+            codes, uniques = pd.factorize(self.df[column])
         except KeyError:
             raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+        transformed = transform(pd.Series(uniques))
+        self.df[column] = pd.api.extensions.take(transformed.array, codes, allow_fill=True)
+        return self.df
 
     def handle_missing_data(self, drop: bool = False, fill_value: Union[None, float, int, str] = None) -> pd.DataFrame:
         """
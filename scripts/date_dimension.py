@@ -0,0 +1,101 @@
+"""
+scripts/date_dimension.py
+
+Prebuilt calendar dimension for the data warehouse.
+
+Every calendar date a sale can fall on gets one row in the ``date`` table,
+keyed by an integer ``date_key`` (YYYYMMDD). Sales store the same key, so
+time-based cubing and filtering are integer joins and comparisons instead
+of parsing the sale_date text again on every run.
+"""
+
+import pathlib
+import sys
+from typing import Optional
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+
+# Constants
+NO_CAMPAIGN_ID: int = 0  # the "NO CAMPAIGN" row spans all time and is not an active campaign
+DATE_COLUMNS = [
+    "date_key", "full_date", "day", "month", "quarter", "year", "weekday",
+    "weekday_name", "month_name", "is_weekend", "campaign_active", "campaign_id",
+]
+
+
+def to_date_key(dates: pd.Series) -> pd.Series:
+    """
+    Convert ISO date text ("2024-05-17") to integer date keys (20240517).
+
+    Values that are not ISO dates become missing (stored as NULL).
+    """
+    digits = dates.astype(str).str[:10].str.replace("-", "", regex=False)
+    return pd.to_numeric(digits.where(digits.str.fullmatch(r"\d{8}")), errors="coerce").astype("Int64")
+
+
+def date_key_to_iso(date_key: int) -> str:
+    """Convert an integer date key back to ISO date text."""
+    text = f"{int(date_key):08d}"
+    return f"{text[:4]}-{text[4:6]}-{text[6:]}"
+
+
+def build_date_dimension(
+    start_date: str, end_date: str, campaign_df: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Build one row per calendar date between start_date and end_date (inclusive).
+
+    Args:
+        start_date (str): First ISO date.
+        end_date (str): Last ISO date.
+        campaign_df (pd.DataFrame, optional): Campaigns with warehouse column names
+            (campaign_id, start_date, end_date) used to set the campaign-active flags.
+
+    Returns:
+        pd.DataFrame: Rows matching the date table's columns.
+    """
+    dates = pd.date_range(start_date, end_date, freq="D")
+    full_date = pd.Series(dates.strftime("%Y-%m-%d"))
+    date_df = pd.DataFrame(
+        {
+            "date_key": dates.year * 10000 + dates.month * 100 + dates.day,
+            "full_date": full_date,
+            "day": dates.day,
+            "month": dates.month,
+            "quarter": dates.quarter,
+            "year": dates.year,
+            "weekday": dates.weekday,  # Monday = 0
+            "weekday_name": dates.day_name(),
+            "month_name": dates.month_name(),
+            "is_weekend": (dates.weekday >= 5).astype(int),
+            "campaign_active": 0,
+            "campaign_id": NO_CAMPAIGN_ID,
+        }
+    )
+
+    if campaign_df is not None:
+        # ISO date text sorts like the dates themselves, so no parsing is needed
+        for campaign in campaign_df.itertuples(index=False):
+            if campaign.campaign_id == NO_CAMPAIGN_ID:
+                continue
+            active = (full_date >= str(campaign.start_date)) & (full_date <= str(campaign.end_date))
+            date_df.loc[active, "campaign_active"] = 1
+            date_df.loc[active, "campaign_id"] = campaign.campaign_id
+
+    logger.info(f"Date dimension built for {start_date} to {end_date} ({len(date_df)} days).")
+    return date_df
+
+
+def date_dimension_for_keys(date_keys: pd.Series, campaign_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Build the date dimension spanning the smallest to the largest of the given date keys."""
+    keys = date_keys.dropna()
+    if keys.empty:
+        return pd.DataFrame(columns=DATE_COLUMNS)
+    return build_date_dimension(date_key_to_iso(keys.min()), date_key_to_iso(keys.max()), campaign_df)
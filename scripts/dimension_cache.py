@@ -0,0 +1,159 @@
+"""
+scripts/dimension_cache.py
+
+In-process cache of the small dimension tables as compact lookup arrays.
+
+Every sale is enriched with its product's category, its campaign's name and
+its customer's region. Instead of joining the dimension tables in SQL (or
+merging DataFrames) on every query, each attribute is loaded once into a
+``DimensionLookup``: an int32 array indexed by the dense integer id holding
+the attribute's code, plus the array of distinct labels. Enriching a batch of
+sales is then two NumPy gathers (id -> code -> label).
+
+The ETL writes a new stamp to the ``dimension_version`` table whenever it
+replaces the dimension tables. The cache compares that stamp (one indexed
+read) before it is used and reloads everything when it changed.
+"""
+
+import pathlib
+import sqlite3
+import sys
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts.warehouse import (  # noqa: E402, F401 (UNVERSIONED is part of this module's API)
+    DB_PATH,
+    UNVERSIONED,
+    read_sql,
+    read_version_stamp,
+    write_version_stamp,
+)
+
+# Constants
+VERSION_TABLE: str = "dimension_version"
+# Attribute -> (dimension table, id column it is looked up by)
+DIMENSION_ATTRIBUTES: Dict[str, Tuple[str, str]] = {
+    "category": ("product", "product_id"),
+    "campaign_name": ("campaign", "campaign_id"),
+    "region": ("customer", "customer_id"),
+}
+
+_caches: Dict[pathlib.Path, "DimensionCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def write_dimension_version(cursor: sqlite3.Cursor) -> str:
+    """Stamp the dimension tables with a new version (run in the transaction that changes them)."""
+    return write_version_stamp(cursor, VERSION_TABLE)
+
+
+def read_dimension_version(db_path: Union[str, pathlib.Path] = DB_PATH) -> str:
+    """Return the current dimension version stamp, or UNVERSIONED if the warehouse has none."""
+    return read_version_stamp(VERSION_TABLE, db_path)
+
+
+class DimensionLookup:
+    """
+    One dimension attribute as arrays: ``codes[id - offset]`` is the label code of an id
+    (-1 if the id is not in the dimension) and ``labels[code]`` the attribute value.
+    """
+
+    __slots__ = ("offset", "codes", "labels")
+
+    def __init__(self, ids: np.ndarray, values: pd.Series):
+        value_codes, labels = pd.factorize(values, use_na_sentinel=False)
+        self.offset = int(ids.min()) if len(ids) else 0
+        span = int(ids.max()) - self.offset + 1 if len(ids) else 0
+        self.codes = np.full(span, -1, dtype=np.int32)
+        self.codes[ids - self.offset] = value_codes
+        # One extra label so the -1 code of unknown ids gathers a missing value
+        self.labels = np.append(np.asarray(labels, dtype=object), np.nan)
+
+    def lookup_codes(self, ids: pd.Series) -> np.ndarray:
+        """Return the label code of each id, -1 for missing or unknown ids."""
+        positions = pd.to_numeric(ids, errors="coerce").to_numpy(dtype="float64", na_value=np.nan) - self.offset
+        known = np.isfinite(positions) & (positions >= 0) & (positions < len(self.codes))
+        codes = np.full(len(positions), -1, dtype=np.int32)
+        codes[known] = self.codes[positions[known].astype(np.int64)]
+        return codes
+
+    def contains(self, ids: pd.Series) -> np.ndarray:
+        """Return True for ids present in the dimension (what an inner join keeps)."""
+        return self.lookup_codes(ids) >= 0
+
+    def gather(self, ids: pd.Series) -> np.ndarray:
+        """Return the attribute value of each id (missing for unknown ids)."""
+        return self.labels[self.lookup_codes(ids)]
+
+
+class DimensionCache:
+    """Lookups for every DIMENSION_ATTRIBUTES entry, reloaded when the dimension version changes."""
+
+    __slots__ = ("db_path", "version", "lookups", "_lock")
+
+    def __init__(self, db_path: Union[str, pathlib.Path] = DB_PATH):
+        self.db_path = db_path
+        self.version: Optional[str] = None
+        self.lookups: Dict[str, DimensionLookup] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Reload the lookups if the ETL published a new dimension version."""
+        version = read_dimension_version(self.db_path)
+        if version == self.version and self.lookups:
+            return
+        with self._lock:
+            if version == self.version and self.lookups:
+                return
+            lookups = {}
+            for attribute, (table, id_column) in DIMENSION_ATTRIBUTES.items():
+                rows = read_sql(f"SELECT {id_column}, {attribute} FROM {table}", db_path=self.db_path)
+                rows = rows.dropna(subset=[id_column])
+                lookups[attribute] = DimensionLookup(rows[id_column].to_numpy(dtype=np.int64), rows[attribute])
+            self.lookups = lookups
+            self.version = version
+            logger.info(f"Dimension cache loaded version {version}.")
+
+    def lookup(self, attribute: str) -> DimensionLookup:
+        """Return the current lookup for one attribute, e.g. "category"."""
+        self.refresh()
+        return self.lookups[attribute]
+
+    def enrich(self, df: pd.DataFrame, attributes: Optional[list] = None) -> pd.DataFrame:
+        """
+        Add dimension attributes to fact rows by id, like LEFT JOINs on the dimension tables.
+
+        Args:
+            df (pd.DataFrame): Facts with the id columns (product_id, campaign_id, customer_id).
+            attributes (list, optional): Attributes to add; all of DIMENSION_ATTRIBUTES by default.
+
+        Returns:
+            pd.DataFrame: A copy of df with the attribute columns appended.
+        """
+        self.refresh()
+        attributes = list(DIMENSION_ATTRIBUTES) if attributes is None else attributes
+        values = {
+            attribute: self.lookups[attribute].gather(df[DIMENSION_ATTRIBUTES[attribute][1]])
+            for attribute in attributes
+        }
+        return df.assign(**values)
+
+
+def get_dimension_cache(db_path: Union[str, pathlib.Path] = DB_PATH) -> DimensionCache:
+    """Return the shared dimension cache for a database, creating it on first use."""
+    key = pathlib.Path(db_path).resolve()
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = DimensionCache(key)
+            _caches[key] = cache
+        return cache
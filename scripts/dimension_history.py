@@ -0,0 +1,272 @@
+"""
+scripts/dimension_history.py
+
+Slowly changing (Type 2) history of the customer and product dimensions.
+
+The ``customer`` and ``product`` tables hold only the latest snapshot, so a
+product's old unit_price or a customer's old region would be lost.
+``customer_history`` and ``product_history`` keep every version instead,
+each under its own surrogate key (customer_key, product_key) and valid for
+sale dates in [valid_from, valid_to).
+
+Neither the history tables nor the live customer and product tables are
+swapped by the shadow load. The full load stages the new snapshot in the
+shadow tables and, in the transaction that swaps the load in, merges it: a
+row hash of the tracked columns is compared with the current version, and
+only ids whose hash changed get a new version (their current version is
+closed at the load date). Columns that are overwritten rather than tracked
+(loyalty points, stock) are updated in place on the current version. The
+live table is updated by key the same way: new and changed ids are written,
+ids missing from the snapshot are deleted and unchanged ids are not written
+at all.
+
+``sale_dimension_key`` stores the customer_key and product_key that were
+valid at each sale's sale_date, resolved once when the sale is loaded, and
+the ``sale_version`` view shows every sale with the attributes as of its date.
+"""
+
+import hashlib
+import pathlib
+import sqlite3
+import sys
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts import sale_partitions  # noqa: E402
+from scripts.warehouse import dataframe_rows, read_table_sql  # noqa: E402
+
+
+class HistorySpec(NamedTuple):
+    """How one dimension's history is kept."""
+
+    id_column: str
+    key_column: str  # surrogate key of a version
+    tracked: List[str]  # a change starts a new version (Type 2)
+    overwritten: List[str]  # a change updates the current version in place (Type 1)
+
+
+# Constants
+EARLIEST_DATE: str = "0001-01-01"  # first version of an id covers all its earlier sales
+OPEN_END_DATE: str = "9999-12-31"  # valid_to of current versions
+HISTORY_DIMENSIONS: Dict[str, HistorySpec] = {
+    "customer": HistorySpec("customer_id", "customer_key", ["name", "region", "join_date", "gender"], ["loyalty_points"]),
+    "product": HistorySpec("product_id", "product_key", ["product_name", "category", "unit_price", "supplier"], ["stock"]),
+}
+SALE_VERSION_VIEW_SQL = """
+CREATE VIEW IF NOT EXISTS sale_version AS
+SELECT s.*, k.customer_key, k.product_key, c.region, p.category, p.unit_price
+FROM sale s
+LEFT JOIN sale_dimension_key k ON k.sale_id = s.sale_id AND k.date_key = s.date_key
+LEFT JOIN customer_history c ON c.customer_key = k.customer_key
+LEFT JOIN product_history p ON p.product_key = k.product_key
+"""
+
+
+def history_table(dimension: str) -> str:
+    """Return the history table of a dimension, e.g. "customer_history"."""
+    return f"{dimension}_history"
+
+
+def create_history_tables(cursor: sqlite3.Cursor) -> None:
+    """Create the history tables and their id lookup indexes if they don't exist."""
+    for dimension, spec in HISTORY_DIMENSIONS.items():
+        table = history_table(dimension)
+        cursor.execute(read_table_sql(table))
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_id ON {table} ({spec.id_column}, valid_from)")
+
+
+def _hash_text(value: object) -> str:
+    if pd.isna(value):
+        return "\x00"
+    # 5 and 5.0 are the same value, whether or not the column had missing values
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """Return a SHA-1 hash of each row's values."""
+    hashes = [
+        hashlib.sha1("\x1f".join(_hash_text(value) for value in row).encode("utf-8")).hexdigest()
+        for row in df.itertuples(index=False, name=None)
+    ]
+    return pd.Series(hashes, index=df.index, dtype=object)
+
+
+def _differs(merged: pd.DataFrame, columns: List[str]) -> pd.Series:
+    changed = pd.Series(False, index=merged.index)
+    for column in columns:
+        new, old = merged[column], merged[f"{column}_current"]
+        changed |= ~(new.eq(old) | (new.isna() & old.isna()))
+    return changed
+
+
+def merge_dimension(
+    cursor: sqlite3.Cursor, dimension: str, effective_date: Optional[str] = None, suffix: str = ""
+) -> Dict[str, int]:
+    """
+    Merge the loaded snapshot of a dimension into its history table.
+
+    Args:
+        cursor (sqlite3.Cursor): Writer cursor.
+        dimension (str): "customer" or "product".
+        effective_date (str, optional): ISO date new versions start from; today by default.
+        suffix (str): Suffix of the table holding the snapshot, e.g. the shadow suffix. With a
+            suffix, the live dimension table is also brought up to date by key.
+
+    Returns:
+        dict: Number of ids "added", "changed" (new version), "updated" (in place) and "closed".
+    """
+    spec = HISTORY_DIMENSIONS[dimension]
+    table = history_table(dimension)
+    effective_date = effective_date or date.today().isoformat()
+    columns = [spec.id_column, *spec.tracked, *spec.overwritten]
+    conn = cursor.connection
+
+    snapshot = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM {dimension}{suffix}", conn)
+    if snapshot.empty:
+        # A snapshot that failed to load must not close every version
+        logger.warning(f"No {dimension} rows loaded; {table} left unchanged.")
+        return {"added": 0, "changed": 0, "updated": 0, "closed": 0}
+    snapshot["row_hash"] = row_hashes(snapshot[spec.tracked])
+    current = pd.read_sql_query(
+        f"SELECT {spec.key_column}, {spec.id_column}, row_hash, valid_from, {', '.join(spec.overwritten)} "
+        f"FROM {table} WHERE is_current = 1",
+        conn,
+    )
+    known_ids = pd.read_sql_query(f"SELECT DISTINCT {spec.id_column} FROM {table}", conn)[spec.id_column]
+
+    merged = snapshot.merge(current, on=spec.id_column, how="outer", suffixes=("", "_current"), indicator=True)
+    matched = merged["_merge"] == "both"
+    tracked_changed = matched & (merged["row_hash"] != merged["row_hash_current"])
+    # A version opened by an earlier load on the same day is corrected rather than closed
+    same_day = tracked_changed & (merged["valid_from"].fillna(EARLIEST_DATE) >= effective_date)
+    replaced = merged[tracked_changed & ~same_day]
+    updated = merged[(matched & ~tracked_changed & _differs(merged, spec.overwritten)) | same_day]
+    added = merged[merged["_merge"] == "left_only"]
+    removed = merged[merged["_merge"] == "right_only"]
+
+    closed_keys = pd.concat([replaced[spec.key_column], removed[spec.key_column]])
+    cursor.executemany(
+        f"UPDATE {table} SET valid_to = ?, is_current = 0 WHERE {spec.key_column} = ?",
+        [(effective_date, int(key)) for key in closed_keys],
+    )
+
+    assignments = ", ".join(f"{column} = ?" for column in [*columns[1:], "row_hash"])
+    cursor.executemany(
+        f"UPDATE {table} SET {assignments} WHERE {spec.key_column} = ?",
+        dataframe_rows(updated[[*columns[1:], "row_hash", spec.key_column]]),
+    )
+
+    first_seen = ~added[spec.id_column].isin(known_ids)
+    versions = pd.concat(
+        [
+            added.assign(valid_from=first_seen.map({True: EARLIEST_DATE, False: effective_date})),
+            replaced.assign(valid_from=effective_date),
+        ]
+    )
+    versions = versions.assign(valid_to=OPEN_END_DATE, is_current=1)[
+        [*columns, "row_hash", "valid_from", "valid_to", "is_current"]
+    ]
+    placeholders = ", ".join("?" for _ in versions.columns)
+    cursor.executemany(
+        f"INSERT INTO {table} ({', '.join(versions.columns)}) VALUES ({placeholders})",
+        dataframe_rows(versions),
+    )
+
+    if suffix:
+        _sync_live_table(cursor, dimension, pd.concat([added, replaced, updated])[columns], suffix)
+
+    counts = {"added": len(added), "changed": len(replaced), "updated": len(updated), "closed": len(removed)}
+    logger.info(f"{table} merged as of {effective_date}: {counts}.")
+    return counts
+
+
+def _sync_live_table(cursor: sqlite3.Cursor, dimension: str, changed: pd.DataFrame, suffix: str) -> None:
+    # Write only new and changed ids and delete those the snapshot no longer has
+    id_column = HISTORY_DIMENSIONS[dimension].id_column
+    cursor.execute(read_table_sql(dimension))
+    cursor.execute(
+        f"DELETE FROM {dimension} WHERE {id_column} NOT IN (SELECT {id_column} FROM {dimension}{suffix})"
+    )
+    placeholders = ", ".join("?" for _ in changed.columns)
+    cursor.executemany(
+        f"INSERT OR REPLACE INTO {dimension} ({', '.join(changed.columns)}) VALUES ({placeholders})",
+        dataframe_rows(changed),
+    )
+
+
+def merge_dimensions(
+    cursor: sqlite3.Cursor, suffix: str = "", effective_date: Optional[str] = None
+) -> Dict[str, Dict[str, int]]:
+    """Merge the loaded customer and product snapshots into their history (and live) tables."""
+    create_history_tables(cursor)
+    return {
+        dimension: merge_dimension(cursor, dimension, effective_date, suffix)
+        for dimension in HISTORY_DIMENSIONS
+    }
+
+
+def _resolve_sale_keys(cursor: sqlite3.Cursor, source: str, suffix: str = "") -> None:
+    # Version ranges of an id don't overlap, so each sale matches at most one version
+    cursor.execute(
+        f"""
+        INSERT OR REPLACE INTO sale_dimension_key{suffix} (sale_id, date_key, customer_key, product_key)
+        SELECT s.sale_id, s.date_key, c.customer_key, p.product_key
+        FROM {source} s
+        LEFT JOIN customer_history c
+            ON c.customer_id = s.customer_id AND c.valid_from <= s.sale_date AND s.sale_date < c.valid_to
+        LEFT JOIN product_history p
+            ON p.product_id = s.product_id AND p.valid_from <= s.sale_date AND s.sale_date < p.valid_to
+        """
+    )
+
+
+def rebuild_sale_keys(cursor: sqlite3.Cursor, suffix: str = "") -> None:
+    """Resolve the dimension versions of all sales into sale_dimension_key (used by the full load)."""
+    source = sale_partitions.sale_source(cursor, suffix)
+    cursor.execute(f"DELETE FROM sale_dimension_key{suffix}")
+    _resolve_sale_keys(cursor, source, suffix)
+    logger.info("Sale dimension keys rebuilt.")
+
+
+def apply_sales_delta(cursor: sqlite3.Cursor, added_df: pd.DataFrame, replaced_df: pd.DataFrame) -> None:
+    """
+    Resolve the dimension versions of new sales.
+
+    Args:
+        cursor (sqlite3.Cursor): Writer cursor.
+        added_df (pd.DataFrame): Sales being written (warehouse column names).
+        replaced_df (pd.DataFrame): Existing sales those rows replace; their keys are removed.
+    """
+    if added_df.empty:
+        return
+    cursor.executemany(
+        "DELETE FROM sale_dimension_key WHERE sale_id = ? AND date_key = ?",
+        dataframe_rows(replaced_df[["sale_id", "date_key"]]),
+    )
+    cursor.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS sale_key_batch "
+        "(sale_id INTEGER, date_key INTEGER, customer_id INTEGER, product_id INTEGER, sale_date TEXT)"
+    )
+    cursor.execute("DELETE FROM temp.sale_key_batch")
+    cursor.executemany(
+        "INSERT INTO temp.sale_key_batch VALUES (?, ?, ?, ?, ?)",
+        dataframe_rows(added_df[["sale_id", "date_key", "customer_id", "product_id", "sale_date"]]),
+    )
+    _resolve_sale_keys(cursor, "temp.sale_key_batch")
+    cursor.execute("DROP TABLE temp.sale_key_batch")
+    logger.info(f"Sale dimension keys resolved for {len(added_df)} sales.")
+
+
+def create_sale_version_view(cursor: sqlite3.Cursor) -> None:
+    """Create the view of sales with their customer and product attributes as of the sale date."""
+    cursor.execute(SALE_VERSION_VIEW_SQL)
@@ -2,6 +2,7 @@ import pandas as pd
 import sqlite3
 import pathlib
 import sys
+from typing import List
 
 # For local imports, temporarily add project root to sys.path
 PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
@@ -9,78 +10,135 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 from utils.logger import logger
+from scripts.warehouse import DB_PATH, dataframe_rows, insert_dataframe, read_table_sql, write_sales_version, writer_connection
+from scripts import sale_partitions
+from scripts.date_dimension import date_dimension_for_keys
+from scripts.columnar_sidecar import read_prepared_sales
+from scripts import campaign_facts
+from scripts import customer_summary
+from scripts import sale_sample
+from scripts import dimension_history
+from scripts.referential_integrity import validate_foreign_keys
+from scripts import checkpoints
+from scripts.dimension_cache import write_dimension_version
 
 # Constants
-DW_DIR = pathlib.Path("data").joinpath("dw")
-DB_PATH = DW_DIR.joinpath("smart_sales.db")
-PREPARED_DATA_DIR = pathlib.Path("data").joinpath("prepared")
+PREPARED_DATA_DIR = PROJECT_ROOT.joinpath("data", "prepared")
+WAREHOUSE_TABLES = ["campaign", "date", "campaign_day_sales", "customer_summary", "sale_stratum", "sale_sample", "sale_dimension_key"]  # sale is stored in monthly partitions
+SNAPSHOT_TABLES = ["customer", "product"]  # staged in shadow tables, then merged into the live tables by key
+SHADOW_SUFFIX = "__shadow"  # loads go here first, then are swapped in
+PREPARED_FILES = [
+    "campaign_data_prepared.csv",
+    "customers_data_prepared.csv",
+    "products_data_prepared.csv",
+    "sales_data_prepared.csv",
+]
+LOAD_BATCH_SIZE = 50_000  # sales rows committed per load checkpoint
+DELTA_COMPACT_ROWS = 100_000  # staged incremental sales that trigger a compaction
+CAMPAIGN_COLUMN_MAP = {
+    "campaignid": "campaign_id",  # Map CSV column -> DB column
+    "campaignname": "campaign_name",
+    "startdate": "start_date",
+    "enddate": "end_date"
+}
+SALE_COLUMN_MAP = {
+    "transactionid": "sale_id",  # Map CSV column -> DB column
+    "customerid": "customer_id",
+    "productid": "product_id",
+    "storeid": "store_id",
+    "campaignid": "campaign_id",
+    "saleamount": "sale_amount",
+    "bonuspoints": "bonus_points",
+    "paymenttype": "payment_type",
+    "saledate": "sale_date"
+}
 
-def create_schema(cursor: sqlite3.Cursor) -> None:
+def create_schema(cursor: sqlite3.Cursor, suffix: str = "") -> None:
     """Create tables in the data warehouse if they don't exist."""
+    for table_name in WAREHOUSE_TABLES + SNAPSHOT_TABLES:
+        try:
+            cursor.execute(read_table_sql(table_name, f"{table_name}{suffix}"))
+        except sqlite3.Error as e:
+            logger.error(f"Error creating {table_name}{suffix} table: {e}")
+            raise
 
+def create_shadow_tables(cursor: sqlite3.Cursor) -> None:
+    """Create empty shadow tables for the next load, dropping any left by a failed run."""
+    for table_name in WAREHOUSE_TABLES + SNAPSHOT_TABLES:
+        cursor.execute(f"DROP TABLE IF EXISTS {table_name}{SHADOW_SUFFIX}")
+    for partition in sale_partitions.list_partitions(cursor, SHADOW_SUFFIX):
+        cursor.execute(f"DROP TABLE {partition}")
+    create_schema(cursor, SHADOW_SUFFIX)
+
+def swap_shadow_tables(conn: sqlite3.Connection) -> None:
+    """
+    Replace the live tables with the loaded shadow tables in one transaction.
+
+    In WAL mode readers keep their snapshot of the old tables until this
+    commits, then see the complete new load; they never see an empty or
+    half-loaded warehouse. The customer and product snapshots are merged into
+    their history and live tables in the same transaction, so a failed swap
+    leaves the history untouched too.
+    """
+    conn.commit()
+    # Rename without rewriting references in other tables and views
+    conn.execute("PRAGMA legacy_alter_table = ON")
     try:
-        with open("scripts/create_campaign_table.sql", "r") as sql_file:
-            sql_campaign = sql_file.read()
-        cursor.execute(sql_campaign)
+        conn.execute("BEGIN IMMEDIATE")
+        # Only changed customers and products get new versions or live rows
+        dimension_history.merge_dimensions(conn.cursor(), SHADOW_SUFFIX)
+        dimension_history.rebuild_sale_keys(conn.cursor(), SHADOW_SUFFIX)
+        for table_name in SNAPSHOT_TABLES:
+            conn.execute(f"DROP TABLE {table_name}{SHADOW_SUFFIX}")
+        for table_name in WAREHOUSE_TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+            conn.execute(f"ALTER TABLE {table_name}{SHADOW_SUFFIX} RENAME TO {table_name}")
+        sale_partitions.swap_partitions(conn.cursor(), SHADOW_SUFFIX)
+        campaign_facts.create_sale_campaign_view(conn.cursor())
+        customer_summary.create_indexes(conn.cursor())
+        sale_sample.create_indexes(conn.cursor())
+        dimension_history.create_sale_version_view(conn.cursor())
+        checkpoints.clear_load_checkpoints(conn.cursor())
+        write_dimension_version(conn.cursor())
+        write_sales_version(conn.cursor())
+        conn.commit()
     except sqlite3.Error as e:
-        logger.error(f"Error creating campaign table: {e}")
+        conn.rollback()
+        logger.error(f"Error swapping shadow tables into place: {e}")
         raise
+    finally:
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+    logger.info("Shadow tables swapped into the live warehouse.")
 
-    with open("scripts/create_customer_table.sql", "r") as sql_file:
-        sql_customer = sql_file.read()    
-    cursor.execute(sql_customer)
-    
-    with open("scripts/create_product_table.sql", "r") as sql_file:
-        sql_product = sql_file.read()
-    cursor.execute(sql_product)
-    
-    with open("scripts/create_sale_table.sql", "r") as sql_file:
-        sql_sale = sql_file.read()    
-    cursor.execute(sql_sale)
-
-
-
-
-def delete_existing_records(cursor: sqlite3.Cursor) -> None:
-    """Delete all existing records from the customer, product, and sale tables."""
-    cursor.execute("DELETE FROM campaign")
-    cursor.execute("DELETE FROM customer")
-    cursor.execute("DELETE FROM product")
-    cursor.execute("DELETE FROM sale")
-    
 
-def insert_campaigns(campaign_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+def insert_campaigns(campaign_df: pd.DataFrame, cursor: sqlite3.Cursor, suffix: str = "") -> None:
     """Insert campaign data into the campaign table."""
     try:
         # Check required columns
         required_columns = {"campaignid", "campaignname", "startdate", "enddate"}
         if not required_columns.issubset(campaign_df.columns):
-            logger.error(f"Missing columns in campaign DataFrame: {required_columns - set(campaign_df.columns)}")
-            return
+            message = f"Missing columns in campaign DataFrame: {required_columns - set(campaign_df.columns)}"
+            logger.error(message)
+            # An empty shadow table must never be swapped in over the live one
+            raise ValueError(message)
 
         # Map CSV columns to database table columns
-        campaign_df = campaign_df.rename(
-            columns={
-                "campaignid": "campaign_id",  # Map CSV column -> DB column
-                "campaignname": "campaign_name",
-                "startdate": "start_date",
-                "enddate": "end_date"
-            }
-        )
-        campaign_df.to_sql("campaign", cursor.connection, if_exists="append", index=False)
+        campaign_df = campaign_df.rename(columns=CAMPAIGN_COLUMN_MAP)
+        insert_dataframe(cursor, f"campaign{suffix}", campaign_df)
         logger.info("Campaigns data inserted into the campaign table.")
     except sqlite3.Error as e:
         logger.error(f"Error inserting campaigns: {e}")
         raise
 
-def insert_customers(customers_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+def insert_customers(customers_df: pd.DataFrame, cursor: sqlite3.Cursor, suffix: str = "") -> None:
     """Insert customer data into the customer table."""
     try:
         # Check required columns
         required_columns = {"customerid", "name", "region", "loyaltypoints", "gender", "joindate"}
         if not required_columns.issubset(customers_df.columns):
-            logger.error(f"Missing columns in customer DataFrame: {required_columns - set(customers_df.columns)}")
-            return
+            message = f"Missing columns in customer DataFrame: {required_columns - set(customers_df.columns)}"
+            logger.error(message)
+            raise ValueError(message)
 
         # Map CSV columns to database table columns
         customers_df = customers_df.rename(
@@ -90,20 +148,21 @@ def insert_customers(customers_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None
                 "joindate": "join_date"
             }
         )
-        customers_df.to_sql("customer", cursor.connection, if_exists="append", index=False)
+        insert_dataframe(cursor, f"customer{suffix}", customers_df)
         logger.info("Customers data inserted into the customer table.")
     except sqlite3.Error as e:
         logger.error(f"Error inserting customers: {e}")
         raise
 
-def insert_products(products_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+def insert_products(products_df: pd.DataFrame, cursor: sqlite3.Cursor, suffix: str = "") -> None:
     """Insert product data into the product table."""
     try:
         # Check required columns
         required_columns = {"productid", "productname", "category", "unitprice", "stock", "supplier"}
         if not required_columns.issubset(products_df.columns):
-            logger.error(f"Missing columns in products DataFrame: {required_columns - set(products_df.columns)}")
-            return
+            message = f"Missing columns in products DataFrame: {required_columns - set(products_df.columns)}"
+            logger.error(message)
+            raise ValueError(message)
 
         # Map CSV columns to database table columns
         products_df = products_df.rename(
@@ -113,73 +172,187 @@ def insert_products(products_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
                 "unitprice": "unit_price"
             }
         )
-        products_df.to_sql("product", cursor.connection, if_exists="append", index=False)
+        insert_dataframe(cursor, f"product{suffix}", products_df)
         logger.info("Products data inserted into the product table.")
     except sqlite3.Error as e:
         logger.error(f"Error inserting products: {e}")
         raise
 
-def insert_sales(sales_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
-    """Insert sales data into the sales table."""
+def insert_sales(sales_df: pd.DataFrame, cursor: sqlite3.Cursor, suffix: str = "") -> None:
+    """Insert sales data (with the date_key column of read_prepared_sales) into the sales table."""
     try:
         # Check required columns
         required_columns = {"transactionid", "customerid", "productid", "storeid", "campaignid", "saleamount", "bonuspoints", "paymenttype", "saledate"}
         if not required_columns.issubset(sales_df.columns):
-            logger.error(f"Missing columns in sales DataFrame: {required_columns - set(sales_df.columns)}")
-            return
+            message = f"Missing columns in sales DataFrame: {required_columns - set(sales_df.columns)}"
+            logger.error(message)
+            raise ValueError(message)
 
         # Map CSV columns to database table columns
-        sales_df = sales_df.rename(
-            columns={
-                "transactionid": "sale_id",  # Map CSV column -> DB column
-                "customerid": "customer_id",
-                "productid": "product_id",
-                "storeid": "store_id",
-                "campaignid": "campaign_id",
-                "saleamount": "sale_amount",
-                "bonuspoints": "bonus_points",
-                "paymenttype": "payment_type",
-                "saledate": "sale_date"
-            }
-        )
-        sales_df.to_sql("sale", cursor.connection, if_exists="append", index=False)
+        sales_df = sales_df.rename(columns=SALE_COLUMN_MAP)
+        sale_partitions.write_partitions(sales_df, cursor, suffix)
         logger.info("Sales data inserted into the sale table.")
     except sqlite3.Error as e:
         logger.error(f"Error inserting sales: {e}")
         raise
 
-def load_data_to_db() -> None:
+def insert_dates(sales_df: pd.DataFrame, campaign_df: pd.DataFrame, cursor: sqlite3.Cursor, suffix: str = "") -> None:
+    """Insert the calendar rows covering every sale date into the date table."""
     try:
-        # Connect to SQLite – will create the file if it doesn't exist
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        date_df = date_dimension_for_keys(sales_df["date_key"], campaign_df.rename(columns=CAMPAIGN_COLUMN_MAP))
+        insert_dataframe(cursor, f"date{suffix}", date_df)
+        logger.info("Date data inserted into the date table.")
+    except sqlite3.Error as e:
+        logger.error(f"Error inserting dates: {e}")
+        raise
 
-        # Enable foreign key enforcement
-        #cursor.execute("PRAGMA foreign_keys = ON;")
+def extend_date_dimension(date_keys: pd.Series, cursor: sqlite3.Cursor) -> None:
+    """
+    Add any missing calendar rows for the given date keys, using the live campaign table.
 
-        # Create schema and clear existing records
-        create_schema(cursor)
-        delete_existing_records(cursor)
+    The calendar stays one unbroken span from the first to the last date, so a
+    sale far outside the current calendar also adds the days in between (the
+    NO CAMPAIGN length counts the calendar's days without a campaign).
+    """
+    campaign_df = pd.read_sql_query("SELECT campaign_id, start_date, end_date FROM campaign", cursor.connection)
+    calendar_bounds = pd.Series(cursor.execute("SELECT MIN(date_key), MAX(date_key) FROM date").fetchone())
+    date_df = date_dimension_for_keys(pd.concat([date_keys.astype("Int64"), calendar_bounds.astype("Int64")]), campaign_df)
+    columns = ", ".join(date_df.columns)
+    placeholders = ", ".join("?" for _ in date_df.columns)
+    cursor.executemany(
+        f"INSERT OR IGNORE INTO date ({columns}) VALUES ({placeholders})",
+        dataframe_rows(date_df),
+    )
+
+def load_data_to_db() -> None:
+    """
+    Load the prepared files into shadow tables and swap them in.
+
+    Each step commits together with its checkpoint (sales in batches of
+    LOAD_BATCH_SIZE rows); rows are written with executemany, never with
+    DataFrame.to_sql, which would commit them ahead of the checkpoint. If a load of the same prepared files was
+    interrupted, the shadow tables are kept and the load resumes after the
+    last committed step.
+    """
+    signature = checkpoints.file_signature(PREPARED_DATA_DIR.joinpath(name) for name in PREPARED_FILES)
+
+    # Open the warehouse writer – will create the file if it doesn't exist.
+    # Commits on success, rolls back on error and always closes the connection.
+    with writer_connection(DB_PATH) as conn:
+        cursor = conn.cursor()
+
+        done = checkpoints.read_load_checkpoints(cursor, signature)
+        if done is None:
+            # Create empty shadow tables; the live tables stay readable during the load
+            create_shadow_tables(cursor)
+            checkpoints.clear_load_checkpoints(cursor)
+            checkpoints.create_load_checkpoint_table(cursor)
+            conn.commit()
+            done = {}
+        else:
+            logger.info(f"Resuming interrupted load after steps: {', '.join(done)}")
 
         # Load prepared data using pandas
         campaign_df = pd.read_csv(PREPARED_DATA_DIR.joinpath("campaign_data_prepared.csv"))
         customers_df = pd.read_csv(PREPARED_DATA_DIR.joinpath("customers_data_prepared.csv"))
         products_df = pd.read_csv(PREPARED_DATA_DIR.joinpath("products_data_prepared.csv"))
-        sales_df = pd.read_csv(PREPARED_DATA_DIR.joinpath("sales_data_prepared.csv"))
+        # Numeric columns and date_key are memory-mapped from the sidecar when it is current
+        sales_df = read_prepared_sales(PREPARED_DATA_DIR.joinpath("sales_data_prepared.csv"))
 
-        # Insert data into the database
-        insert_campaigns(campaign_df, cursor)
-        insert_customers(customers_df, cursor)
-        insert_products(products_df, cursor)
-        insert_sales(sales_df, cursor)
+        # Check foreign keys in one batch instead of enforcing them row by row
+        # (PRAGMA foreign_keys) during the insert; orphans go to a reject file
+        sales_df = validate_foreign_keys(
+            sales_df,
+            {
+                "customerid": customers_df["customerid"],
+                "productid": products_df["productid"],
+                "campaignid": campaign_df["campaignid"],
+            },
+            "sales_data_rejects.csv",
+        )
+        # sale_id is unique across all partitions; a repeated sale keeps its last row
+        repeated = sales_df["transactionid"].duplicated(keep="last")
+        if repeated.any():
+            logger.warning(f"Keeping the last of repeated rows for {int(repeated.sum())} sales.")
+            sales_df = sales_df[~repeated]
 
-        cursor.execute("PRAGMA foreign_key_list(sale);")
-        print(cursor.fetchall())
+        # Insert data into the shadow tables
+        if "dimensions" not in done:
+            insert_campaigns(campaign_df, cursor, SHADOW_SUFFIX)
+            insert_customers(customers_df, cursor, SHADOW_SUFFIX)
+            insert_products(products_df, cursor, SHADOW_SUFFIX)
+            insert_dates(sales_df, campaign_df, cursor, SHADOW_SUFFIX)
+            checkpoints.save_load_checkpoint(cursor, "dimensions", signature)
+            conn.commit()
 
-        conn.commit()
-    finally:
-        if conn:
-            conn.close()
+        for start in range(done.get("sales", 0), len(sales_df), LOAD_BATCH_SIZE):
+            batch_df = sales_df.iloc[start:start + LOAD_BATCH_SIZE]
+            insert_sales(batch_df, cursor, SHADOW_SUFFIX)
+            checkpoints.save_load_checkpoint(cursor, "sales", signature, start + len(batch_df))
+            conn.commit()
+            logger.info(f"Committed sales rows {start + len(batch_df)} of {len(sales_df)}.")
+
+        # Precompute campaign lengths and per-campaign-per-day totals
+        if "facts" not in done:
+            campaign_facts.update_campaign_lengths(cursor, SHADOW_SUFFIX)
+            campaign_facts.refresh_campaign_day_sales(cursor, SHADOW_SUFFIX)
+            customer_summary.rebuild_customer_summary(cursor, SHADOW_SUFFIX)
+            sale_sample.rebuild_sale_sample(cursor, SHADOW_SUFFIX)
+            checkpoints.save_load_checkpoint(cursor, "facts", signature)
+            conn.commit()
+
+        # Atomically switch readers over to the new data
+        swap_shadow_tables(conn)
+
+def load_new_sales_to_db(file_name: str = "sales_data_prepared.csv") -> List[str]:
+    """
+    Incrementally load a prepared sales file without reloading the warehouse.
+
+    Sales are staged in the unindexed delta table, replacing any existing sale
+    with the same sale_id whatever its month. Once DELTA_COMPACT_ROWS sales
+    are staged they are compacted into the partitions.
+
+    Returns:
+        list: ISO sale dates whose sales changed, including the old dates of moved sales.
+    """
+    sales_df = read_prepared_sales(PREPARED_DATA_DIR.joinpath(file_name))
+    missing_columns = set(SALE_COLUMN_MAP) - set(sales_df.columns)
+    if missing_columns:
+        logger.error(f"Missing columns in sales DataFrame: {missing_columns}")
+        return []
+    sales_df = sales_df.rename(columns=SALE_COLUMN_MAP)
+    with writer_connection(DB_PATH) as conn:
+        cursor = conn.cursor()
+        sales_df = validate_foreign_keys(
+            sales_df,
+            {
+                "customer_id": pd.read_sql_query("SELECT customer_id FROM customer", conn)["customer_id"],
+                "product_id": pd.read_sql_query("SELECT product_id FROM product", conn)["product_id"],
+                "campaign_id": pd.read_sql_query("SELECT campaign_id FROM campaign", conn)["campaign_id"],
+            },
+            file_name.replace(".csv", "_rejects.csv"),
+        )
+        extend_date_dimension(sales_df["date_key"], cursor)
+        accepted_df, replaced_df = sale_partitions.pending_changes(sales_df, cursor)
+        sale_partitions.append_sales(sales_df, cursor)
+        if sale_partitions.delta_rows(cursor) >= DELTA_COMPACT_ROWS:
+            sale_partitions.compact_delta(cursor)
+        customer_summary.apply_sales_delta(cursor, accepted_df, replaced_df)
+        sale_sample.apply_sales_delta(cursor, accepted_df, replaced_df)
+        dimension_history.apply_sales_delta(cursor, accepted_df, replaced_df)
+        campaign_facts.update_campaign_lengths(cursor)
+        changed_df = pd.concat([accepted_df, replaced_df], ignore_index=True)
+        date_keys = changed_df["date_key"].dropna()
+        if not date_keys.empty:
+            campaign_facts.refresh_campaign_day_sales(cursor, start_key=int(date_keys.min()), end_key=int(date_keys.max()))
+        write_sales_version(cursor)
+    return sorted(changed_df["sale_date"].dropna().astype(str).unique())
+
+def compact_sales() -> None:
+    """Merge the staged incremental sales into the sale partitions now."""
+    with writer_connection(DB_PATH) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        sale_partitions.compact_delta(conn.cursor())
 
 if __name__ == "__main__":
     load_data_to_db()
\ No newline at end of file
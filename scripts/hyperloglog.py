@@ -0,0 +1,151 @@
+"""
+scripts/hyperloglog.py
+
+HyperLogLog sketches for distinct counts in cube cells.
+
+A sketch is an array of REGISTERS small counters. Each id is hashed; the
+first PRECISION bits of the hash pick a register and the register keeps the
+longest run of leading zeros seen in the rest of the hash. The number of
+distinct ids is estimated from the registers with a standard error of about
+1.04 / sqrt(REGISTERS) (3.3% here), however many ids there are.
+
+Sketches are mergeable: the sketch of a union is the element-wise maximum of
+the sketches. So a cube cell's sketch rolls up to any coarser cell (all
+sales dates of a campaign, say) and cells refreshed incrementally combine
+with the old ones, without rescanning the sales.
+
+In the cube CSV a sketch is stored as base64 text of the zlib-compressed
+registers; registers of small cells are mostly zero and compress well.
+"""
+
+import base64
+import zlib
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# Constants
+PRECISION: int = 10
+REGISTERS: int = 1 << PRECISION
+_HASH_BITS: int = 64 - PRECISION  # hash bits left after the register index
+_ALPHA: float = 0.7213 / (1 + 1.079 / REGISTERS)
+
+
+def hash64(values: np.ndarray) -> np.ndarray:
+    """Return a 64-bit SplitMix64 hash of each integer value."""
+    with np.errstate(over="ignore"):
+        z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    lengths = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= np.uint64(1 << shift)
+        lengths += np.where(high, shift, 0).astype(np.uint8)
+        values = np.where(high, values >> np.uint64(shift), values)
+    return lengths + (values > 0).astype(np.uint8)
+
+
+def group_sketches(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Build one sketch per group in a single pass.
+
+    Args:
+        codes (np.ndarray): Group number (0 .. n_groups - 1) of every value.
+        values (np.ndarray): Integer ids to count; missing ids must be dropped beforehand.
+        n_groups (int): Number of groups.
+
+    Returns:
+        np.ndarray: uint8 registers of shape (n_groups, REGISTERS).
+    """
+    hashed = hash64(values)
+    register = (hashed >> np.uint64(_HASH_BITS)).astype(np.intp)
+    rest = hashed & np.uint64((1 << _HASH_BITS) - 1)
+    rank = (_HASH_BITS + 1 - _bit_length(rest)).astype(np.uint8)
+    sketches = np.zeros((n_groups, REGISTERS), dtype=np.uint8)
+    np.maximum.at(sketches, (codes.astype(np.intp), register), rank)
+    return sketches
+
+
+def estimate(sketches: np.ndarray) -> np.ndarray:
+    """Return the estimated distinct count of each sketch (rows of a 2-D register array)."""
+    sketches = np.atleast_2d(sketches)
+    raw = _ALPHA * REGISTERS**2 / np.exp2(-sketches.astype(np.float64)).sum(axis=1)
+    zeros = (sketches == 0).sum(axis=1)
+    # Few ids: count the empty registers instead (linear counting)
+    with np.errstate(divide="ignore"):
+        linear = REGISTERS * np.log(REGISTERS / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * REGISTERS) & (zeros > 0), linear, raw)
+
+
+def encode(sketch: np.ndarray) -> str:
+    """Encode a sketch as text for a CSV cell."""
+    return base64.b64encode(zlib.compress(sketch.astype(np.uint8).tobytes())).decode("ascii")
+
+
+def decode(text: str) -> np.ndarray:
+    """Decode a sketch written by encode()."""
+    return np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=np.uint8)
+
+
+def decode_all(texts: Iterable[str]) -> np.ndarray:
+    """Decode a column of sketches into a (rows, REGISTERS) array."""
+    texts = list(texts)
+    return np.vstack([decode(text) for text in texts]) if texts else np.zeros((0, REGISTERS), np.uint8)
+
+
+def sketch_column(df: pd.DataFrame, by: List[str], column: str) -> pd.DataFrame:
+    """
+    Return one encoded sketch of ``column`` per group of ``by``, with its distinct-count estimate.
+
+    Groups come out in ``df.groupby(by)`` order; missing ids are not counted.
+
+    Returns:
+        pd.DataFrame: Columns ``by`` + ``<column>_hll`` and ``<column>_distinct``.
+    """
+    groups = df.groupby(by, sort=True)
+    codes = groups.ngroup().to_numpy()
+    present = (codes >= 0) & df[column].notna().to_numpy()
+    values = df.loc[present, column].to_numpy(dtype=np.int64)
+    sketches = group_sketches(codes[present], values, groups.ngroups)
+    result = groups.size().reset_index()[by]
+    result[f"{column}_hll"] = [encode(sketch) for sketch in sketches]
+    result[f"{column}_distinct"] = np.rint(estimate(sketches)).astype(np.int64)
+    return result
+
+
+def merge_sketches(cube: pd.DataFrame, by: List[str], column: str) -> pd.DataFrame:
+    """
+    Merge the cells' sketches of ``column`` per group of ``by``.
+
+    Returns:
+        pd.DataFrame: ``by`` columns, the merged ``<column>_hll`` and its ``<column>_distinct``.
+    """
+    groups = cube.groupby(by, sort=True)
+    codes = groups.ngroup().to_numpy()
+    valid = codes >= 0
+    merged = np.zeros((groups.ngroups, REGISTERS), dtype=np.uint8)
+    np.maximum.at(merged, codes[valid], decode_all(cube.loc[valid, f"{column}_hll"]))
+    result = groups.size().reset_index()[by]
+    result[f"{column}_hll"] = [encode(sketch) for sketch in merged]
+    result[f"{column}_distinct"] = np.rint(estimate(merged)).astype(np.int64)
+    return result
+
+
+def rollup_distinct(cube: pd.DataFrame, by: List[str], column: str) -> pd.DataFrame:
+    """
+    Merge the cells' sketches of ``column`` up to the ``by`` dimensions and estimate distinct counts.
+
+    Args:
+        cube (pd.DataFrame): Cube with a ``<column>_hll`` sketch column.
+        by (list): Coarser dimensions to roll up to, e.g. ["campaign_name"].
+        column (str): Sketched id column, e.g. "customer_id".
+
+    Returns:
+        pd.DataFrame: ``by`` columns and ``<column>_distinct``.
+    """
+    return merge_sketches(cube, by, column).drop(columns=f"{column}_hll")
@@ -1,7 +1,13 @@
+import concurrent.futures
+import functools
+import hashlib
+import itertools
+import os
+import numpy as np
 import pandas as pd
-import sqlite3
 import pathlib
 import sys
+from typing import Iterable, List, Optional
 
 # For local imports, temporarily add project root to Python sys.path
 PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
@@ -9,38 +15,65 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 from utils.logger import logger  # noqa: E402
+from scripts.warehouse import DB_PATH, get_pool, read_sql  # noqa: E402
+from scripts.sale_partitions import list_partitions, sale_source_sql  # noqa: E402
+from scripts.bitmap_index import BitmapIndex, bitmap_index_path  # noqa: E402
+from scripts.date_dimension import to_date_key  # noqa: E402
+from scripts.hyperloglog import merge_sketches, sketch_column  # noqa: E402
+from scripts.dimension_cache import get_dimension_cache  # noqa: E402
 
 # Constants
-DW_DIR: pathlib.Path = pathlib.Path("data").joinpath("dw")
-DB_PATH: pathlib.Path = DW_DIR.joinpath("smart_sales.db")
 OLAP_OUTPUT_DIR: pathlib.Path = pathlib.Path("data").joinpath("olap_cubing_outputs")
+CUBE_FILE_NAME: str = "multidimensional_olap_cube.csv"
+CUBE_DIMENSIONS: list = ["sale_date", "Month", "campaign_name", "category"]
+CUBE_METRICS: dict = {
+    "sale_amount": ["sum", "mean"],
+    "sale_id": ["count"]
+}
+CUBE_SKETCHES: list = ["customer_id", "product_id", "store_id"]  # distinct counts kept as HyperLogLog sketches
+CUBE_WORKERS: int = os.cpu_count() or 1  # processes building cube shards
+PARALLEL_MIN_ROWS: int = 500_000  # below this, starting the pool and pickling shards costs more than it saves
+SHARD_MODES: tuple = ("key", "date")
 
-# Create output directory if it does not exist
-OLAP_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+def ingest_sales_data_from_dw(start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+    """
+    Ingest sales data from SQLite data warehouse.
+
+    Args:
+        start_date (str, optional): Inclusive ISO start date. Only overlapping monthly partitions are read.
+        end_date (str, optional): Inclusive ISO end date.
 
-def ingest_sales_data_from_dw() -> pd.DataFrame:
-    """Ingest sales data from SQLite data warehouse."""
+    Returns:
+        pd.DataFrame: Sales joined with product category, campaign name and customer region.
+    """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        query = """
+        sale_source, params = "sale", None
+        if start_date or end_date:
+            with get_pool(DB_PATH).connection() as conn:
+                partitions = list_partitions(conn.cursor())
+            sale_source, params = sale_source_sql(partitions, start_date, end_date)
+        query = f"""
         SELECT 
             s.*, 
-            p.category, 
-            c.campaign_name
+            d.day AS Day,
+            d.month AS Month,
+            d.year AS Year
         FROM 
-            sale s
-        JOIN 
-            product p 
-        ON 
-            s.product_id = p.product_id
+            {sale_source} s
         LEFT JOIN 
-            campaign c 
+            date d 
         ON 
-            s.campaign_id = c.campaign_id
+            s.date_key = d.date_key
         """
-        sales_df = pd.read_sql_query(query, conn)
-        conn.close()
+        # Borrow a pooled read-only connection instead of opening a new one
+        sales_df = read_sql(query, params, db_path=DB_PATH)
+
+        # Product, campaign and customer attributes come from the in-memory dimension
+        # cache; sales of unknown products are dropped, as the inner join did
+        dimensions = get_dimension_cache(DB_PATH)
+        sales_df = sales_df[dimensions.lookup("category").contains(sales_df["product_id"])]
+        sales_df = dimensions.enrich(sales_df)
         logger.info("Sales data successfully loaded from SQLite data warehouse.")
         return sales_df
     except Exception as e:
@@ -49,7 +82,7 @@ def ingest_sales_data_from_dw() -> pd.DataFrame:
 
 
 def create_olap_cube(
-    sales_df: pd.DataFrame, dimensions: list, metrics: dict
+    sales_df: pd.DataFrame, dimensions: list, metrics: dict, sketches: Optional[list] = None
 ) -> pd.DataFrame:
     """
     Create an OLAP cube by aggregating data across multiple dimensions.
@@ -58,6 +91,9 @@ def create_olap_cube(
         sales_df (pd.DataFrame): The sales data.
         dimensions (list): List of column names to group by.
         metrics (dict): Dictionary of aggregation functions for metrics.
+        sketches (list, optional): Id columns to count distinct values of. Each adds a
+            ``<column>_hll`` HyperLogLog sketch and its ``<column>_distinct`` estimate per cell;
+            sketches merge across cells (see hyperloglog.rollup_distinct).
 
     Returns:
         pd.DataFrame: The multidimensional OLAP cube.
@@ -90,12 +126,135 @@ def create_olap_cube(
         explicit_columns.append("sale_ids")  # Include the traceability column
         cube.columns = explicit_columns
 
+        # Mergeable distinct counts per cell
+        for column in sketches or []:
+            sketched = sketch_column(sales_df, dimensions, column)
+            cube[f"{column}_hll"] = sketched[f"{column}_hll"].to_numpy()
+            cube[f"{column}_distinct"] = sketched[f"{column}_distinct"].to_numpy()
+
         logger.info(f"OLAP cube created with dimensions: {dimensions}")
         return cube
     except Exception as e:
         logger.error(f"Error creating OLAP cube: {e}")
         raise
 
+def shard_sales(sales_df: pd.DataFrame, dimensions: list, n_shards: int, shard_by: str = "key") -> List[pd.DataFrame]:
+    """
+    Split sales into shards that never share a cube cell.
+
+    Args:
+        sales_df (pd.DataFrame): The sales data.
+        dimensions (list): The cube dimensions.
+        n_shards (int): Number of shards.
+        shard_by (str): "key" hashes each row's dimension values; "date" gives each shard
+            a contiguous range of sale dates (sale_date must be a dimension).
+
+    Returns:
+        list: Non-empty shards, each keeping the original row order.
+    """
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"Unknown shard mode '{shard_by}'. Use one of {SHARD_MODES}.")
+    if shard_by == "date":
+        if "sale_date" not in dimensions:
+            raise ValueError("Sharding by date needs sale_date as a cube dimension.")
+        dates = np.sort(sales_df["sale_date"].dropna().unique())
+        bounds = [ranges[0] for ranges in np.array_split(dates, n_shards) if len(ranges)]
+        # Missing dates sort before every bound and land in no shard, like groupby drops them
+        shard_ids = np.searchsorted(bounds, sales_df["sale_date"].fillna("").to_numpy(), side="right") - 1
+    else:
+        hashes = pd.util.hash_pandas_object(sales_df[dimensions], index=False).to_numpy()
+        shard_ids = hashes % np.uint64(n_shards)
+    shards = [sales_df[shard_ids == shard_id] for shard_id in range(n_shards)]
+    return [shard for shard in shards if not shard.empty]
+
+
+def _partial_metrics(metrics: dict) -> dict:
+    # Means are merged as sum / count, so partial cubes carry both
+    partial = {}
+    for column, agg_funcs in metrics.items():
+        agg_funcs = list(agg_funcs) if isinstance(agg_funcs, list) else [agg_funcs]
+        if "mean" in agg_funcs:
+            agg_funcs += [func for func in ("sum", "count") if func not in agg_funcs]
+        partial[column] = agg_funcs
+    return partial
+
+
+def merge_partial_cubes(
+    partials: List[pd.DataFrame], dimensions: list, metrics: dict, sketches: Optional[list] = None
+) -> pd.DataFrame:
+    """
+    Merge partial cubes built by create_olap_cube into one cube.
+
+    Cells that appear in several partials are combined algebraically: sums, counts,
+    minimums and maximums with themselves, means as merged sum / merged count, sale_ids
+    by concatenation in partial order and sketches by register maximum. The partials
+    must include the sum and count of every column with a mean (see _partial_metrics).
+
+    Returns:
+        pd.DataFrame: The merged cube, cells in dimension order, with create_olap_cube's columns.
+    """
+    combined = pd.concat(partials, ignore_index=True)
+    grouped = combined.groupby(dimensions, sort=True)
+    keys = grouped.size().reset_index()
+    columns = {dimension: keys[dimension] for dimension in dimensions}
+    combiners = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+    for column, agg_funcs in metrics.items():
+        for func in agg_funcs if isinstance(agg_funcs, list) else [agg_funcs]:
+            name = f"{column}_{func}"
+            if func == "mean":
+                total = grouped[f"{column}_sum"].sum().to_numpy()
+                columns[name] = total / grouped[f"{column}_count"].sum().to_numpy()
+            elif func in combiners:
+                columns[name] = grouped[name].agg(combiners[func]).to_numpy()
+            else:
+                raise ValueError(f"Metric '{func}' can't be merged from partial cubes.")
+    columns["sale_ids"] = grouped["sale_ids"].agg(lambda lists: list(itertools.chain.from_iterable(lists))).to_numpy()
+    for column in sketches or []:
+        merged = merge_sketches(combined, dimensions, column)
+        columns[f"{column}_hll"] = merged[f"{column}_hll"].to_numpy()
+        columns[f"{column}_distinct"] = merged[f"{column}_distinct"].to_numpy()
+    return pd.DataFrame(columns)
+
+
+def build_olap_cube(
+    sales_df: pd.DataFrame,
+    dimensions: list,
+    metrics: dict,
+    sketches: Optional[list] = None,
+    workers: int = CUBE_WORKERS,
+    shard_by: str = "key",
+    min_rows: int = PARALLEL_MIN_ROWS,
+) -> pd.DataFrame:
+    """
+    Build the OLAP cube on a process pool, one shard of the sales per task.
+
+    Each worker runs create_olap_cube on its shard and the partial cubes are merged
+    with merge_partial_cubes. Shards never share a cell, so every cell is computed
+    from the same rows in the same order as the serial build, and the result is
+    identical to ``create_olap_cube(sales_df, dimensions, metrics, sketches)``.
+
+    Args:
+        workers (int): Worker processes. With 1 the cube is built serially.
+        shard_by (str): "key" or "date", see shard_sales.
+        min_rows (int): Fewer sales than this are cubed serially, in this process.
+    """
+    parallel = workers > 1 and len(sales_df) >= min_rows
+    shards = shard_sales(sales_df, dimensions, workers, shard_by) if parallel else []
+    if len(shards) <= 1:
+        return create_olap_cube(sales_df, dimensions, metrics, sketches)
+    partial_metrics = _partial_metrics(metrics)
+    build_partial = functools.partial(create_olap_cube, dimensions=dimensions, metrics=partial_metrics, sketches=sketches)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(build_partial, shards))
+        cube = merge_partial_cubes(partials, dimensions, metrics, sketches)
+    except Exception as e:
+        logger.error(f"Error building OLAP cube on {workers} processes: {e}")
+        raise
+    logger.info(f"OLAP cube built from {len(shards)} shards on {workers} processes.")
+    return cube
+
+
 def generate_column_names(dimensions: list, metrics: dict) -> list:
     """
     Generate explicit column names for OLAP cube, ensuring no trailing underscores.
@@ -124,17 +283,87 @@ def generate_column_names(dimensions: list, metrics: dict) -> list:
     return column_names
     
 
+def cube_version_path(cube_path: pathlib.Path) -> pathlib.Path:
+    """Return the version stamp file published next to a cube file."""
+    return cube_path.with_name(f"{cube_path.name}.version")
+
+
 def write_cube_to_csv(cube: pd.DataFrame, filename: str) -> None:
-    """Write the OLAP cube to a CSV file."""
+    """
+    Write the OLAP cube to a CSV file and publish its new version.
+
+    The file is written to a temporary name and moved into place, so readers
+    never see a half-written cube. The version stamp (a hash of the file) is
+    written last; services watch it to drop cached results.
+    """
     try:
+        OLAP_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         output_path = OLAP_OUTPUT_DIR.joinpath(filename)
-        cube.to_csv(output_path, index=False)
-        logger.info(f"OLAP cube saved to {output_path}.")
+        tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+        cube.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, output_path)
+
+        version = hashlib.sha256(output_path.read_bytes()).hexdigest()
+        version_path = cube_version_path(output_path)
+        tmp_version_path = version_path.with_name(f"{version_path.name}.tmp")
+        tmp_version_path.write_text(version)
+        os.replace(tmp_version_path, version_path)
+        logger.info(f"OLAP cube saved to {output_path} (version {version[:12]}).")
     except Exception as e:
         logger.error(f"Error saving OLAP cube to CSV file: {e}")
         raise
 
 
+def write_bitmap_index(sales_df: pd.DataFrame) -> None:
+    """Build the bitmap index over the cubed sales and save it next to the cube."""
+    try:
+        OLAP_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        index_path = bitmap_index_path(OLAP_OUTPUT_DIR.joinpath(CUBE_FILE_NAME))
+        BitmapIndex.build(sales_df).save(index_path)
+        logger.info(f"Bitmap index saved to {index_path}.")
+    except Exception as e:
+        logger.error(f"Error saving bitmap index: {e}")
+        raise
+
+
+def refresh_cube_cells(sale_dates: Iterable[str]) -> None:
+    """
+    Recompute only the cube cells for the given sale dates and republish the cube.
+
+    Sales for those dates are read from the warehouse (pruned to the overlapping
+    monthly partitions), their cells replace the old ones and every other cell is
+    kept as is. Builds the whole cube if none exists yet.
+
+    Args:
+        sale_dates (iterable): ISO sale dates whose sales changed.
+    """
+    sale_dates = sorted(set(sale_dates))
+    if not sale_dates:
+        return
+    cube_path = OLAP_OUTPUT_DIR.joinpath(CUBE_FILE_NAME)
+    if not cube_path.exists():
+        main()
+        return
+
+    sales_df = ingest_sales_data_from_dw(sale_dates[0], sale_dates[-1])
+    sales_df = sales_df[sales_df["sale_date"].isin(sale_dates)]
+
+    # Swap the refreshed dates' rows in the bitmap index too
+    index_path = bitmap_index_path(cube_path)
+    if index_path.exists():
+        index = BitmapIndex.load(index_path)
+        date_keys = to_date_key(pd.Series(sale_dates)).dropna().to_numpy(dtype="int64")
+        kept = index.take(~np.isin(index.columns["date_key"], date_keys))
+        kept.append(BitmapIndex.build(sales_df)).save(index_path)
+
+    cube = pd.read_csv(cube_path, float_precision="round_trip")
+    cube = cube[~cube["sale_date"].isin(sale_dates)]
+    if not sales_df.empty:
+        cube = pd.concat([cube, create_olap_cube(sales_df, CUBE_DIMENSIONS, CUBE_METRICS, CUBE_SKETCHES)], ignore_index=True)
+    write_cube_to_csv(cube.sort_values(CUBE_DIMENSIONS, kind="stable"), CUBE_FILE_NAME)
+    logger.info(f"Refreshed cube cells for {len(sale_dates)} sale dates.")
+
+
 def main():
     """Main function for OLAP cubing."""
     logger.info("Starting OLAP Cubing process...")
@@ -142,24 +371,16 @@ def main():
     # Step 1: Ingest sales data
     sales_df = ingest_sales_data_from_dw()
 
-    # Step 2: Add additional columns for time-based dimensions
-    sales_df["sale_date"] = pd.to_datetime(sales_df["sale_date"])
-    sales_df["Day"] = sales_df["sale_date"].dt.day
-    sales_df["Month"] = sales_df["sale_date"].dt.month
-    sales_df["Year"] = sales_df["sale_date"].dt.year
+    # Step 2: Time-based dimensions (Day, Month, Year) come prebuilt from the date table
 
-    # Step 3: Define dimensions and metrics for the cube
-    dimensions = ["sale_date", "Month", "campaign_name", "category"]
-    metrics = {
-        "sale_amount": ["sum", "mean"],
-        "sale_id": ["count"]
-    }
+    # Step 3: Dimensions, metrics and sketches for the cube are CUBE_DIMENSIONS, CUBE_METRICS and CUBE_SKETCHES
 
-    # Step 4: Create the cube
-    olap_cube = create_olap_cube(sales_df, dimensions, metrics)
+    # Step 4: Create the cube (sharded across CUBE_WORKERS processes for large sales tables)
+    olap_cube = build_olap_cube(sales_df, CUBE_DIMENSIONS, CUBE_METRICS, CUBE_SKETCHES)
 
-    # Step 5: Save the cube to a CSV file
-    write_cube_to_csv(olap_cube, "multidimensional_olap_cube.csv")
+    # Step 5: Index the sales for slicing, then save the cube (publishing its version last)
+    write_bitmap_index(sales_df)
+    write_cube_to_csv(olap_cube, CUBE_FILE_NAME)
 
     logger.info("OLAP Cubing process completed successfully.")
     logger.info(f"Please see outputs in {OLAP_OUTPUT_DIR}")
@@ -1,5 +1,4 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import pathlib
 import sys
 
@@ -9,15 +8,14 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 from utils.logger import logger  # noqa: E402
+from scripts.ranking import bottom_k  # noqa: E402
+from scripts.report_charts import render_charts  # noqa: E402
 
 # Constants
 OLAP_OUTPUT_DIR: pathlib.Path = pathlib.Path("data").joinpath("olap_cubing_outputs")
 CUBED_FILE: pathlib.Path = OLAP_OUTPUT_DIR.joinpath("multidimensional_olap_cube.csv")
 RESULTS_OUTPUT_DIR: pathlib.Path = pathlib.Path("data").joinpath("results")
 
-# Create output directory for results if it doesn't exist
-RESULTS_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
 
 def load_olap_cube(file_path: pathlib.Path) -> pd.DataFrame:
     """Load the precomputed OLAP cube data."""
@@ -38,7 +36,8 @@ def analyze_sales_by_campaign(cube_df: pd.DataFrame) -> pd.DataFrame:
             cube_df.groupby("campaign_name")["sale_amount_sum"].sum().reset_index()
         )
         sales_by_campaign.rename(columns={"sale_amount_sum": "TotalSales"}, inplace=True)
-        sales_by_campaign.sort_values(by="TotalSales", inplace=True)
+        # One row per campaign, so sorting the selected rows is cheap
+        sales_by_campaign.sort_values(by="TotalSales", inplace=True, ignore_index=True)
         logger.info("Sales aggregated by DayOfWeek successfully.")
         return sales_by_campaign
     except Exception as e:
@@ -49,7 +48,8 @@ def analyze_sales_by_campaign(cube_df: pd.DataFrame) -> pd.DataFrame:
 def identify_least_profitable_campaign(sales_by_campaign: pd.DataFrame) -> str:
     """Identify the day with the lowest total sales revenue."""
     try:
-        least_profitable_campaign = sales_by_campaign.iloc[0]
+        # Partial selection instead of sorting every campaign
+        least_profitable_campaign = bottom_k(sales_by_campaign, "TotalSales", 1).iloc[0]
         logger.info(
             f"Least profitable campaign: {least_profitable_campaign['campaign_name']} with revenue ${least_profitable_campaign['TotalSales']:.2f}."
         )
@@ -59,31 +59,6 @@ def identify_least_profitable_campaign(sales_by_campaign: pd.DataFrame) -> str:
         raise
 
 
-def visualize_sales_by_campaign(sales_by_campaign: pd.DataFrame) -> None:
-    """Visualize total sales by day of the week."""
-    try:
-        plt.figure(figsize=(10, 6))
-        plt.bar(
-            sales_by_campaign["campaign_name"],
-            sales_by_campaign["TotalSales"],
-            color="skyblue",
-        )
-        plt.title("Total Sales by Campaign", fontsize=16)
-        plt.xlabel("Campaign", fontsize=12)
-        plt.ylabel("Total Sales (USD)", fontsize=12)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        # Save the visualization
-        output_path = RESULTS_OUTPUT_DIR.joinpath("sales_by_campaign_of_week.png")
-        plt.savefig(output_path)
-        logger.info(f"Visualization saved to {output_path}.")
-        plt.show()
-    except Exception as e:
-        logger.error(f"Error visualizing sales by day of the week: {e}")
-        raise
-
-
 def main():
     """Main function for analyzing and visualizing sales data."""
     logger.info("Starting SALES PER CAMPAIGN analysis...")
@@ -97,10 +72,10 @@ def main():
     # Step 3: Identify the least profitable day
     least_profitable_campaign = identify_least_profitable_campaign(sales_by_campaign)
     logger.info(f"Least profitable campaign: {least_profitable_campaign}")
-    logger.info("Close the Figure to complete this script.")
 
-    # Step 4: Visualize total sales by DayOfWeek
-    visualize_sales_by_campaign(sales_by_campaign)
+    # Step 4: Render the report charts (by campaign, category and month) in one batch.
+    # Charts whose input cuboid is unchanged since the last run are skipped.
+    render_charts(cube_df, RESULTS_OUTPUT_DIR)
     logger.info("Analysis and visualization completed successfully.")
 
 
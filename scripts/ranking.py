@@ -0,0 +1,64 @@
+"""
+scripts/ranking.py
+
+Top-k and bottom-k ranking without sorting everything.
+
+DataFrames (cube or warehouse results) use nlargest / nsmallest, optionally
+per partition such as per category. These cost O(n log k) instead of the
+O(n log n) of a full sort_values.
+"""
+
+import pathlib
+import sys
+from typing import List, Optional, Union
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.warehouse import DB_PATH, read_sql  # noqa: E402
+from scripts.customer_summary import TOP_CUSTOMERS_QUERY  # noqa: E402
+
+
+def top_k(
+    df: pd.DataFrame,
+    metric: str,
+    k: int,
+    by: Optional[Union[str, List[str]]] = None,
+    largest: bool = True,
+) -> pd.DataFrame:
+    """
+    Return the k rows with the largest (or smallest) metric, optionally within each partition.
+
+    Args:
+        df (pd.DataFrame): Cube or warehouse rows.
+        metric (str): Column to rank by.
+        k (int): Rows to keep (per partition when ``by`` is given).
+        by (str or list, optional): Partition columns, e.g. "category".
+        largest (bool): True for top-k, False for bottom-k.
+
+    Returns:
+        pd.DataFrame: The selected rows, best first (within each partition).
+    """
+    if by is None:
+        return df.nlargest(k, metric) if largest else df.nsmallest(k, metric)
+    if not df.index.is_unique:
+        df = df.reset_index(drop=True)
+    grouped = df.groupby(by, sort=False)[metric]
+    picked = grouped.nlargest(k) if largest else grouped.nsmallest(k)
+    return df.loc[picked.index.get_level_values(-1)]
+
+
+def bottom_k(
+    df: pd.DataFrame, metric: str, k: int, by: Optional[Union[str, List[str]]] = None
+) -> pd.DataFrame:
+    """Return the k rows with the smallest metric, optionally within each partition."""
+    return top_k(df, metric, k, by=by, largest=False)
+
+
+def top_customers(k: int = 10, db_path: Union[str, pathlib.Path] = DB_PATH) -> pd.DataFrame:
+    """Return the k customers with the highest total spent (index range scan on customer_summary)."""
+    return read_sql(TOP_CUSTOMERS_QUERY, (k,), db_path=db_path)
@@ -0,0 +1,171 @@
+"""
+scripts/raw_ingest.py
+
+Header-driven reading of the raw CSV files through a schema registry.
+
+Raw headers drift: ``CustomerID`` or ``customer_id``, stray unnamed columns
+(the trailing ``,,3`` of products_data.csv), columns nobody asked for.
+Instead of parsing every column and then lowercasing the headers and
+dropping the unexpected ones, ``read_raw_csv`` reads the header row alone,
+maps each header through SCHEMA_REGISTRY (ignoring case, whitespace,
+underscores and hyphens, and accepting known aliases) and has the C parser
+convert only the mapped columns, each with its registry dtype. Other
+columns are skipped by position, so they cost nothing to parse however
+messy they are. Missing, unexpected and renamed columns are logged; none of
+them stops the read.
+"""
+
+import csv
+import pathlib
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import pandas as pd
+from pandas.io.parsers import TextFileReader
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+
+
+class RawColumn(NamedTuple):
+    """One expected raw column."""
+
+    kind: str  # how clean_data treats it: "id", "str", "int", "float" or "datetime"
+    dtype: str  # dtype the parser converts it to
+    aliases: Tuple[str, ...] = ()  # other header names it may appear under
+
+
+# Constants
+CSV_ENGINE: str = "c"  # pyarrow can't read in chunks and isn't a dependency
+# Dataset -> canonical column -> how it is read. Ids and counts are parsed as floats
+# so missing values survive until clean_data drops or fills them.
+SCHEMA_REGISTRY: Dict[str, Dict[str, RawColumn]] = {
+    "customers": {
+        "customerid": RawColumn("id", "float64"),
+        "name": RawColumn("str", "str", ("customername",)),
+        "region": RawColumn("str", "str"),
+        "joindate": RawColumn("datetime", "str"),
+        "loyaltypoints": RawColumn("str", "float64"),
+        "gender": RawColumn("str", "str"),
+    },
+    "products": {
+        "productid": RawColumn("id", "float64"),
+        "productname": RawColumn("str", "str"),
+        "category": RawColumn("str", "str"),
+        "unitprice": RawColumn("float", "float64", ("price",)),
+        "stock": RawColumn("int", "float64"),
+        "supplier": RawColumn("str", "str"),
+    },
+    "sales": {
+        "transactionid": RawColumn("id", "float64", ("saleid",)),
+        "saledate": RawColumn("datetime", "str"),
+        "customerid": RawColumn("id", "float64"),
+        "productid": RawColumn("id", "float64"),
+        "storeid": RawColumn("id", "float64"),
+        "campaignid": RawColumn("id", "float64"),
+        "saleamount": RawColumn("float", "float64", ("amount",)),
+        "bonuspoints": RawColumn("int", "float64"),
+        "paymenttype": RawColumn("str", "str"),
+    },
+}
+
+
+class HeaderMapping(NamedTuple):
+    """How a file's header maps onto its registry entry."""
+
+    positions: List[int]  # header positions that are parsed, in file order
+    names: List[str]  # canonical name of each parsed position
+    missing: List[str]  # registry columns not in the header
+    unexpected: List[str]  # header names not in the registry (or repeated); never parsed
+    renamed: List[str]  # "<header> -> <canonical>" for headers not already canonical
+
+
+def dataset_for_file(file_name: str) -> str:
+    """Return the registry entry of a raw file from its name, e.g. "sales" for sales_data.csv."""
+    return "sales" if "sales" in file_name else "products" if "products" in file_name else "customers"
+
+
+def column_kinds(dataset: str) -> Dict[str, str]:
+    """Return canonical column -> kind ("id", "str", ...) for a dataset."""
+    return {name: column.kind for name, column in SCHEMA_REGISTRY[dataset].items()}
+
+
+def normalize_header(name: str) -> str:
+    """Return a header in registry form: lowercase, without whitespace, underscores or hyphens."""
+    return re.sub(r"[\s_\-]+", "", str(name)).lower()
+
+
+def map_header(header: List[str], dataset: str) -> HeaderMapping:
+    """Map raw header names onto a dataset's canonical columns (the first match of a column wins)."""
+    schema = SCHEMA_REGISTRY[dataset]
+    lookup = {
+        normalize_header(alias): name
+        for name, column in schema.items()
+        for alias in (name, *column.aliases)
+    }
+    positions, names, unexpected, renamed = [], [], [], []
+    for position, raw_name in enumerate(header):
+        name = lookup.get(normalize_header(raw_name))
+        if name is None or name in names:
+            unexpected.append(raw_name)
+            continue
+        positions.append(position)
+        names.append(name)
+        if raw_name != name:
+            renamed.append(f"{raw_name} -> {name}")
+    missing = [name for name in schema if name not in names]
+    return HeaderMapping(positions, names, missing, unexpected, renamed)
+
+
+def read_header(file_path: pathlib.Path) -> List[str]:
+    """Return the header row of a CSV file without reading any data rows."""
+    with open(file_path, newline="", encoding="utf-8-sig") as file:
+        return next(csv.reader(file), [])
+
+
+def report_drift(file_path: pathlib.Path, mapping: HeaderMapping) -> None:
+    """Log how a file's header differs from its registry entry."""
+    if mapping.renamed:
+        logger.info(f"Mapped columns of {file_path.name}: {', '.join(mapping.renamed)}")
+    if mapping.unexpected:
+        logger.warning(f"Skipped unexpected columns of {file_path.name}: {mapping.unexpected}")
+    if mapping.missing:
+        logger.warning(f"Columns missing from {file_path.name}: {mapping.missing}")
+
+
+def read_raw_csv(
+    file_path: Union[str, pathlib.Path], dataset: Optional[str] = None, **read_options
+) -> Union[pd.DataFrame, TextFileReader]:
+    """
+    Read only the registry columns of a raw CSV file, under their canonical names.
+
+    Args:
+        file_path (str or Path): Raw CSV file.
+        dataset (str, optional): SCHEMA_REGISTRY entry; chosen from the file name by default.
+        **read_options: Passed on to pd.read_csv, e.g. chunksize.
+
+    Returns:
+        pd.DataFrame: The mapped columns (or a chunk reader if chunksize is given).
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+    """
+    file_path = pathlib.Path(file_path)
+    dataset = dataset or dataset_for_file(file_path.name)
+    mapping = map_header(read_header(file_path), dataset)
+    report_drift(file_path, mapping)
+    schema = SCHEMA_REGISTRY[dataset]
+    return pd.read_csv(
+        file_path,
+        header=0,
+        names=mapping.names,
+        usecols=mapping.positions,
+        dtype={name: schema[name].dtype for name in mapping.names},
+        engine=CSV_ENGINE,
+        **read_options,
+    )
@@ -0,0 +1,95 @@
+"""
+scripts/referential_integrity.py
+
+Batch referential-integrity validation before a warehouse load.
+
+SQLite foreign key enforcement checks every inserted row one at a time, so the
+ETL leaves it off. Instead, every sale's customer, product and campaign id is
+checked against the dimension key sets in one vectorized hash lookup per key
+(``Series.isin``). Orphaned sales are written to a reject file with the
+reasons and left out of the load. A run without orphans removes the reject
+file of an earlier run, so the file only ever lists the current rejects.
+"""
+
+import pathlib
+import sys
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+
+# Constants
+REJECTS_DIR: pathlib.Path = PROJECT_ROOT.joinpath("data", "rejects")
+REJECT_REASON_COLUMN: str = "reject_reason"
+
+
+def split_orphans(
+    facts_df: pd.DataFrame, foreign_keys: Dict[str, Iterable]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split fact rows into valid rows and orphans whose foreign keys have no dimension row.
+
+    Args:
+        facts_df (pd.DataFrame): Fact rows, e.g. prepared sales.
+        foreign_keys (dict): Fact column -> valid key values from the dimension,
+            e.g. {"customerid": customers_df["customerid"]}.
+
+    Returns:
+        tuple: (valid rows, orphan rows with a reject_reason column).
+    """
+    reasons = pd.Series("", index=facts_df.index, dtype=object)
+    for column, keys in foreign_keys.items():
+        values = facts_df[column]
+        missing = values.isna().to_numpy()
+        unknown = ~values.isin(pd.Index(keys).unique()).to_numpy() & ~missing
+        text = np.where(missing, f"missing {column}; ", "")
+        text = np.where(unknown, "unknown " + column + " " + values.astype(str) + "; ", text)
+        reasons = reasons + text
+
+    orphan_mask = reasons.str.len() > 0
+    rejects_df = facts_df[orphan_mask].assign(**{REJECT_REASON_COLUMN: reasons[orphan_mask].str.rstrip("; ")})
+    return facts_df[~orphan_mask], rejects_df
+
+
+def write_rejects(rejects_df: pd.DataFrame, file_name: str) -> pathlib.Path:
+    """Write rejected rows (with their reasons) to data/rejects/<file_name>."""
+    REJECTS_DIR.mkdir(parents=True, exist_ok=True)
+    file_path = REJECTS_DIR.joinpath(file_name)
+    rejects_df.to_csv(file_path, index=False)
+    return file_path
+
+
+def clear_rejects(file_name: str) -> None:
+    """Remove data/rejects/<file_name> left by an earlier run, if there is one."""
+    file_path = REJECTS_DIR.joinpath(file_name)
+    if file_path.exists():
+        file_path.unlink()
+        logger.info(f"Removed stale reject file {file_path}.")
+
+
+def validate_foreign_keys(
+    facts_df: pd.DataFrame, foreign_keys: Dict[str, Iterable], reject_file_name: str
+) -> pd.DataFrame:
+    """
+    Drop orphaned fact rows before a load and record them in a reject file.
+
+    Returns:
+        pd.DataFrame: The rows that passed every foreign key check.
+    """
+    valid_df, rejects_df = split_orphans(facts_df, foreign_keys)
+    if rejects_df.empty:
+        logger.info(f"Referential integrity check passed for {len(valid_df)} rows.")
+        clear_rejects(reject_file_name)
+    else:
+        file_path = write_rejects(rejects_df, reject_file_name)
+        logger.warning(
+            f"Rejected {len(rejects_df)} of {len(facts_df)} rows with unknown keys; see {file_path}"
+        )
+    return valid_df
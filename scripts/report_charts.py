@@ -0,0 +1,179 @@
+"""
+scripts/report_charts.py
+
+Headless, batched rendering of the report charts.
+
+Charts are drawn on matplotlib's Agg canvas without pyplot, so nothing opens a
+window and no global figure state is shared. A batch of charts is rendered in
+a process pool; each worker keeps one Figure and clears it between charts.
+
+Every chart is rendered from a small cuboid (the cube rolled up to one
+dimension). A hash of that cuboid is kept in a manifest next to the outputs,
+and a chart whose cuboid has not changed since the last run is skipped.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+
+# Constants
+MANIFEST_FILE: str = "chart_manifest.json"
+SUPPORTED_FORMATS = ("png", "svg")
+
+
+class ChartSpec(NamedTuple):
+    """One bar chart of a cube metric rolled up to a single dimension."""
+
+    name: str
+    dimension: str
+    title: str
+    xlabel: str
+    metric: str = "sale_amount_sum"
+    ylabel: str = "Total Sales (USD)"
+
+
+DEFAULT_CHARTS: List[ChartSpec] = [
+    ChartSpec("sales_by_campaign_of_week", "campaign_name", "Total Sales by Campaign", "Campaign"),
+    ChartSpec("sales_by_category", "category", "Total Sales by Category", "Category"),
+    ChartSpec("sales_by_month", "Month", "Total Sales by Month", "Month"),
+]
+
+# One reusable figure per process (created on first use)
+_figure = None
+
+
+def cuboid(cube_df: pd.DataFrame, spec: ChartSpec) -> pd.Series:
+    """Roll the cube up to the chart's dimension, sorted by value like the campaign analysis."""
+    return cube_df.groupby(spec.dimension)[spec.metric].sum().sort_values()
+
+
+def cuboid_hash(data: pd.Series, spec: ChartSpec, fmt: str) -> str:
+    """Hash a chart's input cuboid together with its spec and output format."""
+    digest = hashlib.sha256(repr((tuple(spec), fmt)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def _get_figure():
+    """Return this process's reusable figure, attached to an Agg canvas."""
+    global _figure
+    if _figure is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        _figure = Figure(figsize=(10, 6))
+        FigureCanvasAgg(_figure)
+    return _figure
+
+
+def render_bar_chart(
+    labels: Sequence, values: Sequence, spec: ChartSpec, output_path: pathlib.Path
+) -> pathlib.Path:
+    """
+    Draw one bar chart on the reusable figure and save it.
+
+    Args:
+        labels (sequence): Bar labels.
+        values (sequence): Bar heights.
+        spec (ChartSpec): Title and axis labels.
+        output_path (Path): Target file; the suffix (.png or .svg) selects the format.
+
+    Returns:
+        Path: The written file.
+    """
+    figure = _get_figure()
+    figure.clf()
+    ax = figure.add_subplot()
+    ax.bar([str(label) for label in labels], values, color="skyblue")
+    ax.set_title(spec.title, fontsize=16)
+    ax.set_xlabel(spec.xlabel, fontsize=12)
+    ax.set_ylabel(spec.ylabel, fontsize=12)
+    ax.tick_params(axis="x", labelrotation=45)
+    figure.tight_layout()
+    figure.savefig(output_path)
+    return output_path
+
+
+def _render_job(job: tuple) -> str:
+    """Process pool entry point: render one chart from plain, picklable values."""
+    labels, values, spec, output_path = job
+    return str(render_bar_chart(labels, values, ChartSpec(*spec), pathlib.Path(output_path)))
+
+
+def _load_manifest(output_dir: pathlib.Path) -> Dict[str, str]:
+    manifest_path = output_dir.joinpath(MANIFEST_FILE)
+    if not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable chart manifest {manifest_path}: {e}")
+        return {}
+
+
+def render_charts(
+    cube_df: pd.DataFrame,
+    output_dir: pathlib.Path,
+    specs: Sequence[ChartSpec] = DEFAULT_CHARTS,
+    fmt: str = "png",
+    workers: Optional[int] = None,
+) -> Dict[str, Optional[pathlib.Path]]:
+    """
+    Render a batch of charts from the cube, skipping those whose input is unchanged.
+
+    Args:
+        cube_df (pd.DataFrame): The OLAP cube.
+        output_dir (Path): Directory for the chart files and the hash manifest.
+        specs (list): Charts to render.
+        fmt (str): "png" or "svg".
+        workers (int, optional): Process pool size. Defaults to one per chart, up to the CPU count.
+            With 1 worker the charts are rendered in this process.
+
+    Returns:
+        dict: Chart name -> written path, or None if the chart was skipped.
+    """
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported chart format '{fmt}'. Use one of {SUPPORTED_FORMATS}.")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+
+    results: Dict[str, Optional[pathlib.Path]] = {}
+    jobs, hashes = [], {}
+    for spec in specs:
+        data = cuboid(cube_df, spec)
+        output_path = output_dir.joinpath(f"{spec.name}.{fmt}")
+        key = f"{spec.name}.{fmt}"
+        hashes[key] = cuboid_hash(data, spec, fmt)
+        if manifest.get(key) == hashes[key] and output_path.exists():
+            logger.info(f"Chart {output_path} is up to date; skipping.")
+            results[spec.name] = None
+            continue
+        jobs.append((data.index.tolist(), data.values.tolist(), tuple(spec), str(output_path)))
+
+    if jobs:
+        workers = workers or min(len(jobs), os.cpu_count() or 1)
+        if workers == 1:
+            written = [_render_job(job) for job in jobs]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                written = list(executor.map(_render_job, jobs))
+        for job, path in zip(jobs, written):
+            results[job[2][0]] = pathlib.Path(path)
+            logger.info(f"Chart saved to {path}.")
+
+    manifest.update(hashes)
+    output_dir.joinpath(MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return results
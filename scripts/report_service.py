@@ -0,0 +1,316 @@
+"""
+scripts/report_service.py
+
+Long-running report service answering cube queries over a local HTTP API.
+
+Start it once and leave it running:
+
+    py scripts\\report_service.py
+
+The service keeps the OLAP cube and pooled warehouse connections warm in
+memory and answers repeat queries from an LRU result cache. When
+olap_cubing publishes a new cube version, the cube is reloaded and the
+cache is cleared on the next request. Queries that read the warehouse
+directly (top customers and the approximate answers) are also keyed on the
+sales version the ETL stamps on every load, so they are recomputed after
+new sales arrive even if the cube is unchanged.
+
+Endpoints (all GET, JSON responses):
+
+    /health
+    /version
+    /sales-by-campaign
+    /least-profitable-campaign
+    /sales-by?dimension=category
+    /top-customers?limit=10
+    /slice?category=CLOTHING,SPORTS&payment_type=CREDIT&by=region
+    /approximate?by=campaign_name,category&error=0.05&budget_ms=50
+    /distinct?by=campaign_name&of=customer_id
+"""
+
+import collections
+import json
+import pathlib
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts.olap_cubing import DB_PATH, cube_version_path  # noqa: E402
+from scripts.olap_sales_per_campaign import (  # noqa: E402
+    CUBED_FILE,
+    analyze_sales_by_campaign,
+    identify_least_profitable_campaign,
+    load_olap_cube,
+)
+from scripts.ranking import top_customers  # noqa: E402
+from scripts.bitmap_index import BitmapIndex, bitmap_index_path  # noqa: E402
+from scripts import approximate_query  # noqa: E402
+from scripts.hyperloglog import rollup_distinct  # noqa: E402
+from scripts.warehouse import read_sales_version  # noqa: E402
+
+# Constants
+HOST: str = "127.0.0.1"
+PORT: int = 8765
+CACHE_SIZE: int = 256
+CUBE_DIMENSIONS = ("sale_date", "Month", "campaign_name", "category")
+WAREHOUSE_QUERIES = ("top-customers", "approximate")  # read customer_summary / sale_sample, not the cube
+
+
+class ResultCache:
+    """Thread-safe least-recently-used cache of query results."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: "collections.OrderedDict[Hashable, Any]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) and mark the entry as recently used."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return True, self._items[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a result, evicting the least recently used one when full."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+class ReportService:
+    """Holds the cube in memory and answers named queries through the result cache."""
+
+    def __init__(
+        self,
+        cube_file: pathlib.Path = CUBED_FILE,
+        db_path: pathlib.Path = DB_PATH,
+        cache_size: int = CACHE_SIZE,
+    ):
+        self.cube_file = pathlib.Path(cube_file)
+        self.db_path = db_path
+        self.cache = ResultCache(cache_size)
+        self.cube_df: Optional[pd.DataFrame] = None
+        self.bitmap_index: Optional[BitmapIndex] = None
+        self.sample_df: Optional[pd.DataFrame] = None
+        self.version: Optional[str] = None
+        self.sales_version: Optional[str] = None
+        self._version_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+        self.queries: Dict[str, Callable[..., Any]] = {
+            "sales-by-campaign": self.sales_by_campaign,
+            "least-profitable-campaign": self.least_profitable_campaign,
+            "sales-by": self.sales_by,
+            "top-customers": self.top_customers,
+            "slice": self.slice,
+            "approximate": self.approximate,
+            "distinct": self.distinct,
+        }
+
+    def refresh(self) -> None:
+        """Reload the cube and clear the cache if a new cube version was published."""
+        version_path = cube_version_path(self.cube_file)
+        try:
+            mtime = version_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None  # cube published before versioning; load it once
+        if self.cube_df is not None and mtime == self._version_mtime:
+            return
+        with self._lock:
+            if self.cube_df is not None and mtime == self._version_mtime:
+                return
+            version = version_path.read_text().strip() if mtime is not None else "unversioned"
+            if version != self.version or self.cube_df is None:
+                self.cube_df = load_olap_cube(self.cube_file)
+                index_path = bitmap_index_path(self.cube_file)
+                self.bitmap_index = BitmapIndex.load(index_path) if index_path.exists() else None
+                self.sample_df = None  # reread with the new data on the next approximate query
+                self.version = version
+                self.cache.clear()
+                logger.info(f"Report service loaded cube version {version[:12]}.")
+            self._version_mtime = mtime
+
+    def refresh_sales(self) -> str:
+        """Return the warehouse's sales version, dropping the loaded sample if it changed."""
+        sales_version = read_sales_version(self.db_path)
+        if sales_version != self.sales_version:
+            with self._lock:
+                if sales_version != self.sales_version:
+                    self.sample_df = None
+                    self.sales_version = sales_version
+        return sales_version
+
+    def query(self, name: str, **params: str) -> Any:
+        """
+        Run a named query, answering from the cache when possible.
+
+        Raises:
+            KeyError: If the query name is unknown.
+            ValueError: If a parameter is invalid.
+        """
+        handler = self.queries[name]
+        self.refresh()
+        sales_version = self.refresh_sales() if name in WAREHOUSE_QUERIES else None
+        key = (self.version, sales_version, name, tuple(sorted(params.items())))
+        found, result = self.cache.get(key)
+        if found:
+            return result
+        result = handler(**params)
+        self.cache.put(key, result)
+        return result
+
+    def sales_by_campaign(self) -> list:
+        return analyze_sales_by_campaign(self.cube_df).to_dict(orient="records")
+
+    def least_profitable_campaign(self) -> dict:
+        sales_by_campaign = analyze_sales_by_campaign(self.cube_df)
+        campaign_name = identify_least_profitable_campaign(sales_by_campaign)
+        total = sales_by_campaign.loc[sales_by_campaign["campaign_name"] == campaign_name, "TotalSales"]
+        return {"campaign_name": campaign_name, "TotalSales": float(total.iloc[0])}
+
+    def sales_by(self, dimension: str = "campaign_name") -> list:
+        if dimension not in CUBE_DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dimension}'. Use one of {CUBE_DIMENSIONS}.")
+        totals = self.cube_df.groupby(dimension)["sale_amount_sum"].sum().reset_index()
+        return totals.rename(columns={"sale_amount_sum": "TotalSales"}).to_dict(orient="records")
+
+    def top_customers(self, limit: str = "10") -> list:
+        if not limit.isdigit():
+            raise ValueError("limit must be a positive integer.")
+        return top_customers(int(limit), db_path=self.db_path).to_dict(orient="records")
+
+    def slice(self, by: Optional[str] = None, **filters: str) -> dict:
+        """Sales count and total for a slice (comma-separated values are OR-ed), optionally per value of ``by``."""
+        if self.bitmap_index is None:
+            raise ValueError("No bitmap index for this cube; rerun olap_cubing.")
+        parsed = {dimension: values.split(",") for dimension, values in filters.items()}
+        if by:
+            return self.bitmap_index.aggregate_by(by, parsed)
+        return self.bitmap_index.aggregate(parsed)
+
+    def distinct(self, by: str = "campaign_name", of: str = "customer_id") -> list:
+        """Estimated distinct ids per value of the ``by`` dimensions, merged from the cells' sketches."""
+        dimensions = by.split(",")
+        unknown = [dimension for dimension in dimensions if dimension not in CUBE_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimensions {unknown}. Use one of {CUBE_DIMENSIONS}.")
+        if f"{of}_hll" not in self.cube_df.columns:
+            raise ValueError(f"No distinct-count sketch for '{of}' in this cube.")
+        return rollup_distinct(self.cube_df, dimensions, of).to_dict(orient="records")
+
+    def approximate(
+        self,
+        by: str = "campaign_name,category",
+        error: Optional[str] = None,
+        budget_ms: Optional[str] = None,
+        confidence: str = "0.95",
+    ) -> dict:
+        """Sales per cell estimated from the sale sample, with confidence intervals."""
+        try:
+            error_target = float(error) if error is not None else None
+            latency_budget_s = float(budget_ms) / 1000 if budget_ms is not None else None
+            confidence_level = float(confidence)
+        except ValueError:
+            raise ValueError("error, budget_ms and confidence must be numbers.")
+        if not 0 < confidence_level < 1:
+            raise ValueError("confidence must be between 0 and 1.")
+        dimensions = by.split(",")
+        unknown = [dimension for dimension in dimensions if dimension not in approximate_query.SAMPLE_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimensions {unknown}. Use {approximate_query.SAMPLE_DIMENSIONS}.")
+        if self.sample_df is None:
+            self.sample_df = approximate_query.load_sample(self.db_path)
+        result = approximate_query.approximate_aggregate(
+            self.sample_df, dimensions, confidence=confidence_level,
+            error_target=error_target, latency_budget_s=latency_budget_s,
+        )
+        return {
+            "rows_per_stratum": result.rows_per_stratum,
+            "relative_error": result.relative_error,
+            "complete": result.complete,
+            "cells": result.cube.to_dict(orient="records"),
+        }
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Maps GET /<query>?<params> to ReportService.query and returns JSON."""
+
+    service: ReportService  # set by make_server()
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        name = url.path.strip("/")
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if name == "health":
+                body = {"status": "ok"}
+            elif name == "version":
+                self.service.refresh()
+                body = {"version": self.service.version}
+            elif name not in self.service.queries:
+                self._send(404, {"error": f"Unknown query '{name}'."})
+                return
+            else:
+                body = {"query": name, "result": self.service.query(name, **params)}
+            self._send(200, body)
+        except (TypeError, ValueError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            logger.error(f"Error answering {self.path}: {e}")
+            self._send(500, {"error": "Internal error."})
+
+    def _send(self, status: int, body: dict) -> None:
+        payload = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def make_server(service: ReportService, host: str = HOST, port: int = PORT) -> ThreadingHTTPServer:
+    """Create (but don't start) the HTTP server bound to a service instance."""
+    handler = type("BoundReportRequestHandler", (ReportRequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main() -> None:
+    """Start the report service and serve until interrupted."""
+    service = ReportService()
+    service.refresh()
+    server = make_server(service)
+    logger.info(f"Report service listening on http://{HOST}:{PORT}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Report service stopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+scripts/sale_partitions.py
+
+Month-partitioned storage for the sale fact table.
+
+Sales are stored in one table per calendar month (``sale_2024_05``) and the
+name ``sale`` is a UNION ALL view over all partitions, so existing readers
+(olap_cubing, the Power BI ODBC queries) keep working unchanged.
+
+sale_id is unique across all partitions, as it was when ``sale`` was one
+table. Date-bounded readers can ask for ``sale_source_sql`` to scan only the
+partitions that overlap their range.
+
+Incremental loads don't write the partitions directly. They append to
+``sale_delta``, a staging table with no indexes where every insert lands at
+the end of the table, and the view shows main and delta together: the
+newest delta row per sale_id wins over the partition row it replaces,
+whatever month either is in, so a re-sent sale with a new date moves to
+its new month and late sales for old months are kept. ``compact_delta``
+periodically merges the delta into the partitions in sale_id order and
+empties it, so the indexed partitions are written in large sorted batches
+instead of many small random upserts.
+"""
+
+import pathlib
+import re
+import sqlite3
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts.warehouse import dataframe_rows, insert_dataframe, read_table_sql  # noqa: E402
+
+# Constants
+SALE_VIEW: str = "sale"
+PARTITION_PATTERN = re.compile(r"^sale_(\d{4})_(\d{2})$")
+PERIOD_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+UNDATED_PERIOD: str = "0000-00"  # rows whose sale_date is not an ISO date
+DELTA_TABLE: str = "sale_delta"
+SALE_COLUMNS: List[str] = [
+    "sale_id", "customer_id", "product_id", "store_id", "campaign_id",
+    "sale_amount", "sale_date", "date_key", "bonus_points", "payment_type",
+]
+# Newest staged row per sale
+DELTA_ROWS_SQL: str = f"""
+SELECT period, {", ".join(SALE_COLUMNS)} FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY sale_id ORDER BY delta_id DESC) AS delta_rank
+    FROM {DELTA_TABLE}
+)
+WHERE delta_rank = 1
+"""
+
+
+def partition_name(period: str, suffix: str = "") -> str:
+    """Return the table name for a "YYYY-MM" period, e.g. "2024-05" -> "sale_2024_05"."""
+    return f"sale_{period.replace('-', '_')}{suffix}"
+
+
+def partition_period(name: str, suffix: str = "") -> Optional[str]:
+    """Return the "YYYY-MM" period of a partition table name, or None if it isn't one."""
+    if suffix:
+        if not name.endswith(suffix):
+            return None
+        name = name[: -len(suffix)]
+    match = PARTITION_PATTERN.match(name)
+    if match is None:
+        return None
+    return f"{match.group(1)}-{match.group(2)}"
+
+
+def sale_periods(sales_df: pd.DataFrame) -> pd.Series:
+    """Return the "YYYY-MM" partition period of every sale, from the ISO sale_date text."""
+    periods = sales_df["sale_date"].astype(str).str[:7]
+    return periods.where(periods.str.match(PERIOD_PATTERN), UNDATED_PERIOD)
+
+
+def split_sales_by_month(sales_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Split sales (warehouse column names) into one DataFrame per month, oldest first."""
+    return {period: part for period, part in sales_df.groupby(sale_periods(sales_df), sort=True)}
+
+
+def list_partitions(cursor: sqlite3.Cursor, suffix: str = "") -> List[str]:
+    """List the partition tables in the warehouse, oldest first."""
+    rows = cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'sale%'"
+    ).fetchall()
+    names = [name for (name,) in rows if partition_period(name, suffix) is not None]
+    return sorted(names)
+
+
+def sale_source(cursor: sqlite3.Cursor, suffix: str = "") -> str:
+    """
+    Return SQL usable in place of "sale" for the live or the suffixed (shadow) partitions.
+
+    The live partitions are read through the sale view; shadow partitions have no
+    view yet, so they are unioned in a subquery. Without shadow partitions the
+    source is an empty row set with the sale columns, which needs no table at
+    all (on a fresh warehouse the sale view doesn't exist yet).
+    """
+    if not suffix:
+        return SALE_VIEW
+    partitions = list_partitions(cursor, suffix)
+    if not partitions:
+        return "(SELECT " + ", ".join(f"NULL AS {column}" for column in SALE_COLUMNS) + " WHERE 0)"
+    return "(" + " UNION ALL ".join(f"SELECT * FROM {name}" for name in partitions) + ")"
+
+
+def create_partition(cursor: sqlite3.Cursor, name: str) -> None:
+    """Create an empty partition table with the sale table's schema."""
+    cursor.execute(read_table_sql("sale", name))
+
+
+def create_indexes(cursor: sqlite3.Cursor) -> None:
+    """Create the date_key index on every live partition (the delta stays unindexed)."""
+    for name in list_partitions(cursor):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_date_key ON {name} (date_key)")
+
+
+def _has_delta(cursor: sqlite3.Cursor) -> bool:
+    row = cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (DELTA_TABLE,)).fetchone()
+    return row is not None
+
+
+def _partition_selects(partitions: Sequence[str], where: str = "") -> List[str]:
+    # Every partition hides the rows that staged sales replace, whichever month they move to
+    conditions = ([where] if where else []) + [f"sale_id NOT IN (SELECT sale_id FROM {DELTA_TABLE})"]
+    return [f"SELECT * FROM {name} WHERE {' AND '.join(conditions)}" for name in partitions]
+
+
+def _delta_select(where: str = "") -> str:
+    return f"SELECT {', '.join(SALE_COLUMNS)} FROM ({DELTA_ROWS_SQL})" + (f" WHERE {where}" if where else "")
+
+
+def delta_rows(cursor: sqlite3.Cursor) -> int:
+    """Return the number of rows staged in the delta table."""
+    if not _has_delta(cursor):
+        return 0
+    return cursor.execute(f"SELECT COUNT(*) FROM {DELTA_TABLE}").fetchone()[0]
+
+
+def drop_sale_relation(cursor: sqlite3.Cursor) -> None:
+    """Drop whatever currently answers to "sale": the partition view or a legacy heap table."""
+    row = cursor.execute(
+        "SELECT type FROM sqlite_master WHERE name = ?", (SALE_VIEW,)
+    ).fetchone()
+    if row is None:
+        return
+    if row[0] == "view":
+        cursor.execute(f"DROP VIEW {SALE_VIEW}")
+    else:
+        cursor.execute(f"DROP TABLE {SALE_VIEW}")
+
+
+def rebuild_sale_view(cursor: sqlite3.Cursor) -> None:
+    """Recreate the "sale" view as a UNION ALL over every partition and the staged delta."""
+    cursor.execute(read_table_sql(DELTA_TABLE))
+    partitions = list_partitions(cursor)
+    drop_sale_relation(cursor)
+    selects = _partition_selects(partitions) + [_delta_select()]
+    union = "\nUNION ALL\n".join(selects)
+    cursor.execute(f"CREATE VIEW {SALE_VIEW} AS\n{union}")
+
+
+def write_partitions(sales_df: pd.DataFrame, cursor: sqlite3.Cursor, suffix: str = "") -> List[str]:
+    """
+    Write sales into month partitions, creating them as needed (used by the full load).
+
+    Nothing is committed, so a load batch commits together with its checkpoint.
+
+    Args:
+        sales_df (pd.DataFrame): Sales with warehouse column names.
+        cursor (sqlite3.Cursor): Writer cursor.
+        suffix (str): Appended to each partition name, e.g. the ETL's shadow suffix.
+
+    Returns:
+        list: Names of the partitions written.
+    """
+    written = []
+    for period, part_df in split_sales_by_month(sales_df).items():
+        name = partition_name(period, suffix)
+        create_partition(cursor, name)
+        insert_dataframe(cursor, name, part_df)
+        written.append(name)
+    logger.info(f"Sales written to {len(written)} monthly partitions.")
+    return written
+
+
+def swap_partitions(cursor: sqlite3.Cursor, suffix: str) -> None:
+    """
+    Replace the live partitions with the "<partition><suffix>" ones and rebuild the view.
+
+    Must run inside the caller's swap transaction.
+    """
+    drop_sale_relation(cursor)
+    for name in list_partitions(cursor):
+        cursor.execute(f"DROP TABLE {name}")
+    for name in list_partitions(cursor, suffix):
+        cursor.execute(f"ALTER TABLE {name} RENAME TO {name[: -len(suffix)]}")
+    # The full load replaces everything, including sales staged since the last one
+    if _has_delta(cursor):
+        cursor.execute(f"DELETE FROM {DELTA_TABLE}")
+    rebuild_sale_view(cursor)
+    create_indexes(cursor)
+
+
+def append_sales(sales_df: pd.DataFrame, cursor: sqlite3.Cursor) -> Dict[str, int]:
+    """
+    Incrementally load sales into the delta table.
+
+    Staged rows replace the existing row with the same sale_id in any month, and
+    the newest staged row of a sale_id wins. compact_delta() moves them into their
+    month partitions.
+
+    Args:
+        sales_df (pd.DataFrame): New sales with warehouse column names.
+        cursor (sqlite3.Cursor): Writer cursor.
+
+    Returns:
+        dict: Rows staged per destination partition name.
+    """
+    if not _has_delta(cursor):
+        rebuild_sale_view(cursor)
+    written: Dict[str, int] = {}
+    for period, part_df in split_sales_by_month(sales_df).items():
+        part_df = part_df.assign(period=period)
+        columns = ", ".join(part_df.columns)
+        placeholders = ", ".join("?" for _ in part_df.columns)
+        cursor.executemany(
+            f"INSERT INTO {DELTA_TABLE} ({columns}) VALUES ({placeholders})",
+            dataframe_rows(part_df),
+        )
+        written[partition_name(period)] = len(part_df)
+    logger.info(f"Incremental sales load staged {written} in {DELTA_TABLE}.")
+    return written
+
+
+def compact_delta(cursor: sqlite3.Cursor) -> Dict[str, int]:
+    """
+    Merge the staged sales into their month partitions and empty the delta table.
+
+    Staged sale_ids are deleted from every partition, then the newest staged row of
+    each sale is inserted into its month's partition in sale_id order (new months get
+    new, indexed partitions) and the view is rebuilt. Must run inside
+    the caller's transaction, so readers see either the delta or the compacted
+    partitions, never both.
+
+    Returns:
+        dict: Rows merged per partition name.
+    """
+    if not delta_rows(cursor):
+        return {}
+    columns = ", ".join(SALE_COLUMNS)
+    periods = [period for (period,) in cursor.execute(f"SELECT DISTINCT period FROM {DELTA_TABLE} ORDER BY period")]
+    # A staged row may move its sale to another month, so clear it from all of them
+    for name in list_partitions(cursor):
+        cursor.execute(f"DELETE FROM {name} WHERE sale_id IN (SELECT sale_id FROM {DELTA_TABLE})")
+    merged: Dict[str, int] = {}
+    for period in periods:
+        name = partition_name(period)
+        create_partition(cursor, name)
+        cursor.execute(
+            f"""
+            INSERT INTO {name} ({columns})
+            SELECT {columns} FROM ({DELTA_ROWS_SQL}) WHERE period = ? ORDER BY sale_id
+            """,
+            (period,),
+        )
+        merged[name] = cursor.rowcount
+    cursor.execute(f"DELETE FROM {DELTA_TABLE}")
+    rebuild_sale_view(cursor)
+    create_indexes(cursor)
+    logger.info(f"Compacted {DELTA_TABLE} into {merged}.")
+    return merged
+
+
+def pending_changes(sales_df: pd.DataFrame, cursor: sqlite3.Cursor) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Preview what append_sales() will do, so derived tables can be updated from the delta.
+
+    Args:
+        sales_df (pd.DataFrame): New sales with warehouse column names.
+        cursor (sqlite3.Cursor): Writer cursor.
+
+    Returns:
+        tuple: (rows that will be written, one per sale_id as the newest row wins,
+            existing rows they will replace, whatever their month).
+    """
+    accepted = sales_df.drop_duplicates("sale_id", keep="last")
+
+    # Look the sale_ids up through the view, which already applies staged replacements
+    sale_ids = [int(sale_id) for sale_id in accepted["sale_id"]]
+    existing = []
+    for start in range(0, len(sale_ids), 500):
+        chunk = sale_ids[start:start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        existing.append(
+            pd.read_sql_query(
+                f"SELECT * FROM {SALE_VIEW} WHERE sale_id IN ({placeholders})", cursor.connection, params=chunk
+            )
+        )
+    if not existing:
+        return accepted, accepted.iloc[0:0]
+    return accepted, pd.concat(existing, ignore_index=True)
+
+
+def partitions_for_range(
+    partitions: Sequence[str], start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> List[str]:
+    """Return the partitions whose month overlaps the ISO date range [start_date, end_date]."""
+    start_period = start_date[:7] if start_date else None
+    end_period = end_date[:7] if end_date else None
+    selected = []
+    for name in partitions:
+        period = partition_period(name)
+        if period is None or period == UNDATED_PERIOD:
+            continue
+        if start_period and period < start_period:
+            continue
+        if end_period and period > end_period:
+            continue
+        selected.append(name)
+    return selected
+
+
+def sale_source_sql(
+    partitions: Sequence[str], start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> Tuple[str, list]:
+    """
+    Build a subquery over only the partitions that overlap a date range, plus the staged delta.
+
+    Args:
+        partitions (list): All partition names, e.g. from list_partitions().
+        start_date (str, optional): Inclusive ISO start date.
+        end_date (str, optional): Inclusive ISO end date.
+
+    Returns:
+        tuple: (sql, params) where sql is a parenthesized subquery usable in place of "sale".
+    """
+    conditions, bounds = [], []
+    # Compare integer date keys rather than sale_date text
+    if start_date:
+        conditions.append("date_key >= ?")
+        bounds.append(int(start_date[:10].replace("-", "")))
+    if end_date:
+        conditions.append("date_key <= ?")
+        bounds.append(int(end_date[:10].replace("-", "")))
+    where = " AND ".join(conditions)
+
+    selected = partitions_for_range(partitions, start_date, end_date)
+    # Staged sales are always included; the delta is small and unindexed
+    selects = _partition_selects(selected, where) + [_delta_select(where)]
+    return f"({' UNION ALL '.join(selects)})", bounds * len(selects)
@@ -0,0 +1,159 @@
+"""
+scripts/sale_sample.py
+
+Stratified reservoir sample of the sale table for approximate queries.
+
+Sales are split into strata by campaign and product category, and
+``sale_sample`` keeps up to SAMPLE_SIZE sales per stratum, with the true
+stratum sizes in ``sale_stratum``. Every sale gets a fixed pseudo-random
+priority hashed from its sale_id, and a stratum keeps its SAMPLE_SIZE
+lowest priorities. That is a uniform random sample of the stratum (the
+bottom-k form of reservoir sampling), so the full load and the incremental
+loads maintain exactly the same sample without rereading old sales: new
+sales are merged in and each stratum is trimmed back to SAMPLE_SIZE.
+
+Sales replaced by an incremental load are removed from the sample; the
+remaining rows of that stratum are still a uniform sample, just smaller
+until the next full load. sale_id is unique across the sale partitions
+(a re-sent sale replaces the old row whatever its month), so every sale
+is counted and sampled at most once.
+"""
+
+import pathlib
+import sqlite3
+import sys
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts import sale_partitions  # noqa: E402
+from scripts.warehouse import dataframe_rows  # noqa: E402
+
+# Constants
+SAMPLE_SIZE: int = 1_000  # sales kept per stratum
+SAMPLE_COLUMNS = [
+    "sale_id", "stratum", "priority", "customer_id", "product_id", "store_id",
+    "campaign_id", "category", "sale_amount", "date_key", "bonus_points", "payment_type",
+]
+INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_sale_sample_stratum ON sale_sample (stratum, priority)"
+STRATUM_SQL = "IFNULL(s.campaign_id, '') || '/' || IFNULL(p.category, '')"
+UPSERT_STRATUM_SQL = """
+INSERT INTO sale_stratum (stratum, population) VALUES (?, ?)
+ON CONFLICT (stratum) DO UPDATE SET population = population + excluded.population
+"""
+_MASK64 = (1 << 64) - 1
+
+
+def sample_priority(sale_id: int) -> float:
+    """Return the fixed pseudo-random priority in [0, 1) of a sale (SplitMix64 hash of its id)."""
+    z = (int(sale_id) + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    z ^= z >> 31
+    return (z >> 11) / float(1 << 53)
+
+
+def stratum_keys(campaign_ids: pd.Series, categories: pd.Series) -> pd.Series:
+    """Return the stratum key of each sale, formatted like STRATUM_SQL ("<campaign_id>/<category>")."""
+    campaigns = campaign_ids.astype("Int64").astype("string").fillna("")
+    return (campaigns + "/" + categories.astype("string").fillna("")).astype(object)
+
+
+def _trim_sample(cursor: sqlite3.Cursor, sample_size: int, suffix: str = "") -> None:
+    cursor.execute(
+        f"""
+        DELETE FROM sale_sample{suffix} WHERE sale_id IN (
+            SELECT sale_id FROM (
+                SELECT sale_id, ROW_NUMBER() OVER (PARTITION BY stratum ORDER BY priority) AS sample_rank
+                FROM sale_sample{suffix}
+            )
+            WHERE sample_rank > ?
+        )
+        """,
+        (sample_size,),
+    )
+
+
+def rebuild_sale_sample(cursor: sqlite3.Cursor, suffix: str = "", sample_size: int = SAMPLE_SIZE) -> None:
+    """Build sale_sample and sale_stratum from all sales (used by the full load)."""
+    cursor.connection.create_function("sample_priority", 1, sample_priority, deterministic=True)
+    source = sale_partitions.sale_source(cursor, suffix)
+    stratified = f"""
+        SELECT s.*, p.category, {STRATUM_SQL} AS stratum, sample_priority(s.sale_id) AS priority
+        FROM {source} s
+        JOIN product{suffix} p ON s.product_id = p.product_id
+    """
+    columns = ", ".join(SAMPLE_COLUMNS)
+    cursor.execute(f"DELETE FROM sale_sample{suffix}")
+    cursor.execute(f"DELETE FROM sale_stratum{suffix}")
+    cursor.execute(
+        f"""
+        INSERT INTO sale_stratum{suffix} (stratum, population)
+        SELECT stratum, COUNT(*) FROM ({stratified}) GROUP BY stratum
+        """
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO sale_sample{suffix} ({columns})
+        SELECT {columns} FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY stratum ORDER BY priority) AS sample_rank
+            FROM ({stratified})
+        )
+        WHERE sample_rank <= ?
+        """,
+        (sample_size,),
+    )
+    logger.info(f"Sale sample rebuilt with up to {sample_size} sales per stratum.")
+
+
+def create_indexes(cursor: sqlite3.Cursor) -> None:
+    """Create the sale_sample indexes on the live table."""
+    cursor.execute(INDEX_SQL)
+
+
+def _with_strata(sales_df: pd.DataFrame, categories: pd.Series) -> pd.DataFrame:
+    sales_df = sales_df.assign(category=sales_df["product_id"].map(categories))
+    return sales_df.assign(stratum=stratum_keys(sales_df["campaign_id"], sales_df["category"]))
+
+
+def apply_sales_delta(
+    cursor: sqlite3.Cursor, added_df: pd.DataFrame, replaced_df: pd.DataFrame, sample_size: int = SAMPLE_SIZE
+) -> None:
+    """
+    Merge new sales into the sample and stratum sizes.
+
+    Args:
+        cursor (sqlite3.Cursor): Writer cursor.
+        added_df (pd.DataFrame): Sales being written (warehouse column names). A sale_id
+            sent more than once counts once, with its last row.
+        replaced_df (pd.DataFrame): Existing sales those rows replace; they leave the sample
+            and their strata shrink.
+        sample_size (int): Sales kept per stratum.
+    """
+    if added_df.empty:
+        return
+    added_df = added_df.drop_duplicates("sale_id", keep="last")
+    categories = pd.read_sql_query("SELECT product_id, category FROM product", cursor.connection)
+    categories = categories.set_index("product_id")["category"]
+    added = _with_strata(added_df, categories)
+    removed = _with_strata(replaced_df, categories)
+
+    delta = pd.concat([added["stratum"].value_counts(), -removed["stratum"].value_counts()]).groupby(level=0).sum()
+    cursor.executemany(UPSERT_STRATUM_SQL, [(stratum, int(count)) for stratum, count in delta.items() if count])
+    cursor.execute("DELETE FROM sale_stratum WHERE population <= 0")
+
+    cursor.executemany("DELETE FROM sale_sample WHERE sale_id = ?", [(int(sale_id),) for sale_id in removed["sale_id"]])
+    added = added.assign(priority=added["sale_id"].map(sample_priority))
+    columns = ", ".join(SAMPLE_COLUMNS)
+    placeholders = ", ".join("?" for _ in SAMPLE_COLUMNS)
+    cursor.executemany(
+        f"INSERT INTO sale_sample ({columns}) VALUES ({placeholders})",
+        dataframe_rows(added[SAMPLE_COLUMNS]),
+    )
+    _trim_sample(cursor, sample_size)
+    logger.info(f"Sale sample updated for {len(delta)} strata.")
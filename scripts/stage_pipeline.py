@@ -0,0 +1,124 @@
+"""
+scripts/stage_pipeline.py
+
+Three-stage producer/consumer pipeline with bounded queues.
+
+``run_stages`` reads items on one thread, transforms them on the calling
+thread (or in a process pool) and writes the results on another, so chunk
+reads, cleaning and output writes overlap instead of running strictly in
+sequence. The queues between the stages are bounded: a fast reader blocks
+once it is ``queue_size`` chunks ahead (backpressure), so memory stays at a
+few chunks and throughput settles at the pace of the slowest stage.
+
+Reads and writes overlap with the transform because pandas releases the GIL
+in its CSV parser and file I/O. A Python-heavy transform holds the GIL, so
+with ``workers`` > 1 it runs in a process pool instead (at most ``workers``
+chunks in flight). Items keep their order, and an error in any stage stops
+the others and is re-raised to the caller.
+"""
+
+import collections
+import concurrent.futures
+import queue
+import threading
+from typing import Any, Callable, Iterable, List
+
+# Constants
+QUEUE_SIZE: int = 2  # chunks buffered between stages
+_POLL_S: float = 0.1
+_DONE = object()  # end-of-stream marker
+
+
+def run_stages(
+    items: Iterable,
+    transform: Callable[[Any], Any],
+    consume: Callable[[Any], None],
+    queue_size: int = QUEUE_SIZE,
+    workers: int = 1,
+) -> None:
+    """
+    Stream items through transform into consume with the three stages overlapped.
+
+    Args:
+        items (iterable): Source of work, e.g. CSV chunks; iterated on a reader thread.
+        transform (callable): CPU stage, run on the calling thread. Must be picklable
+            (a module-level function or a functools.partial of one) when workers > 1.
+        consume (callable): Output stage, run on a writer thread in item order.
+        queue_size (int): Maximum items waiting between two stages.
+        workers (int): Process pool size for the transform. With 1 it runs in this process.
+
+    Raises:
+        Exception: The first error raised by any stage.
+    """
+    read_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    write_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def fail(error: BaseException) -> None:
+        errors.append(error)
+        stop.set()
+
+    def put(target: queue.Queue, item: Any) -> bool:
+        # Block while the next stage is busy, but give up once any stage has failed
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_S)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(source: queue.Queue) -> Any:
+        while True:
+            try:
+                return source.get(timeout=_POLL_S)
+            except queue.Empty:
+                if stop.is_set():
+                    return _DONE
+
+    def read() -> None:
+        try:
+            for item in items:
+                if not put(read_queue, item):
+                    return
+        except BaseException as e:
+            fail(e)
+        finally:
+            put(read_queue, _DONE)
+
+    def write() -> None:
+        try:
+            while (item := get(write_queue)) is not _DONE:
+                consume(item)
+        except BaseException as e:
+            fail(e)
+
+    reader = threading.Thread(target=read, name="stage-reader", daemon=True)
+    writer = threading.Thread(target=write, name="stage-writer", daemon=True)
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    in_flight: collections.deque = collections.deque()
+    reader.start()
+    writer.start()
+    try:
+        while (item := get(read_queue)) is not _DONE:
+            if executor is None:
+                if not put(write_queue, transform(item)):
+                    break
+                continue
+            in_flight.append(executor.submit(transform, item))
+            if len(in_flight) >= workers and not put(write_queue, in_flight.popleft().result()):
+                break
+        while in_flight and not stop.is_set():
+            if not put(write_queue, in_flight.popleft().result()):
+                break
+    except BaseException as e:
+        fail(e)
+    finally:
+        put(write_queue, _DONE)
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        reader.join()
+        writer.join()
+    if errors:
+        raise errors[0]
@@ -0,0 +1,117 @@
+"""
+scripts/validation_rules.py
+
+Declarative business-rule validation for the data preparation scripts.
+
+A rule set is a list of ``Rule`` objects (range, enum, regex, cross-column or
+referential). Each rule is evaluated once as a vectorized boolean mask over
+the whole frame; the masks are OR-ed into one violation mask and the frame is
+filtered a single time at the end. Cost grows linearly with the number of
+rules and no intermediate copies are made. Violating rows are quarantined to
+a reject file together with the names of the rules they broke.
+"""
+
+import pathlib
+import sys
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+from scripts.referential_integrity import REJECT_REASON_COLUMN, clear_rejects, write_rejects  # noqa: E402
+
+
+class Rule(NamedTuple):
+    """A named business rule; ``check`` returns a boolean mask that is True for valid rows."""
+
+    name: str
+    check: Callable[[pd.DataFrame], pd.Series]
+
+
+def range_rule(column: str, min_value: Optional[float] = None, max_value: Optional[float] = None) -> Rule:
+    """Values must lie in [min_value, max_value]; missing values fail."""
+    def check(df: pd.DataFrame) -> pd.Series:
+        values = df[column]
+        mask = values.notna()
+        if min_value is not None:
+            mask &= values >= min_value
+        if max_value is not None:
+            mask &= values <= max_value
+        return mask
+
+    return Rule(f"{column}_range", check)
+
+
+def enum_rule(column: str, allowed: Iterable) -> Rule:
+    """Values must be one of ``allowed``."""
+    allowed = pd.Index(list(allowed)).unique()
+    return Rule(f"{column}_enum", lambda df: df[column].isin(allowed))
+
+
+def regex_rule(column: str, pattern: str) -> Rule:
+    """Values (as strings) must fully match ``pattern``; missing values fail."""
+    return Rule(f"{column}_format", lambda df: df[column].astype("string").str.fullmatch(pattern).fillna(False))
+
+
+def cross_column_rule(name: str, predicate: Callable[[pd.DataFrame], pd.Series]) -> Rule:
+    """A rule relating several columns, e.g. ``lambda df: df["start"] <= df["end"]``."""
+    return Rule(name, predicate)
+
+
+def referential_rule(column: str, keys: Iterable) -> Rule:
+    """Values must exist in a set of dimension keys."""
+    keys = pd.Index(keys).unique()
+    return Rule(f"{column}_reference", lambda df: df[column].isin(keys))
+
+
+def evaluate_rules(df: pd.DataFrame, rules: List[Rule]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Evaluate every rule once over the whole frame.
+
+    Returns:
+        tuple: (violations matrix of shape (rows, rules), violation count per rule name).
+    """
+    violations = np.zeros((len(df), len(rules)), dtype=bool)
+    for position, rule in enumerate(rules):
+        violations[:, position] = ~np.asarray(rule.check(df), dtype=bool)
+    counts = dict(zip((rule.name for rule in rules), violations.sum(axis=0).tolist()))
+    return violations, counts
+
+
+def apply_rules(
+    df: pd.DataFrame, rules: List[Rule], quarantine_file_name: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Keep only rows that pass every rule, logging per-rule violation counts.
+
+    Args:
+        df (pd.DataFrame): Rows to validate.
+        rules (list): Rules to apply.
+        quarantine_file_name (str, optional): Reject file for violating rows (written to
+            data/rejects with a reject_reason column listing the broken rules).
+
+    Returns:
+        pd.DataFrame: The rows that passed every rule.
+    """
+    violations, counts = evaluate_rules(df, rules)
+    for name, count in counts.items():
+        logger.info(f"Rule {name}: {count} violations")
+
+    bad = violations.any(axis=1)
+    if not bad.any():
+        if quarantine_file_name:
+            clear_rejects(quarantine_file_name)
+        return df
+
+    if quarantine_file_name:
+        names = np.array([rule.name for rule in rules])
+        reasons = ["; ".join(names[row]) for row in violations[bad]]
+        file_path = write_rejects(df[bad].assign(**{REJECT_REASON_COLUMN: reasons}), quarantine_file_name)
+        logger.warning(f"Quarantined {int(bad.sum())} of {len(df)} rows; see {file_path}")
+    return df[~bad]
@@ -0,0 +1,286 @@
+"""
+scripts/warehouse.py
+
+Shared access to the smart_sales.db data warehouse.
+
+Readers borrow pooled read-only connections (opened once with ``mode=ro`` and
+tuned mmap / page cache settings) instead of paying the connect cost on every
+query. The ETL uses ``writer_connection`` which switches the database to WAL
+mode so report queries can keep reading while a load is running.
+
+Python's sqlite3 module keeps a per-connection cache of prepared statements,
+so re-running the same query text on a pooled connection reuses the compiled
+statement.
+"""
+
+import contextlib
+import pathlib
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from utils.logger import logger  # noqa: E402
+
+# Constants
+DW_DIR: pathlib.Path = PROJECT_ROOT.joinpath("data", "dw")
+DB_PATH: pathlib.Path = DW_DIR.joinpath("smart_sales.db")
+SQL_DIR: pathlib.Path = PROJECT_ROOT.joinpath("scripts")
+POOL_SIZE: int = 4
+MMAP_SIZE: int = 256 * 1024 * 1024  # bytes of the database file to memory-map
+CACHE_SIZE_KIB: int = 64 * 1024  # page cache per connection, in KiB
+STATEMENT_CACHE_SIZE: int = 256  # prepared statements kept per connection
+BUSY_TIMEOUT_MS: int = 5000
+SALES_VERSION_TABLE: str = "sales_version"
+UNVERSIONED: str = "unversioned"  # warehouse loaded before version stamps
+
+_pools: Dict[pathlib.Path, "ReadOnlyConnectionPool"] = {}
+_pools_lock = threading.Lock()
+
+
+def read_table_sql(table_name: str, target_name: Optional[str] = None) -> str:
+    """
+    Read the CREATE TABLE statement for a warehouse table from scripts/create_<table>_table.sql.
+
+    Parameters:
+        table_name (str): Name of the table, e.g. "sale".
+        target_name (str, optional): Create the table under this name instead, e.g. a
+            shadow or partition table. Foreign keys keep pointing at the live tables.
+
+    Returns:
+        str: The CREATE TABLE statement.
+    """
+    sql = SQL_DIR.joinpath(f"create_{table_name}_table.sql").read_text()
+    if target_name is None:
+        return sql
+    return sql.replace(
+        f"CREATE TABLE IF NOT EXISTS {table_name} ",
+        f"CREATE TABLE IF NOT EXISTS {target_name} ",
+        1,
+    )
+
+
+def dataframe_rows(df: pd.DataFrame) -> Iterator[tuple]:
+    """Yield DataFrame rows as tuples of values sqlite3 can bind (Python scalars, None for missing)."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def insert_dataframe(cursor: sqlite3.Cursor, table_name: str, df: pd.DataFrame) -> None:
+    """
+    Insert DataFrame rows into an existing table in the cursor's open transaction.
+
+    Unlike DataFrame.to_sql, which commits on its own, nothing is committed
+    here, so the rows can be committed together with e.g. a load checkpoint.
+    """
+    columns = ", ".join(df.columns)
+    placeholders = ", ".join("?" for _ in df.columns)
+    cursor.executemany(f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})", dataframe_rows(df))
+
+
+def _tune_connection(conn: sqlite3.Connection) -> None:
+    """Apply the page cache, mmap and busy timeout settings shared by all connections."""
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+
+
+class ReadOnlyConnectionPool:
+    """Thread-safe pool of read-only SQLite connections to one database file."""
+
+    def __init__(self, db_path: Union[str, pathlib.Path] = DB_PATH, size: int = POOL_SIZE):
+        """
+        Initialize the pool. Connections are opened lazily, up to ``size``.
+
+        Parameters:
+            db_path (str or Path): Path to the SQLite database file.
+            size (int): Maximum number of open connections.
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.db_path = pathlib.Path(db_path).resolve()
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a new read-only connection."""
+        uri = f"{self.db_path.as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,  # connections move between threads via the pool
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        _tune_connection(conn)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """
+        Borrow a connection from the pool, opening one if the pool is not full.
+
+        Parameters:
+            timeout (float, optional): Seconds to wait for a free connection. Waits forever if None.
+
+        Returns:
+            sqlite3.Connection: A read-only connection. Return it with release().
+
+        Raises:
+            RuntimeError: If the pool is closed.
+            queue.Empty: If no connection became free within the timeout.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        return self._idle.get(timeout=timeout)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a borrowed connection to the pool."""
+        if self._closed:
+            conn.close()
+            return
+        # Make sure no read transaction is left open, so WAL checkpoints are not held back
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+
+    @contextlib.contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+        """Context manager that borrows a connection and always returns it."""
+        conn = self.acquire(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections. Borrowed connections are closed when released."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def get_pool(db_path: Union[str, pathlib.Path] = DB_PATH) -> ReadOnlyConnectionPool:
+    """Return the shared read-only pool for a database, creating it on first use."""
+    key = pathlib.Path(db_path).resolve()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = ReadOnlyConnectionPool(key)
+            _pools[key] = pool
+            logger.info(f"Opened read-only connection pool for {key}.")
+        return pool
+
+
+def close_pools() -> None:
+    """Close every shared pool, e.g. before the warehouse file is replaced."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def read_sql(
+    query: str,
+    params: Optional[Sequence] = None,
+    db_path: Union[str, pathlib.Path] = DB_PATH,
+) -> pd.DataFrame:
+    """
+    Run a read-only query on a pooled connection and return the result as a DataFrame.
+
+    Parameters:
+        query (str): SQL text. Use ``?`` placeholders so the prepared statement is reused.
+        params (sequence, optional): Values bound to the placeholders.
+        db_path (str or Path): Path to the SQLite database file.
+
+    Returns:
+        pd.DataFrame: Query result.
+    """
+    with get_pool(db_path).connection() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+def write_version_stamp(cursor: sqlite3.Cursor, table_name: str) -> str:
+    """Write a new version stamp to a one-row stamp table (run in the transaction that changes the data)."""
+    version = f"{time.time_ns():x}"
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} (version TEXT)")
+    cursor.execute(f"DELETE FROM {table_name}")
+    cursor.execute(f"INSERT INTO {table_name} (version) VALUES (?)", (version,))
+    return version
+
+
+def read_version_stamp(table_name: str, db_path: Union[str, pathlib.Path] = DB_PATH) -> str:
+    """Return the stamp in a stamp table, or UNVERSIONED if the warehouse has none."""
+    try:
+        versions = read_sql(f"SELECT version FROM {table_name}", db_path=db_path)
+    except (sqlite3.Error, pd.errors.DatabaseError):
+        return UNVERSIONED
+    return str(versions["version"].iloc[0]) if not versions.empty else UNVERSIONED
+
+
+def write_sales_version(cursor: sqlite3.Cursor) -> str:
+    """Stamp the sales with a new version; every load that changes a sale calls this."""
+    return write_version_stamp(cursor, SALES_VERSION_TABLE)
+
+
+def read_sales_version(db_path: Union[str, pathlib.Path] = DB_PATH) -> str:
+    """Return the current sales version stamp, or UNVERSIONED."""
+    return read_version_stamp(SALES_VERSION_TABLE, db_path)
+
+
+@contextlib.contextmanager
+def writer_connection(db_path: Union[str, pathlib.Path] = DB_PATH) -> Iterator[sqlite3.Connection]:
+    """
+    Open the single read-write connection used by the ETL.
+
+    The database is switched to WAL mode so pooled readers are not blocked by the
+    load. The transaction is committed when the block exits normally, rolled back
+    if it raises, and the connection is always closed.
+
+    Parameters:
+        db_path (str or Path): Path to the SQLite database file. Created if it doesn't exist.
+
+    Yields:
+        sqlite3.Connection: The writer connection.
+    """
+    conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+    try:
+        _tune_connection(conn)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,81 @@
+r"""
+tests/test_approximate_query.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_approximate_query.py
+    python3 tests\test_approximate_query.py
+
+This test suite verifies approximate aggregates and their confidence intervals.
+"""
+
+import unittest
+import pathlib
+import sys
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.approximate_query import approximate_aggregate, estimate_cells  # noqa: E402
+
+rng = np.random.default_rng(11)
+n_sales = 20_000
+sales_df = pd.DataFrame(
+    {
+        "stratum": rng.choice(["0/CLOTHING", "0/SPORTS", "1/CLOTHING"], n_sales, p=[0.7, 0.2, 0.1]),
+        "payment_type": rng.choice(["CASH", "CREDIT"], n_sales),
+        "sale_amount": rng.gamma(2.0, 50.0, n_sales),
+    }
+)
+sales_df["campaign_name"] = sales_df["stratum"].str[0].map({"0": "NO CAMPAIGN", "1": "MAY SALE"})
+sales_df["population"] = sales_df.groupby("stratum")["stratum"].transform("size")
+exact = sales_df.groupby(["campaign_name", "payment_type"])["sale_amount"].agg(["sum", "count", "mean"])
+
+
+def make_sample(sample_size, seed):
+    """Take a simple random sample of each stratum, ranked like load_sample()."""
+    sample = sales_df.groupby("stratum", group_keys=False).sample(n=sample_size, random_state=seed)
+    return sample.assign(sample_rank=sample.groupby("stratum").cumcount() + 1)
+
+
+class TestApproximateQuery(unittest.TestCase):
+
+    def test_full_population_is_exact(self):
+        cube = estimate_cells(sales_df, ["campaign_name", "payment_type"]).set_index(["campaign_name", "payment_type"])
+        np.testing.assert_allclose(cube["sale_amount_sum"], exact["sum"])
+        np.testing.assert_allclose(cube["sale_amount_sum_high"], exact["sum"])
+        np.testing.assert_allclose(cube["sale_id_count"], exact["count"])
+
+    def test_intervals_cover_the_true_values(self):
+        covered, trials = 0, 0
+        for seed in range(40):
+            cube = estimate_cells(make_sample(200, seed), ["campaign_name", "payment_type"])
+            cube = cube.set_index(["campaign_name", "payment_type"]).join(exact)
+            for name, truth in [("sale_amount_sum", "sum"), ("sale_amount_mean", "mean"), ("sale_id_count", "count")]:
+                covered += int(((cube[f"{name}_low"] <= cube[truth]) & (cube[truth] <= cube[f"{name}_high"])).sum())
+                trials += len(cube)
+        self.assertGreater(covered / trials, 0.9, "95% intervals should cover the true value about 95% of the time")
+
+    def test_error_target_stops_early(self):
+        sample = make_sample(1_000, 0)
+        loose = approximate_aggregate(sample, ["campaign_name"], error_target=0.2)
+        tight = approximate_aggregate(sample, ["campaign_name"], error_target=0.001)
+        self.assertLess(loose.rows_per_stratum, 1_000)
+        self.assertLessEqual(loose.relative_error, 0.2)
+        self.assertTrue(tight.complete, "an unreachable target should use the whole sample")
+        self.assertLess(tight.relative_error, loose.relative_error)
+
+    def test_latency_budget_uses_first_step_only_when_exhausted(self):
+        result = approximate_aggregate(make_sample(1_000, 0), ["campaign_name"], latency_budget_s=0.0)
+        self.assertEqual(result.rows_per_stratum, 100)
+        self.assertFalse(result.complete)
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+r"""
+tests/test_bitmap_index.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_bitmap_index.py
+    python3 tests\test_bitmap_index.py
+
+This test suite verifies bitmap-index slicing against plain pandas filters.
+"""
+
+import unittest
+import pathlib
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.bitmap_index import BitmapIndex  # noqa: E402
+
+rng = np.random.default_rng(7)
+n_rows = 1_003  # not a multiple of 8, so the padding bits are exercised
+sales_df = pd.DataFrame(
+    {
+        "campaign_name": rng.choice(["NO CAMPAIGN", "MAY SALE", "JULY SALE"], n_rows),
+        "category": rng.choice(["CLOTHING", "SPORTS", "ELECTRONICS"], n_rows),
+        "payment_type": rng.choice(["CREDIT", "CASH", "CHECK"], n_rows),
+        "store_id": rng.choice([401, 402, 403, 404], n_rows),
+        "region": rng.choice(["EAST", "WEST", None], n_rows),
+        "sale_amount": rng.uniform(1, 500, n_rows).round(2),
+        "date_key": rng.choice([20240106, 20240517, 20240712], n_rows),
+    }
+)
+
+
+class TestBitmapIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = BitmapIndex.build(sales_df)
+
+    def test_slice_matches_pandas_filter(self):
+        result = self.index.aggregate({"category": ["CLOTHING", "SPORTS"], "payment_type": "CREDIT", "store_id": 403})
+        mask = sales_df["category"].isin(["CLOTHING", "SPORTS"]) & (sales_df["payment_type"] == "CREDIT") & (
+            sales_df["store_id"] == 403
+        )
+        self.assertEqual(result["count"], int(mask.sum()))
+        self.assertAlmostEqual(result["sum"], sales_df.loc[mask, "sale_amount"].sum(), places=6)
+
+    def test_unfiltered_count_and_missing_values(self):
+        self.assertEqual(self.index.count(self.index.select()), n_rows)
+        counted = sum(cell["count"] for cell in self.index.aggregate_by("region").values())
+        self.assertEqual(counted, int(sales_df["region"].notna().sum()))
+
+    def test_aggregate_by_matches_groupby(self):
+        result = self.index.aggregate_by("campaign_name", {"region": "EAST"})
+        expected = sales_df[sales_df["region"] == "EAST"].groupby("campaign_name")["sale_amount"].sum()
+        for campaign_name, total in expected.items():
+            self.assertAlmostEqual(result[campaign_name]["sum"], total, places=6)
+
+    def test_unknown_value_and_dimension(self):
+        self.assertEqual(self.index.aggregate({"category": "TOYS"})["count"], 0)
+        with self.assertRaises(ValueError):
+            self.index.select({"color": "RED"})
+
+    def test_take_and_append_rebuild_the_same_index(self):
+        keep = sales_df["date_key"].to_numpy() != 20240517
+        rebuilt = self.index.take(keep).append(BitmapIndex.build(sales_df[~keep]))
+        self.assertEqual(rebuilt.n_rows, n_rows)
+        filters = {"campaign_name": "MAY SALE", "payment_type": ["CASH", "CHECK"]}
+        self.assertEqual(rebuilt.aggregate(filters)["count"], self.index.aggregate(filters)["count"])
+        self.assertAlmostEqual(rebuilt.aggregate(filters)["sum"], self.index.aggregate(filters)["sum"], places=6)
+
+    def test_bitsets_match_the_rows_after_take_and_append(self):
+        for split in [0, 5, 8, 500, 1003]:
+            head_df, tail_df = sales_df.iloc[:split], sales_df.iloc[split:]
+            keep = head_df["payment_type"].to_numpy() != "CASH"
+            index = BitmapIndex.build(head_df).take(keep).append(BitmapIndex.build(tail_df))
+            expected_df = pd.concat([head_df[keep], tail_df], ignore_index=True)
+            self.assertEqual(index.n_rows, len(expected_df))
+            for dimension, (values, bits) in index.bitmaps.items():
+                self.assertEqual(bits.shape[1], (len(expected_df) + 7) // 8)
+                for value, value_bits in zip(values, bits):
+                    expected = (expected_df[dimension].astype(str) == value) & expected_df[dimension].notna()
+                    self.assertEqual(np.packbits(expected.to_numpy()).tolist(), value_bits.tolist(),
+                                     f"{dimension}={value} after a split at {split}")
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir).joinpath("cube.bitmaps.npz")
+            self.index.save(path)
+            loaded = BitmapIndex.load(path)
+        filters = {"region": "WEST", "store_id": "401"}
+        self.assertEqual(loaded.aggregate(filters), self.index.aggregate(filters))
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+r"""
+tests/test_campaign_facts.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_campaign_facts.py
+    python3 tests\test_campaign_facts.py
+
+This test suite verifies the campaign lengths and the per-day campaign sale facts.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import campaign_facts, sale_partitions  # noqa: E402
+from scripts.date_dimension import build_date_dimension  # noqa: E402
+from scripts.warehouse import read_table_sql  # noqa: E402
+
+CAMPAIGNS = [(0, "NO CAMPAIGN", "0001-01-01", "9999-12-31"), (1, "MAY SALE", "2024-05-07", "2024-05-10")]
+
+
+def make_sales(rows):
+    """Build sales with warehouse column names from (sale_id, sale_date, amount) tuples."""
+    return pd.DataFrame(
+        [
+            {"sale_id": sale_id, "customer_id": 1001, "product_id": 101, "store_id": 401,
+             "campaign_id": 0, "sale_amount": amount, "sale_date": sale_date,
+             "date_key": int(sale_date.replace("-", "")), "bonus_points": 0, "payment_type": "CASH"}
+            for sale_id, sale_date, amount in rows
+        ]
+    )
+
+
+class TestCampaignFacts(unittest.TestCase):
+
+    def setUp(self):
+        """An in-memory warehouse with a May 2024 calendar, one campaign and a few sales."""
+        self.conn = sqlite3.connect(":memory:")
+        self.cursor = self.conn.cursor()
+        for table_name in ["campaign", "date", "campaign_day_sales"]:
+            self.cursor.execute(read_table_sql(table_name))
+        self.cursor.executemany(
+            "INSERT INTO campaign (campaign_id, campaign_name, start_date, end_date) VALUES (?, ?, ?, ?)", CAMPAIGNS
+        )
+        campaign_df = pd.DataFrame(CAMPAIGNS, columns=["campaign_id", "campaign_name", "start_date", "end_date"])
+        build_date_dimension("2024-05-01", "2024-05-31", campaign_df).to_sql(
+            "date", self.conn, if_exists="append", index=False
+        )
+        sales_df = make_sales([(1, "2024-05-02", 10.0), (2, "2024-05-08", 20.0), (3, "2024-05-08", 5.0)])
+        sale_partitions.write_partitions(sales_df, self.cursor)
+        sale_partitions.rebuild_sale_view(self.cursor)
+        campaign_facts.update_campaign_lengths(self.cursor)
+        campaign_facts.refresh_campaign_day_sales(self.cursor)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def day_sales(self):
+        return self.cursor.execute("SELECT * FROM campaign_day_sales ORDER BY campaign_id, date_key").fetchall()
+
+    def test_campaign_lengths(self):
+        lengths = self.cursor.execute("SELECT campaign_id, campaign_length FROM campaign ORDER BY campaign_id").fetchall()
+        self.assertEqual(lengths, [(0, 27), (1, 4)], "NO CAMPAIGN covers the calendar days outside any campaign")
+
+    def test_full_refresh(self):
+        self.assertEqual(
+            self.day_sales(),
+            [(0, 20240502, 1, 10.0, 27, 10.0 / 27), (1, 20240508, 2, 25.0, 4, 6.25)],
+        )
+
+    def test_partial_refresh_matches_full_rebuild(self):
+        new_df = make_sales([(2, "2024-05-09", 20.0), (4, "2024-05-20", 7.0)])
+        sale_partitions.append_sales(new_df, self.cursor)
+        campaign_facts.refresh_campaign_day_sales(self.cursor, start_key=20240508, end_key=20240520)
+        partial = self.day_sales()
+        self.assertIn((1, 20240509, 1, 20.0, 4, 5.0), partial)
+
+        campaign_facts.refresh_campaign_day_sales(self.cursor)
+        self.assertEqual(partial, self.day_sales())
+
+    def test_partial_refresh_leaves_other_days(self):
+        self.cursor.execute("UPDATE campaign_day_sales SET sale_count = 99 WHERE date_key = 20240502")
+        campaign_facts.refresh_campaign_day_sales(self.cursor, start_key=20240508, end_key=20240508)
+        self.assertEqual(self.day_sales()[0][2], 99, "Days outside the range are not rebuilt")
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
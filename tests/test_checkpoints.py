@@ -0,0 +1,88 @@
+r"""
+tests/test_checkpoints.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_checkpoints.py
+    python3 tests\test_checkpoints.py
+
+This test suite verifies the prep chunk manifest and the load checkpoints.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import tempfile
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import checkpoints  # noqa: E402
+
+
+class TestChunkManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.chunk_dir = pathlib.Path(self.tmp_dir.name).joinpath("sales_data")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_resumes_completed_chunks_for_same_input(self):
+        manifest = checkpoints.ChunkManifest(self.chunk_dir, "abc")
+        manifest.part_path(0).write_text("x\n1\n")
+        manifest.mark_done(0)
+
+        resumed = checkpoints.ChunkManifest(self.chunk_dir, "abc")
+        self.assertTrue(resumed.is_done(0))
+        self.assertFalse(resumed.is_done(1))
+        self.assertEqual(resumed.part_paths(), [manifest.part_path(0)])
+
+    def test_discards_chunks_for_changed_input(self):
+        manifest = checkpoints.ChunkManifest(self.chunk_dir, "abc")
+        manifest.part_path(0).write_text("x\n1\n")
+        manifest.mark_done(0)
+
+        restarted = checkpoints.ChunkManifest(self.chunk_dir, "def")
+        self.assertFalse(restarted.is_done(0))
+        self.assertFalse(manifest.part_path(0).exists())
+
+    def test_file_signature_changes_with_content(self):
+        path = pathlib.Path(self.tmp_dir.name).joinpath("raw.csv")
+        path.write_text("a,b\n1,2\n")
+        before = checkpoints.file_signature([path])
+        path.write_text("a,b\n1,3\n")
+        self.assertNotEqual(before, checkpoints.file_signature([path]))
+
+
+class TestLoadCheckpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.cursor = sqlite3.connect(":memory:").cursor()
+
+    def test_nothing_to_resume_without_checkpoints(self):
+        self.assertIsNone(checkpoints.read_load_checkpoints(self.cursor, "abc"))
+
+    def test_reads_committed_steps_for_same_input(self):
+        checkpoints.create_load_checkpoint_table(self.cursor)
+        checkpoints.save_load_checkpoint(self.cursor, "dimensions", "abc")
+        checkpoints.save_load_checkpoint(self.cursor, "sales", "abc", 30)
+        checkpoints.save_load_checkpoint(self.cursor, "sales", "abc", 60)
+        self.assertEqual(checkpoints.read_load_checkpoints(self.cursor, "abc"), {"dimensions": 0, "sales": 60})
+        self.assertIsNone(checkpoints.read_load_checkpoints(self.cursor, "def"))
+
+    def test_clear_forgets_steps(self):
+        checkpoints.create_load_checkpoint_table(self.cursor)
+        checkpoints.save_load_checkpoint(self.cursor, "dimensions", "abc")
+        checkpoints.clear_load_checkpoints(self.cursor)
+        self.assertIsNone(checkpoints.read_load_checkpoints(self.cursor, "abc"))
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,46 @@
+r"""
+tests/test_cli.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_cli.py
+    python3 tests\test_cli.py
+
+This test suite verifies the pipeline CLI and its import-time budget.
+"""
+
+import unittest
+import pathlib
+import sys
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import cli  # noqa: E402
+
+
+class TestCli(unittest.TestCase):
+
+    def test_startup_imports_no_heavy_modules(self):
+        _, heavy = cli.measure_import()
+        self.assertEqual(heavy, [], "The CLI must import heavy libraries only inside subcommands")
+
+    def test_subcommand_modules_import_only_what_they_need(self):
+        for module in sorted({command.module for command in cli.COMMANDS.values()}):
+            _, heavy = cli.measure_import(module)
+            unexpected = set(heavy) - set(cli.SUBCOMMAND_HEAVY_MODULES)
+            self.assertEqual(unexpected, set(), f"{module} imports heavy libraries at module level")
+
+    def test_every_command_has_a_subparser(self):
+        parser = cli.build_parser()
+        for name, command in cli.COMMANDS.items():
+            argv = [name, "sales_data_prepared.csv"] if command.takes_file else [name]
+            self.assertEqual(parser.parse_args(argv).command, name)
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
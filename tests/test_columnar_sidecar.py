@@ -0,0 +1,94 @@
+r"""
+tests/test_columnar_sidecar.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_columnar_sidecar.py
+    python3 tests\test_columnar_sidecar.py
+
+This test suite verifies the memory-mapped columnar sidecar for prepared files.
+"""
+
+import unittest
+import os
+import pathlib
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.columnar_sidecar import read_columns, read_prepared_sales, write_sidecar  # noqa: E402
+
+sales_df = pd.DataFrame(
+    {
+        "transactionid": [550, 551, 552],
+        "saledate": ["2024-01-06", "2024-01-06", "2024-02-10"],
+        "customerid": [1008, 1009, 1001],
+        "productid": [102, 105, 101],
+        "storeid": [404, 403, 402],
+        "campaignid": [0, 0, 1],
+        "saleamount": [39.1, 19.78, 793.12],
+        "bonuspoints": [10, 20, 30],
+        "paymenttype": ["CREDIT", "CASH", "CHECK"],
+    }
+)
+
+
+def read_prepared_sales_via_sidecar(df, directory):
+    """Write df with a fresh sidecar to another file and read it back through the sidecar."""
+    csv_path = pathlib.Path(directory).joinpath("sales_copy_prepared.csv")
+    df.to_csv(csv_path, index=False)
+    write_sidecar(df, csv_path)
+    return read_prepared_sales(csv_path)
+
+
+class TestColumnarSidecar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(self.tmp_dir.name).joinpath("sales_data_prepared.csv")
+        sales_df.to_csv(self.csv_path, index=False)
+        write_sidecar(sales_df, self.csv_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_columns_are_memory_mapped(self):
+        columns = read_columns(self.csv_path, ["saleamount", "date_key", "customerid"])
+        self.assertIsInstance(columns["saleamount"], np.memmap)
+        np.testing.assert_allclose(columns["saleamount"], sales_df["saleamount"])
+        self.assertEqual(columns["date_key"].tolist(), [20240106, 20240106, 20240210])
+        self.assertEqual(columns["customerid"].dtype, np.int64)
+
+    def test_stale_sidecar_is_rejected(self):
+        stat = self.csv_path.stat()
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        with self.assertRaises(ValueError):
+            read_columns(self.csv_path)
+
+    def test_prepared_sales_take_numeric_columns_from_the_sidecar(self):
+        df = read_prepared_sales(self.csv_path)
+        self.assertEqual(list(df.columns), list(sales_df.columns) + ["date_key"])
+        pd.testing.assert_frame_equal(df.drop(columns="date_key"), pd.read_csv(self.csv_path))
+        self.assertEqual(df["date_key"].tolist(), [20240106, 20240106, 20240210])
+        self.assertEqual(str(df["date_key"].dtype), "Int64")
+
+    def test_prepared_sales_fall_back_to_csv(self):
+        os.remove(pathlib.Path(self.tmp_dir.name).joinpath("sales_data_prepared.columns", "schema.json"))
+        df = read_prepared_sales(self.csv_path)
+        pd.testing.assert_frame_equal(df, read_prepared_sales_via_sidecar(sales_df, self.tmp_dir.name))
+
+    def test_stale_sidecar_is_not_used(self):
+        changed_df = sales_df.assign(saleamount=[1.0, 2.0, 3.0])
+        changed_df.to_csv(self.csv_path, index=False)
+        self.assertEqual(read_prepared_sales(self.csv_path)["saleamount"].tolist(), [1.0, 2.0, 3.0])
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
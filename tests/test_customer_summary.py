@@ -0,0 +1,134 @@
+r"""
+tests/test_customer_summary.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_customer_summary.py
+    python3 tests\test_customer_summary.py
+
+This test suite verifies that incremental customer_summary updates match a full rebuild.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import customer_summary, sale_partitions  # noqa: E402
+from scripts.warehouse import read_table_sql  # noqa: E402
+
+
+def make_sales(rows):
+    """Build sales with warehouse column names from (sale_id, customer_id, sale_date, amount) tuples."""
+    return pd.DataFrame(
+        [
+            {"sale_id": sale_id, "customer_id": customer_id, "product_id": 101, "store_id": 401,
+             "campaign_id": 0, "sale_amount": amount, "sale_date": sale_date,
+             "date_key": int(sale_date.replace("-", "")), "bonus_points": int(amount // 10),
+             "payment_type": "CASH"}
+            for sale_id, customer_id, sale_date, amount in rows
+        ]
+    )
+
+
+class TestCustomerSummary(unittest.TestCase):
+
+    def setUp(self):
+        """An in-memory warehouse with two customers' sales and their summary."""
+        self.conn = sqlite3.connect(":memory:")
+        self.cursor = self.conn.cursor()
+        self.cursor.execute(read_table_sql("customer_summary"))
+        sales_df = make_sales([
+            (1, 1001, "2024-01-05", 100.0),
+            (2, 1001, "2024-02-10", 50.0),
+            (3, 1002, "2024-01-20", 30.0),
+        ])
+        sale_partitions.write_partitions(sales_df, self.cursor)
+        sale_partitions.rebuild_sale_view(self.cursor)
+        customer_summary.rebuild_customer_summary(self.cursor)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def summary(self):
+        return self.cursor.execute(
+            "SELECT customer_id, total_spent, transaction_count, bonus_points FROM customer_summary ORDER BY customer_id"
+        ).fetchall()
+
+    def purchase_keys(self):
+        return self.cursor.execute(
+            "SELECT customer_id, first_purchase_key, last_purchase_key FROM customer_summary ORDER BY customer_id"
+        ).fetchall()
+
+    def apply_without_rebuild(self, new_df):
+        """Write new sales and apply them to the summary incrementally."""
+        accepted_df, replaced_df = sale_partitions.pending_changes(new_df, self.cursor)
+        sale_partitions.append_sales(new_df, self.cursor)
+        customer_summary.apply_sales_delta(self.cursor, accepted_df, replaced_df)
+
+    def apply(self, new_df):
+        """Apply new sales incrementally; return the incremental and rebuilt summaries."""
+        self.apply_without_rebuild(new_df)
+        incremental, incremental_keys = self.summary(), self.purchase_keys()
+        customer_summary.rebuild_customer_summary(self.cursor)
+        self.assertEqual(incremental_keys, self.purchase_keys(), "Purchase keys should match a rebuild")
+        return incremental, self.summary()
+
+    def test_new_sales_are_added(self):
+        incremental, rebuilt = self.apply(make_sales([(4, 1002, "2024-03-01", 70.0), (5, 1003, "2024-03-02", 5.0)]))
+        self.assertEqual(incremental, rebuilt)
+        self.assertIn((1003, 5.0, 1, 0), incremental)
+
+    def test_replaced_sales_are_subtracted(self):
+        incremental, rebuilt = self.apply(make_sales([(2, 1001, "2024-02-10", 80.0)]))
+        self.assertEqual(incremental, rebuilt)
+        self.assertEqual(incremental[0], (1001, 180.0, 2, 18))
+
+    def test_sale_moved_to_another_customer(self):
+        incremental, rebuilt = self.apply(make_sales([(3, 1001, "2024-03-05", 30.0)]))
+        self.assertEqual(incremental, rebuilt)
+        self.assertEqual(incremental, [(1001, 180.0, 3, 18)])
+
+    def test_moved_sale_updates_both_customers_purchase_keys(self):
+        self.apply_without_rebuild(make_sales([(2, 1002, "2024-02-10", 50.0)]))
+        rows = self.cursor.execute(
+            "SELECT customer_id, transaction_count, first_purchase_key, last_purchase_key FROM customer_summary "
+            "ORDER BY customer_id"
+        ).fetchall()
+        self.assertEqual(rows, [(1001, 1, 20240105, 20240105), (1002, 2, 20240120, 20240210)])
+
+    def test_customer_without_sales_is_removed(self):
+        self.apply_without_rebuild(make_sales([(3, 1001, "2024-01-20", 30.0)]))
+        customers = self.cursor.execute("SELECT customer_id FROM customer_summary ORDER BY customer_id").fetchall()
+        self.assertEqual(customers, [(1001,)], "A customer whose only sale moved away has no summary row")
+
+    def test_repeated_sale_counts_once_with_its_last_row(self):
+        new_df = make_sales([(4, 1002, "2024-03-01", 70.0), (4, 1002, "2024-03-01", 40.0)])
+        incremental, rebuilt = self.apply(new_df)
+        self.assertEqual(incremental, rebuilt)
+        self.assertIn((1002, 70.0, 2, 7), incremental)
+
+    def test_raw_batches_are_deduplicated(self):
+        new_df = make_sales([(4, 1002, "2024-03-01", 70.0), (4, 1002, "2024-03-01", 40.0)])
+        customer_summary.apply_sales_delta(self.cursor, new_df, new_df.iloc[0:0])
+        self.assertIn((1002, 70.0, 2, 7), self.summary(), "A sale_id sent twice is added once")
+
+    def test_purchase_keys_widen(self):
+        new_df = make_sales([(6, 1002, "2023-12-31", 1.0)])
+        customer_summary.apply_sales_delta(self.cursor, new_df, new_df.iloc[0:0])
+        keys = self.cursor.execute(
+            "SELECT first_purchase_key, last_purchase_key FROM customer_summary WHERE customer_id = 1002"
+        ).fetchone()
+        self.assertEqual(keys, (20231231, 20240120))
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
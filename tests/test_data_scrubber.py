@@ -85,6 +85,17 @@ class TestDataScrubber(unittest.TestCase):
         self.assertEqual(df_formatted['Name'].str.contains(' ').sum(), 0, "Strings not formatted to uppercase correctly")
         self.assertTrue(df_formatted['Name'].str.isupper().all(), "Strings not formatted to uppercase correctly")
     
+    def test_canonicalize_column_strings(self):
+        scrubber = DataScrubber(pd.DataFrame({'Payment': [' credit ', 'Credit  Card', 'ＣＡＳＨ', None, 'credit']}))
+        df_canonical = scrubber.canonicalize_column_strings('Payment', synonyms={'credit card': 'CREDIT'})
+        self.assertEqual(df_canonical['Payment'].tolist()[:3], ['CREDIT', 'CREDIT', 'CASH'], "Strings not canonicalized correctly")
+        self.assertTrue(pd.isna(df_canonical['Payment'][3]), "Missing values should stay missing")
+        self.assertEqual(df_canonical['Payment'][4], 'CREDIT', "Repeated values not mapped back correctly")
+
+    def test_canonicalize_column_strings_missing_column(self):
+        with self.assertRaises(ValueError):
+            self.scrubber.canonicalize_column_strings('Missing')
+
     def test_handle_missing_data(self):
         df_filled = self.scrubber.handle_missing_data(fill_value=0)
         self.assertEqual(df_filled.isnull().sum().sum(), 0, "Missing values not handled correctly")
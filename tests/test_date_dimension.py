@@ -0,0 +1,74 @@
+r"""
+tests/test_date_dimension.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_date_dimension.py
+    python3 tests\test_date_dimension.py
+
+This test suite verifies the calendar date dimension and integer date keys.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import date_dimension  # noqa: E402
+from scripts.warehouse import read_table_sql  # noqa: E402
+
+CAMPAIGNS = pd.DataFrame(
+    {"campaign_id": [0, 1], "start_date": ["0001-01-01", "2024-05-07"], "end_date": ["9999-12-31", "2024-05-08"]}
+)
+
+
+class TestDateDimension(unittest.TestCase):
+
+    def test_to_date_key(self):
+        keys = date_dimension.to_date_key(pd.Series(["2024-05-17", "2024-05-17 10:30:00", "0/0/0000", None]))
+        self.assertEqual(keys.tolist()[:2], [20240517, 20240517])
+        self.assertTrue(keys.iloc[2:].isna().all(), "Non-ISO dates have no key")
+        self.assertEqual(date_dimension.date_key_to_iso(20240517), "2024-05-17")
+
+    def test_build_covers_every_day_with_calendar_fields(self):
+        date_df = date_dimension.build_date_dimension("2024-02-28", "2024-03-02")
+        self.assertEqual(date_df["date_key"].tolist(), [20240228, 20240229, 20240301, 20240302])
+        self.assertEqual(list(date_df.columns), date_dimension.DATE_COLUMNS)
+        saturday = date_df[date_df["date_key"] == 20240302].iloc[0]
+        self.assertEqual((saturday["weekday_name"], saturday["is_weekend"], saturday["quarter"]), ("Saturday", 1, 1))
+
+    def test_campaign_flags(self):
+        date_df = date_dimension.build_date_dimension("2024-05-06", "2024-05-09", CAMPAIGNS)
+        self.assertEqual(date_df["campaign_active"].tolist(), [0, 1, 1, 0])
+        self.assertEqual(date_df["campaign_id"].tolist(), [0, 1, 1, 0], "NO CAMPAIGN is never active")
+
+    def test_dimension_for_keys_spans_min_to_max(self):
+        keys = pd.Series([20240105, None, 20240103], dtype="Int64")
+        date_df = date_dimension.date_dimension_for_keys(keys)
+        self.assertEqual(date_df["date_key"].tolist(), [20240103, 20240104, 20240105])
+
+    def test_dimension_for_no_keys_is_empty_with_columns(self):
+        date_df = date_dimension.date_dimension_for_keys(pd.Series([None], dtype="Int64"))
+        self.assertTrue(date_df.empty)
+        self.assertEqual(list(date_df.columns), date_dimension.DATE_COLUMNS)
+
+    def test_columns_match_the_date_table(self):
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute(read_table_sql("date"))
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(date)")]
+        finally:
+            conn.close()
+        self.assertEqual(columns, date_dimension.DATE_COLUMNS)
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
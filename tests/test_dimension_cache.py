@@ -0,0 +1,86 @@
+r"""
+tests/test_dimension_cache.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_dimension_cache.py
+    python3 tests\test_dimension_cache.py
+
+This test suite verifies the array-backed dimension cache and its version stamp.
+"""
+
+import unittest
+import pathlib
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.dimension_cache import (  # noqa: E402
+    UNVERSIONED,
+    DimensionCache,
+    read_dimension_version,
+    write_dimension_version,
+)
+from scripts.warehouse import close_pools, read_table_sql, writer_connection  # noqa: E402
+
+
+class TestDimensionCache(unittest.TestCase):
+
+    def setUp(self):
+        """A warehouse with two products, two campaigns and two customers."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = pathlib.Path(self.tmp_dir.name).joinpath("test.db")
+        with writer_connection(self.db_path) as conn:
+            for table_name in ["product", "campaign", "customer"]:
+                conn.execute(read_table_sql(table_name))
+            conn.executemany("INSERT INTO product (product_id, category) VALUES (?, ?)",
+                             [(101, "CLOTHING"), (105, None)])
+            conn.executemany("INSERT INTO campaign (campaign_id, campaign_name) VALUES (?, ?)",
+                             [(0, "NO CAMPAIGN"), (2, "MAY SALE")])
+            conn.executemany("INSERT INTO customer (customer_id, region) VALUES (?, ?)",
+                             [(1001, "EAST"), (1002, "WEST")])
+        self.sales_df = pd.DataFrame(
+            {"product_id": [105, 101, 999], "campaign_id": [2, 0, np.nan], "customer_id": [1002, 1001, 1001]}
+        )
+
+    def tearDown(self):
+        close_pools()
+        self.tmp_dir.cleanup()
+
+    def test_enrich_matches_left_joins(self):
+        enriched = DimensionCache(self.db_path).enrich(self.sales_df)
+        self.assertEqual(enriched["campaign_name"].tolist()[:2], ["MAY SALE", "NO CAMPAIGN"])
+        self.assertEqual(enriched["region"].tolist(), ["WEST", "EAST", "EAST"])
+        self.assertEqual(enriched["category"].tolist()[1], "CLOTHING")
+        self.assertTrue(pd.isna(enriched["category"].iloc[0]), "A NULL attribute stays missing")
+        self.assertTrue(pd.isna(enriched["category"].iloc[2]), "An unknown id gathers a missing value")
+        self.assertTrue(pd.isna(enriched["campaign_name"].iloc[2]), "A missing id gathers a missing value")
+
+    def test_contains_is_the_inner_join(self):
+        lookup = DimensionCache(self.db_path).lookup("category")
+        self.assertEqual(lookup.contains(self.sales_df["product_id"]).tolist(), [True, True, False])
+
+    def test_reloads_when_version_changes(self):
+        self.assertEqual(read_dimension_version(self.db_path), UNVERSIONED)
+        cache = DimensionCache(self.db_path)
+        cache.refresh()
+        with writer_connection(self.db_path) as conn:
+            conn.execute("UPDATE product SET category = 'SPORTS' WHERE product_id = 101")
+        self.assertEqual(cache.lookup("category").gather(pd.Series([101])).tolist(), ["CLOTHING"],
+                         "Without a new version the cached arrays are used")
+        with writer_connection(self.db_path) as conn:
+            version = write_dimension_version(conn.cursor())
+        self.assertEqual(cache.lookup("category").gather(pd.Series([101])).tolist(), ["SPORTS"])
+        self.assertEqual(cache.version, version)
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,137 @@
+r"""
+tests/test_dimension_history.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_dimension_history.py
+    python3 tests\test_dimension_history.py
+
+This test suite verifies the Type 2 customer and product history and the sale version keys.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import dimension_history, sale_partitions  # noqa: E402
+from scripts.warehouse import read_table_sql  # noqa: E402
+
+PRODUCTS = [(101, "LAPTOP", "ELECTRONICS", 793.12, 36, "ALIBABA"), (102, "HOODIE", "CLOTHING", 39.1, 292, "ABC")]
+CUSTOMERS = [(1001, "WILLIAM WHITE", "EAST", "2021-11-11", 1025, "M")]
+
+
+def make_sales(rows):
+    """Build sales with warehouse column names from (sale_id, product_id, sale_date) tuples."""
+    return pd.DataFrame(
+        [
+            {"sale_id": sale_id, "customer_id": 1001, "product_id": product_id, "store_id": 401,
+             "campaign_id": 0, "sale_amount": 10.0, "sale_date": sale_date,
+             "date_key": int(sale_date.replace("-", "")), "bonus_points": 0, "payment_type": "CASH"}
+            for sale_id, product_id, sale_date in rows
+        ]
+    )
+
+
+class TestDimensionHistory(unittest.TestCase):
+
+    def setUp(self):
+        """An in-memory warehouse whose customer and product snapshots are merged into history."""
+        self.conn = sqlite3.connect(":memory:")
+        self.cursor = self.conn.cursor()
+        for table_name in ["customer", "product", "sale_dimension_key"]:
+            self.cursor.execute(read_table_sql(table_name))
+        sale_partitions.rebuild_sale_view(self.cursor)
+        self.load_snapshot(CUSTOMERS, PRODUCTS, "2024-01-01")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def load_snapshot(self, customers, products, effective_date):
+        self.cursor.execute("DELETE FROM customer")
+        self.cursor.execute("DELETE FROM product")
+        self.cursor.executemany("INSERT INTO customer (customer_id, name, region, join_date, loyalty_points, gender) "
+                                "VALUES (?, ?, ?, ?, ?, ?)", customers)
+        self.cursor.executemany("INSERT INTO product (product_id, product_name, category, unit_price, stock, supplier) "
+                                "VALUES (?, ?, ?, ?, ?, ?)", products)
+        return dimension_history.merge_dimensions(self.cursor, effective_date=effective_date)
+
+    def versions(self, product_id):
+        return self.cursor.execute(
+            "SELECT product_key, unit_price, stock, valid_from, valid_to, is_current FROM product_history "
+            "WHERE product_id = ? ORDER BY product_key",
+            (product_id,),
+        ).fetchall()
+
+    def test_first_versions_cover_all_dates(self):
+        self.assertEqual(self.versions(101), [(1, 793.12, 36, "0001-01-01", "9999-12-31", 1)])
+
+    def test_unchanged_rows_are_not_written(self):
+        before = self.cursor.execute("SELECT * FROM product_history").fetchall()
+        counts = self.load_snapshot(CUSTOMERS, PRODUCTS, "2024-02-01")
+        self.assertEqual(counts["product"], {"added": 0, "changed": 0, "updated": 0, "closed": 0})
+        self.assertEqual(before, self.cursor.execute("SELECT * FROM product_history").fetchall())
+
+    def test_price_change_starts_a_new_version(self):
+        products = [(101, "LAPTOP", "ELECTRONICS", 899.99, 36, "ALIBABA"), PRODUCTS[1]]
+        counts = self.load_snapshot(CUSTOMERS, products, "2024-02-01")
+        self.assertEqual(counts["product"]["changed"], 1)
+        self.assertEqual(
+            self.versions(101),
+            [(1, 793.12, 36, "0001-01-01", "2024-02-01", 0), (3, 899.99, 36, "2024-02-01", "9999-12-31", 1)],
+        )
+        self.assertEqual(len(self.versions(102)), 1)
+
+    def test_stock_change_updates_the_current_version(self):
+        products = [PRODUCTS[0], (102, "HOODIE", "CLOTHING", 39.1, 100, "ABC")]
+        counts = self.load_snapshot(CUSTOMERS, products, "2024-02-01")
+        self.assertEqual(counts["product"]["updated"], 1)
+        self.assertEqual(self.versions(102), [(2, 39.1, 100, "0001-01-01", "9999-12-31", 1)])
+
+    def test_same_day_changes_correct_the_new_version(self):
+        self.load_snapshot(CUSTOMERS, [(101, "LAPTOP", "ELECTRONICS", 899.99, 36, "ALIBABA")], "2024-02-01")
+        self.load_snapshot(CUSTOMERS, [(101, "LAPTOP", "ELECTRONICS", 849.99, 36, "ALIBABA")], "2024-02-01")
+        self.assertEqual([version[1] for version in self.versions(101)], [793.12, 849.99])
+
+    def test_missing_ids_are_closed_and_reopened(self):
+        counts = self.load_snapshot(CUSTOMERS, PRODUCTS[:1], "2024-02-01")
+        self.assertEqual(counts["product"]["closed"], 1)
+        self.assertEqual(self.versions(102)[-1][3:], ("0001-01-01", "2024-02-01", 0))
+        self.load_snapshot(CUSTOMERS, PRODUCTS, "2024-03-01")
+        self.assertEqual(self.versions(102)[-1][3:], ("2024-03-01", "9999-12-31", 1))
+
+    def test_empty_snapshot_leaves_history_unchanged(self):
+        counts = self.load_snapshot(CUSTOMERS, [], "2024-02-01")
+        self.assertEqual(counts["product"]["closed"], 0)
+        self.assertEqual(self.versions(101)[0][5], 1)
+
+    def test_sales_resolve_to_the_version_valid_at_sale_date(self):
+        sales_df = make_sales([(1, 101, "2024-01-20")])
+        sale_partitions.append_sales(sales_df, self.cursor)
+        dimension_history.rebuild_sale_keys(self.cursor)
+        self.load_snapshot(CUSTOMERS, [(101, "LAPTOP", "ELECTRONICS", 899.99, 36, "ALIBABA")], "2024-02-01")
+
+        new_df = make_sales([(2, 101, "2024-01-31"), (3, 101, "2024-02-01")])
+        accepted_df, replaced_df = sale_partitions.pending_changes(new_df, self.cursor)
+        sale_partitions.append_sales(new_df, self.cursor)
+        dimension_history.apply_sales_delta(self.cursor, accepted_df, replaced_df)
+        dimension_history.create_sale_version_view(self.cursor)
+        prices = self.cursor.execute("SELECT sale_id, unit_price FROM sale_version ORDER BY sale_id").fetchall()
+        self.assertEqual(prices, [(1, 793.12), (2, 793.12), (3, 899.99)])
+
+        # A full rebuild resolves the same keys
+        incremental = self.cursor.execute("SELECT * FROM sale_dimension_key ORDER BY sale_id").fetchall()
+        dimension_history.rebuild_sale_keys(self.cursor)
+        self.assertEqual(incremental, self.cursor.execute("SELECT * FROM sale_dimension_key ORDER BY sale_id").fetchall())
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
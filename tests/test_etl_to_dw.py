@@ -0,0 +1,210 @@
+r"""
+tests/test_etl_to_dw.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_etl_to_dw.py
+    python3 tests\test_etl_to_dw.py
+
+This test suite verifies the shadow-table load and swap of the warehouse.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import tempfile
+from unittest import mock
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import campaign_facts, checkpoints, etl_to_dw, referential_integrity  # noqa: E402
+from scripts.columnar_sidecar import write_sidecar  # noqa: E402
+
+PREPARED_FILES = {
+    "campaign_data_prepared.csv": "campaignid,campaignname,startdate,enddate\n"
+                                  "0,NO CAMPAIGN,0001-01-01,9999-12-31\n"
+                                  "1,MAY SALE,2024-05-07,2024-05-20\n",
+    "customers_data_prepared.csv": "customerid,name,region,loyaltypoints,gender,joindate\n"
+                                   "1001,WILLIAM WHITE,EAST,1025.0,M,2021-11-11\n"
+                                   "1002,WYLIE COYOTE,WEST,0.0,M,2023-02-14\n",
+    "products_data_prepared.csv": "productid,productname,category,unitprice,stock,supplier\n"
+                                  "101,LAPTOP,ELECTRONICS,793.12,36,ALIBABA\n",
+    "sales_data_prepared.csv": "transactionid,customerid,productid,storeid,campaignid,saleamount,bonuspoints,paymenttype,saledate\n"
+                               "550,1001,101,404,0,793.12,10,CREDIT,2024-01-06\n"
+                               "551,1002,101,403,1,793.12,20,CASH,2024-05-08\n",
+}
+
+
+class WarehouseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Prepared files and a warehouse in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self.tmp_dir.name)
+        self.prepared_dir = root.joinpath("prepared")
+        self.prepared_dir.mkdir()
+        self.db_path = root.joinpath("smart_sales.db")
+        for name, text in PREPARED_FILES.items():
+            self.prepared_dir.joinpath(name).write_text(text)
+        self.patches = [
+            mock.patch.object(etl_to_dw, "DB_PATH", self.db_path),
+            mock.patch.object(etl_to_dw, "PREPARED_DATA_DIR", self.prepared_dir),
+            mock.patch.object(referential_integrity, "REJECTS_DIR", root.joinpath("rejects")),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.tmp_dir.cleanup()
+
+    def query(self, sql):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            result = conn.execute(sql).fetchall()
+            conn.commit()
+            return result
+        finally:
+            conn.close()
+
+
+class TestShadowLoad(WarehouseTestCase):
+
+    def change_customers(self, text):
+        self.prepared_dir.joinpath("customers_data_prepared.csv").write_text(
+            "customerid,name,region,loyaltypoints,gender,joindate\n" + text
+        )
+
+    def test_load_swaps_shadow_tables_in(self):
+        etl_to_dw.load_data_to_db()
+        self.assertEqual(self.query("SELECT COUNT(*) FROM customer"), [(2,)])
+        self.assertEqual(self.query("SELECT sale_id FROM sale ORDER BY sale_id"), [(550,), (551,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM sqlite_master WHERE name LIKE '%__shadow'"), [(0,)])
+
+    def test_load_through_the_sidecar_matches_the_csv(self):
+        etl_to_dw.load_data_to_db()
+        from_csv = self.query("SELECT * FROM sale ORDER BY sale_id")
+        sales_path = self.prepared_dir.joinpath("sales_data_prepared.csv")
+        write_sidecar(pd.read_csv(sales_path), sales_path)
+        etl_to_dw.load_data_to_db()
+        self.assertEqual(self.query("SELECT * FROM sale ORDER BY sale_id"), from_csv)
+
+    def test_only_changed_customers_are_written(self):
+        etl_to_dw.load_data_to_db()
+        self.query("CREATE TABLE customer_writes (customer_id INTEGER)")
+        self.query("CREATE TRIGGER customer_written AFTER INSERT ON customer "
+                   "BEGIN INSERT INTO customer_writes VALUES (NEW.customer_id); END")
+        self.change_customers("1001,WILLIAM WHITE,EAST,1025.0,M,2021-11-11\n1003,NEW CUSTOMER,WEST,0.0,F,2024-01-01\n")
+        etl_to_dw.load_data_to_db()
+        self.assertEqual(self.query("SELECT customer_id FROM customer ORDER BY customer_id"), [(1001,), (1003,)])
+        self.assertEqual(self.query("SELECT customer_id FROM customer_writes"), [(1003,)])
+
+    def test_sales_resolve_to_the_merged_versions(self):
+        etl_to_dw.load_data_to_db()
+        self.change_customers("1001,WILLIAM WHITE,NORTH,1025.0,M,2021-11-11\n1002,WYLIE COYOTE,WEST,0.0,M,2023-02-14\n")
+        etl_to_dw.load_data_to_db()
+        self.assertEqual(
+            self.query("SELECT region, valid_to = '9999-12-31' FROM customer_history WHERE customer_id = 1001 ORDER BY customer_key"),
+            [("EAST", 0), ("NORTH", 1)],
+        )
+        self.assertEqual(self.query("SELECT sale_id, region FROM sale_version ORDER BY sale_id"), [(550, "EAST"), (551, "WEST")])
+
+    def test_failed_swap_leaves_the_history_untouched(self):
+        etl_to_dw.load_data_to_db()
+        history = self.query("SELECT * FROM customer_history ORDER BY customer_key")
+        self.change_customers("1001,WILLIAM WHITE,NORTH,1025.0,M,2021-11-11\n")
+        with mock.patch.object(campaign_facts, "create_sale_campaign_view", side_effect=sqlite3.OperationalError("boom")):
+            with self.assertRaises(sqlite3.Error):
+                etl_to_dw.load_data_to_db()
+        self.assertEqual(self.query("SELECT * FROM customer_history ORDER BY customer_key"), history)
+        self.assertEqual(self.query("SELECT customer_id, region FROM customer ORDER BY customer_id"), [(1001, "EAST"), (1002, "WEST")])
+
+    def test_new_sales_extend_the_calendar_without_gaps(self):
+        etl_to_dw.load_data_to_db()
+        self.prepared_dir.joinpath("sales_new_prepared.csv").write_text(
+            "transactionid,customerid,productid,storeid,campaignid,saleamount,bonuspoints,paymenttype,saledate\n"
+            "552,1002,101,403,0,10.00,0,CASH,2024-07-01\n"
+        )
+        etl_to_dw.load_new_sales_to_db("sales_new_prepared.csv")
+        days = (pd.Timestamp("2024-07-01") - pd.Timestamp("2024-01-06")).days + 1
+        self.assertEqual(self.query("SELECT COUNT(*), MIN(date_key), MAX(date_key) FROM date"), [(days, 20240106, 20240701)])
+        self.assertEqual(
+            self.query("SELECT campaign_id, campaign_length FROM campaign ORDER BY campaign_id"),
+            [(0, days - 14), (1, 14)],
+            "Campaign lengths count both end dates; NO CAMPAIGN is every other calendar day",
+        )
+
+    def test_missing_columns_keep_the_live_tables(self):
+        etl_to_dw.load_data_to_db()
+        self.prepared_dir.joinpath("customers_data_prepared.csv").write_text(
+            "customerid,name,loyaltypoints,gender,joindate\n1003,NEW CUSTOMER,0.0,F,2024-01-01\n"
+        )
+        with self.assertRaises(ValueError):
+            etl_to_dw.load_data_to_db()
+        self.assertEqual(self.query("SELECT customer_id FROM customer ORDER BY customer_id"), [(1001,), (1002,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM customer__shadow"), [(0,)], "Nothing was swapped in")
+
+
+
+class TestResumeAfterCrash(WarehouseTestCase):
+    """A load interrupted between a step's rows and its checkpoint resumes cleanly."""
+
+    def setUp(self):
+        super().setUp()
+        rows = [
+            f"{600 + i},{1001 + i % 2},101,404,0,10.00,1,CASH,2024-0{1 + i // 25}-{1 + i % 25:02d}"
+            for i in range(50)
+        ]
+        self.prepared_dir.joinpath("sales_data_prepared.csv").write_text(
+            PREPARED_FILES["sales_data_prepared.csv"].split("\n")[0] + "\n" + "\n".join(rows) + "\n"
+        )
+        self.batch_patch = mock.patch.object(etl_to_dw, "LOAD_BATCH_SIZE", 10)
+        self.batch_patch.start()
+
+    def tearDown(self):
+        self.batch_patch.stop()
+        super().tearDown()
+
+    def crash_before_checkpoint(self, crash_step, crash_rows=0):
+        """Run a load that is interrupted just before the given checkpoint is saved."""
+        save = checkpoints.save_load_checkpoint
+
+        def interrupted(cursor, step, signature, rows_done=0):
+            if (step, rows_done) == (crash_step, crash_rows):
+                raise RuntimeError("interrupted")
+            save(cursor, step, signature, rows_done)
+
+        with mock.patch.object(checkpoints, "save_load_checkpoint", side_effect=interrupted):
+            with self.assertRaises(RuntimeError):
+                etl_to_dw.load_data_to_db()
+
+    def test_sales_batch_resumes_after_crash(self):
+        self.crash_before_checkpoint("sales", 30)
+        self.assertEqual(self.query("SELECT rows_done FROM load_checkpoint WHERE step = 'sales'"), [(20,)])
+        partitions = self.query("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'sale_2024_%__shadow'")
+        shadow_rows = sum(self.query(f"SELECT COUNT(*) FROM {name}")[0][0] for (name,) in partitions)
+        self.assertEqual(shadow_rows, 20, "The interrupted batch was rolled back with its checkpoint")
+
+        etl_to_dw.load_data_to_db()
+        self.assertEqual(self.query("SELECT COUNT(*), COUNT(DISTINCT sale_id) FROM sale"), [(50, 50)])
+        self.assertEqual(self.query("SELECT SUM(transaction_count) FROM customer_summary"), [(50,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM sqlite_master WHERE name = 'load_checkpoint'"), [(0,)])
+
+    def test_dimensions_step_resumes_after_crash(self):
+        self.crash_before_checkpoint("dimensions")
+        self.assertEqual(self.query("SELECT COUNT(*) FROM customer__shadow"), [(0,)])
+
+        etl_to_dw.load_data_to_db()
+        self.assertEqual(self.query("SELECT COUNT(*) FROM customer"), [(2,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM sale"), [(50,)])
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
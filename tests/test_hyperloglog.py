@@ -0,0 +1,83 @@
+r"""
+tests/test_hyperloglog.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_hyperloglog.py
+    python3 tests\test_hyperloglog.py
+
+This test suite verifies the HyperLogLog distinct-count sketches used in the cube.
+"""
+
+import unittest
+import pathlib
+import sys
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import hyperloglog  # noqa: E402
+from scripts.olap_cubing import create_olap_cube  # noqa: E402
+
+rng = np.random.default_rng(5)
+n_sales = 50_000
+sales_df = pd.DataFrame(
+    {
+        "sale_id": np.arange(n_sales),
+        "sale_date": rng.choice(["2024-01-06", "2024-01-07", "2024-05-17"], n_sales),
+        "campaign_name": rng.choice(["NO CAMPAIGN", "MAY SALE"], n_sales),
+        "customer_id": rng.integers(1, 20_000, n_sales),
+        "sale_amount": rng.uniform(1, 100, n_sales),
+    }
+)
+
+
+class TestHyperLogLog(unittest.TestCase):
+
+    def assertClose(self, estimate, exact, tolerance=0.1):
+        self.assertLessEqual(abs(estimate - exact), tolerance * exact, f"estimate {estimate} vs exact {exact}")
+
+    def test_estimates_across_cardinalities(self):
+        for n_ids in [1, 50, 5_000, 200_000]:
+            ids = np.arange(n_ids) * 13 + 7
+            sketch = hyperloglog.group_sketches(np.zeros(n_ids, dtype=int), ids, 1)
+            self.assertClose(hyperloglog.estimate(sketch)[0], n_ids)
+
+    def test_duplicates_do_not_count(self):
+        ids = np.repeat(np.arange(100), 50)
+        sketch = hyperloglog.group_sketches(np.zeros(len(ids), dtype=int), ids, 1)
+        self.assertClose(hyperloglog.estimate(sketch)[0], 100)
+
+    def test_encode_round_trip(self):
+        sketch = hyperloglog.group_sketches(np.zeros(10, dtype=int), np.arange(10), 1)[0]
+        np.testing.assert_array_equal(hyperloglog.decode(hyperloglog.encode(sketch)), sketch)
+
+    def test_cube_cells_roll_up_to_campaign(self):
+        cube = create_olap_cube(
+            sales_df, ["sale_date", "campaign_name"], {"sale_amount": ["sum"]}, sketches=["customer_id"]
+        )
+        exact_cells = sales_df.groupby(["sale_date", "campaign_name"])["customer_id"].nunique().to_numpy()
+        for estimate, exact in zip(cube["customer_id_distinct"], exact_cells):
+            self.assertClose(estimate, exact)
+
+        rolled_up = hyperloglog.rollup_distinct(cube, ["campaign_name"], "customer_id")
+        exact = sales_df.groupby("campaign_name")["customer_id"].nunique()
+        for campaign_name, estimate in zip(rolled_up["campaign_name"], rolled_up["customer_id_distinct"]):
+            self.assertClose(estimate, exact[campaign_name])
+
+    def test_merge_equals_sketch_of_union(self):
+        first = hyperloglog.sketch_column(sales_df.iloc[:20_000], ["campaign_name"], "customer_id")
+        second = hyperloglog.sketch_column(sales_df.iloc[20_000:], ["campaign_name"], "customer_id")
+        merged = hyperloglog.rollup_distinct(pd.concat([first, second]), ["campaign_name"], "customer_id")
+        whole = hyperloglog.sketch_column(sales_df, ["campaign_name"], "customer_id")
+        pd.testing.assert_series_equal(merged["customer_id_distinct"], whole["customer_id_distinct"])
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+r"""
+tests/test_olap_cubing.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_olap_cubing.py
+    python3 tests\test_olap_cubing.py
+
+This test suite verifies that the sharded cube build matches the serial build.
+"""
+
+import unittest
+import pathlib
+import sys
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.olap_cubing import (  # noqa: E402
+    build_olap_cube,
+    create_olap_cube,
+    merge_partial_cubes,
+    shard_sales,
+)
+
+rng = np.random.default_rng(3)
+n_sales = 5_000
+sale_dates = pd.date_range("2024-01-01", periods=60).strftime("%Y-%m-%d")
+sales_df = pd.DataFrame(
+    {
+        "sale_id": np.arange(n_sales),
+        "sale_date": rng.choice(sale_dates, n_sales),
+        "campaign_name": rng.choice(["NO CAMPAIGN", "MAY SALE", "JULY SALE"], n_sales),
+        "category": rng.choice(["CLOTHING", "SPORTS"], n_sales),
+        "sale_amount": rng.uniform(1, 500, n_sales).round(2),
+        "customer_id": rng.integers(1, 400, n_sales),
+    }
+)
+dimensions = ["sale_date", "campaign_name", "category"]
+metrics = {"sale_amount": ["sum", "mean"], "sale_id": ["count"]}
+
+
+class TestShardedCube(unittest.TestCase):
+
+    def test_shards_never_share_a_cell(self):
+        for shard_by in ["key", "date"]:
+            shards = shard_sales(sales_df, dimensions, 4, shard_by)
+            self.assertEqual(sum(len(shard) for shard in shards), n_sales)
+            cells = [set(shard[dimensions].itertuples(index=False)) for shard in shards]
+            self.assertEqual(sum(len(cell) for cell in cells), len(set().union(*cells)))
+
+    def test_date_shards_need_sale_date(self):
+        with self.assertRaises(ValueError):
+            shard_sales(sales_df, ["campaign_name"], 2, "date")
+
+    def test_parallel_build_is_identical_to_serial(self):
+        serial = create_olap_cube(sales_df, dimensions, metrics, sketches=["customer_id"])
+        for shard_by in ["key", "date"]:
+            parallel = build_olap_cube(
+                sales_df, dimensions, metrics, ["customer_id"], workers=2, shard_by=shard_by, min_rows=0
+            )
+            pd.testing.assert_frame_equal(parallel, serial, check_exact=True)
+
+    def test_small_sales_are_cubed_without_a_pool(self):
+        serial = create_olap_cube(sales_df, dimensions, metrics)
+        with mock.patch("concurrent.futures.ProcessPoolExecutor", side_effect=AssertionError("pool started")):
+            cube = build_olap_cube(sales_df, dimensions, metrics, workers=4, min_rows=len(sales_df) + 1)
+        pd.testing.assert_frame_equal(cube, serial, check_exact=True)
+
+    def test_merge_combines_overlapping_cells(self):
+        partial_metrics = {"sale_amount": ["sum", "mean", "count"], "sale_id": ["count"]}
+        partials = [
+            create_olap_cube(part, ["campaign_name"], partial_metrics)
+            for part in (sales_df.iloc[:2_000], sales_df.iloc[2_000:])
+        ]
+        merged = merge_partial_cubes(partials, ["campaign_name"], metrics)
+        serial = create_olap_cube(sales_df, ["campaign_name"], metrics)
+        pd.testing.assert_frame_equal(merged, serial, check_exact=False, rtol=1e-12)
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
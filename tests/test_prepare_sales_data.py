@@ -0,0 +1,75 @@
+r"""
+tests/test_prepare_sales_data.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_prepare_sales_data.py
+    python3 tests\test_prepare_sales_data.py
+
+This test suite verifies that prepare_sales_data fills blank values in the raw sales file.
+"""
+
+import unittest
+import pathlib
+import sys
+import tempfile
+from unittest import mock
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import referential_integrity  # noqa: E402
+from scripts.data_preparation import prepare_sales_data  # noqa: E402
+
+RAW_SALES = (
+    "TransactionID,SaleDate,CustomerID,ProductID,StoreID,CampaignID,SaleAmount,BonusPoints,PaymentType\n"
+    "550,1/6/2024,1008,102,404,0,39.1,,Credit\n"
+    "551,1/6/2024,1009,105,403,0,19.78,20,Cash\n"
+    "552,1/7/2024,1004,107,404,0,39.1,11,\n"
+    "553,1/8/2024,,102,401,0,25.0,30,Cash\n"
+)
+
+
+class TestPrepareSalesData(unittest.TestCase):
+
+    def setUp(self):
+        """A raw sales file and the prepared and rejects folders in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self.tmp_dir.name)
+        raw_dir = root.joinpath("raw")
+        self.prepared_dir = root.joinpath("prepared")
+        raw_dir.mkdir()
+        self.prepared_dir.mkdir()
+        raw_dir.joinpath("sales_data.csv").write_text(RAW_SALES)
+        self.patches = [
+            mock.patch.object(prepare_sales_data, "RAW_DATA_DIR", raw_dir),
+            mock.patch.object(prepare_sales_data, "PREPARED_DATA_DIR", self.prepared_dir),
+            mock.patch.object(referential_integrity, "REJECTS_DIR", root.joinpath("rejects")),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.tmp_dir.cleanup()
+
+    def test_blank_values_are_filled(self):
+        df = prepare_sales_data.handle_missing_values(prepare_sales_data.read_raw_data("sales_data.csv"))
+        self.assertEqual(df["transactionid"].tolist(), [550, 551, 552], "A sale without a customer is dropped")
+        self.assertEqual(df["bonuspoints"].tolist(), [20, 20, 11], "A blank bonus gets the median")
+        self.assertEqual(df["paymenttype"].tolist(), ["Credit", "Cash", "Unknown"])
+
+    def test_blank_bonus_points_prepare_cleanly(self):
+        prepare_sales_data.main()
+        prepared_df = pd.read_csv(self.prepared_dir.joinpath("sales_data_prepared.csv"))
+        self.assertEqual(prepared_df.loc[prepared_df["transactionid"] == 550, "bonuspoints"].tolist(), [20])
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,54 @@
+r"""
+tests/test_ranking.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_ranking.py
+    python3 tests\test_ranking.py
+
+This test suite verifies the top-k / bottom-k ranking helpers.
+"""
+
+import unittest
+import pathlib
+import sys
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.ranking import bottom_k, top_k  # noqa: E402
+
+cube_df = pd.DataFrame(
+    {
+        "category": ["CLOTHING", "CLOTHING", "CLOTHING", "SPORTS", "SPORTS"],
+        "campaign_name": ["MAY SALE", "JULY SALE", "NO CAMPAIGN", "MAY SALE", "NO CAMPAIGN"],
+        "sale_amount_sum": [50.0, 10.0, 30.0, 5.0, 25.0],
+    }
+)
+
+
+class TestRanking(unittest.TestCase):
+
+    def test_top_k_matches_full_sort(self):
+        expected = cube_df.sort_values("sale_amount_sum", ascending=False).head(2)
+        pd.testing.assert_frame_equal(top_k(cube_df, "sale_amount_sum", 2), expected)
+
+    def test_bottom_k(self):
+        self.assertEqual(bottom_k(cube_df, "sale_amount_sum", 1)["sale_amount_sum"].tolist(), [5.0])
+
+    def test_top_k_per_partition(self):
+        ranked = top_k(cube_df, "sale_amount_sum", 1, by="category")
+        self.assertEqual(
+            dict(zip(ranked["category"], ranked["campaign_name"])),
+            {"CLOTHING": "MAY SALE", "SPORTS": "NO CAMPAIGN"},
+            "Top row should be picked within each category",
+        )
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+r"""
+tests/test_raw_ingest.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_raw_ingest.py
+    python3 tests\test_raw_ingest.py
+
+This test suite verifies the header-driven raw CSV reader and its schema registry.
+"""
+
+import unittest
+import pathlib
+import sys
+import tempfile
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import raw_ingest  # noqa: E402
+
+
+class TestRawIngest(unittest.TestCase):
+
+    def setUp(self):
+        """A temporary raw directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.raw_dir = pathlib.Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, file_name, text):
+        path = self.raw_dir.joinpath(file_name)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_normalize_header(self):
+        self.assertEqual(raw_ingest.normalize_header(" Product_ID "), "productid")
+        self.assertEqual(raw_ingest.normalize_header("Unit Price"), "unitprice")
+        self.assertEqual(raw_ingest.normalize_header("sale-amount"), "saleamount")
+
+    def test_map_header_reports_drift(self):
+        header = ["ProductID", "ProductName", "Category", "Price", "Supplier", "", "3", "product_id"]
+        mapping = raw_ingest.map_header(header, "products")
+        self.assertEqual(mapping.positions, [0, 1, 2, 3, 4])
+        self.assertEqual(mapping.names, ["productid", "productname", "category", "unitprice", "supplier"])
+        self.assertEqual(mapping.missing, ["stock"])
+        self.assertEqual(mapping.unexpected, ["", "3", "product_id"], "Repeated columns are not parsed twice")
+        self.assertIn("Price -> unitprice", mapping.renamed)
+
+    def test_read_parses_only_mapped_columns(self):
+        path = self.write(
+            "products_data.csv",
+            "ProductID,ProductName,Category,UnitPrice,Stock,Supplier,,3\n"
+            "101,laptop,Electronics,793.12,36,Alibaba,not a number,\n"
+            "102,hoodie,Clothing,39.1,,ABCMerchandise,,\n",
+        )
+        df = raw_ingest.read_raw_csv(path)
+        self.assertEqual(list(df.columns), list(raw_ingest.SCHEMA_REGISTRY["products"]))
+        self.assertEqual(df["unitprice"].tolist(), [793.12, 39.1])
+        self.assertTrue(df["stock"].isna().iloc[1], "Missing counts stay missing for clean_data")
+
+    def test_missing_columns_are_not_fatal(self):
+        path = self.write("sales_extra.csv", "TransactionID,Sale Date,amount\n1,1/6/2024,9.5\n")
+        df = raw_ingest.read_raw_csv(path)
+        self.assertEqual(list(df.columns), ["transactionid", "saledate", "saleamount"])
+        self.assertEqual(df["saledate"].tolist(), ["1/6/2024"])
+
+    def test_read_in_chunks(self):
+        rows = "".join(f"{customer_id},NAME,EAST,1/1/2024,0,M\n" for customer_id in range(1001, 1006))
+        path = self.write("customers_data.csv", "CustomerID,Name,Region,JoinDate,LoyaltyPoints,Gender\n" + rows)
+        with raw_ingest.read_raw_csv(path, chunksize=2) as reader:
+            sizes = [len(chunk) for chunk in reader]
+        self.assertEqual(sizes, [2, 2, 1])
+
+    def test_dataset_for_file(self):
+        self.assertEqual(raw_ingest.dataset_for_file("sales_store404.csv"), "sales")
+        self.assertEqual(raw_ingest.dataset_for_file("products_data.csv"), "products")
+        self.assertEqual(raw_ingest.dataset_for_file("customers_data.csv"), "customers")
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,74 @@
+r"""
+tests/test_referential_integrity.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_referential_integrity.py
+    python3 tests\test_referential_integrity.py
+
+This test suite verifies the batch foreign key check and its reject files.
+"""
+
+import unittest
+import pathlib
+import sys
+import tempfile
+from unittest import mock
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import referential_integrity  # noqa: E402
+
+FOREIGN_KEYS = {"customer_id": [1001, 1002], "product_id": [101]}
+
+
+class TestReferentialIntegrity(unittest.TestCase):
+
+    def setUp(self):
+        """Reject files go to a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.rejects_dir = pathlib.Path(self.tmp_dir.name).joinpath("rejects")
+        self.patch = mock.patch.object(referential_integrity, "REJECTS_DIR", self.rejects_dir)
+        self.patch.start()
+        self.sales_df = pd.DataFrame(
+            {"sale_id": [1, 2, 3, 4], "customer_id": [1001, 9999, None, 1002], "product_id": [101, 101, 101, 555]}
+        )
+
+    def tearDown(self):
+        self.patch.stop()
+        self.tmp_dir.cleanup()
+
+    def test_split_orphans_gives_every_reason(self):
+        valid_df, rejects_df = referential_integrity.split_orphans(self.sales_df, FOREIGN_KEYS)
+        self.assertEqual(valid_df["sale_id"].tolist(), [1])
+        self.assertEqual(
+            rejects_df[referential_integrity.REJECT_REASON_COLUMN].tolist(),
+            ["unknown customer_id 9999.0", "missing customer_id", "unknown product_id 555"],
+        )
+
+    def test_orphans_are_written_to_a_reject_file(self):
+        valid_df = referential_integrity.validate_foreign_keys(self.sales_df, FOREIGN_KEYS, "sales_rejects.csv")
+        self.assertEqual(len(valid_df), 1)
+        rejects_df = pd.read_csv(self.rejects_dir.joinpath("sales_rejects.csv"))
+        self.assertEqual(rejects_df["sale_id"].tolist(), [2, 3, 4])
+
+    def test_clean_run_removes_a_stale_reject_file(self):
+        referential_integrity.validate_foreign_keys(self.sales_df, FOREIGN_KEYS, "sales_rejects.csv")
+        valid_df = referential_integrity.validate_foreign_keys(self.sales_df.iloc[[0]], FOREIGN_KEYS, "sales_rejects.csv")
+        self.assertEqual(len(valid_df), 1)
+        self.assertFalse(self.rejects_dir.joinpath("sales_rejects.csv").exists(), "No rejects, no reject file")
+
+    def test_clean_run_without_reject_file(self):
+        valid_df = referential_integrity.validate_foreign_keys(self.sales_df.iloc[[0]], FOREIGN_KEYS, "sales_rejects.csv")
+        self.assertEqual(len(valid_df), 1)
+        self.assertFalse(self.rejects_dir.exists())
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+r"""
+tests/test_report_charts.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_report_charts.py
+    python3 tests\test_report_charts.py
+
+This test suite verifies the batched chart rendering and its skip-unchanged manifest.
+"""
+
+import unittest
+import json
+import pathlib
+import sys
+import tempfile
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import report_charts  # noqa: E402
+
+SPECS = [
+    report_charts.ChartSpec("sales_by_campaign", "campaign_name", "Total Sales by Campaign", "Campaign"),
+    report_charts.ChartSpec("sales_by_category", "category", "Total Sales by Category", "Category"),
+]
+
+
+def make_cube(laptop_sales=800.0):
+    return pd.DataFrame(
+        {
+            "campaign_name": ["NO CAMPAIGN", "MAY SALE", "MAY SALE"],
+            "category": ["ELECTRONICS", "ELECTRONICS", "CLOTHING"],
+            "sale_amount_sum": [laptop_sales, 400.0, 39.1],
+        }
+    )
+
+
+class TestReportCharts(unittest.TestCase):
+
+    def setUp(self):
+        """A temporary output directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = pathlib.Path(self.tmp_dir.name).joinpath("results")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def render(self, cube_df, fmt="svg"):
+        return report_charts.render_charts(cube_df, self.output_dir, SPECS, fmt=fmt, workers=1)
+
+    def test_cuboid_rolls_up_and_sorts(self):
+        data = report_charts.cuboid(make_cube(), SPECS[1])
+        self.assertEqual(data.to_dict(), {"CLOTHING": 39.1, "ELECTRONICS": 1200.0})
+        self.assertEqual(data.index.tolist(), ["CLOTHING", "ELECTRONICS"])
+
+    def test_first_run_renders_every_chart(self):
+        results = self.render(make_cube())
+        self.assertEqual(set(results), {"sales_by_campaign", "sales_by_category"})
+        for path in results.values():
+            self.assertTrue(path.exists())
+        manifest = json.loads(self.output_dir.joinpath(report_charts.MANIFEST_FILE).read_text())
+        self.assertEqual(set(manifest), {"sales_by_campaign.svg", "sales_by_category.svg"})
+
+    def test_unchanged_charts_are_skipped(self):
+        self.render(make_cube())
+        results = self.render(make_cube())
+        self.assertEqual(results, {"sales_by_campaign": None, "sales_by_category": None})
+
+    def test_only_changed_cuboids_are_rendered(self):
+        self.render(make_cube())
+        changed = make_cube()
+        changed["campaign_name"] = ["NO CAMPAIGN", "NO CAMPAIGN", "MAY SALE"]  # same category totals
+        results = self.render(changed)
+        self.assertIsNotNone(results["sales_by_campaign"])
+        self.assertIsNone(results["sales_by_category"])
+
+    def test_missing_output_is_rendered_again(self):
+        first = self.render(make_cube())
+        first["sales_by_category"].unlink()
+        results = self.render(make_cube())
+        self.assertIsNone(results["sales_by_campaign"])
+        self.assertTrue(results["sales_by_category"].exists())
+
+    def test_format_is_part_of_the_hash(self):
+        self.render(make_cube())
+        results = self.render(make_cube(), fmt="png")
+        self.assertEqual(results["sales_by_campaign"].suffix, ".png")
+
+    def test_unreadable_manifest_renders_everything(self):
+        self.output_dir.mkdir(parents=True)
+        self.output_dir.joinpath(report_charts.MANIFEST_FILE).write_text("{not json")
+        results = self.render(make_cube())
+        self.assertTrue(all(path is not None for path in results.values()))
+
+    def test_unsupported_format_raises(self):
+        with self.assertRaises(ValueError):
+            self.render(make_cube(), fmt="gif")
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
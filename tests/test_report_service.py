@@ -0,0 +1,192 @@
+r"""
+tests/test_report_service.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_report_service.py
+    python3 tests\test_report_service.py
+
+This test suite verifies the report service's result cache, its invalidation and the HTTP endpoints.
+"""
+
+import unittest
+import json
+import pathlib
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from unittest import mock
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import etl_to_dw, referential_integrity, warehouse  # noqa: E402
+from scripts.olap_cubing import cube_version_path  # noqa: E402
+from scripts.report_service import ReportService, ResultCache, make_server  # noqa: E402
+
+PREPARED_FILES = {
+    "campaign_data_prepared.csv": "campaignid,campaignname,startdate,enddate\n"
+                                  "0,NO CAMPAIGN,0001-01-01,9999-12-31\n"
+                                  "1,MAY SALE,2024-05-07,2024-05-20\n",
+    "customers_data_prepared.csv": "customerid,name,region,loyaltypoints,gender,joindate\n"
+                                   "1001,WILLIAM WHITE,EAST,1025.0,M,2021-11-11\n"
+                                   "1002,WYLIE COYOTE,WEST,0.0,M,2023-02-14\n",
+    "products_data_prepared.csv": "productid,productname,category,unitprice,stock,supplier\n"
+                                  "101,LAPTOP,ELECTRONICS,793.12,36,ALIBABA\n",
+    "sales_data_prepared.csv": "transactionid,customerid,productid,storeid,campaignid,saleamount,bonuspoints,paymenttype,saledate\n"
+                               "550,1001,101,404,0,793.12,10,CREDIT,2024-01-06\n"
+                               "551,1002,101,403,1,100.00,20,CASH,2024-05-08\n",
+    "sales_new_prepared.csv": "transactionid,customerid,productid,storeid,campaignid,saleamount,bonuspoints,paymenttype,saledate\n"
+                              "552,1002,101,403,1,1586.24,20,CASH,2024-05-09\n",
+}
+CUBE_CSV = (
+    "sale_date,Month,campaign_name,category,sale_amount_sum,sale_amount_mean,sale_id_count,sale_ids\n"
+    "2024-01-06,1,NO CAMPAIGN,ELECTRONICS,793.12,793.12,1,[550]\n"
+    "2024-05-08,5,MAY SALE,ELECTRONICS,100.0,100.0,1,[551]\n"
+)
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResultCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), (True, 1))  # "b" is now the least recently used
+        cache.put("c", 3)
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.get("c"), (True, 3))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_clear(self):
+        cache = ResultCache()
+        cache.put("a", 1)
+        cache.clear()
+        self.assertEqual(cache.get("a"), (False, None))
+
+
+class ReportServiceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """A loaded warehouse and a published cube in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self.tmp_dir.name)
+        prepared_dir = root.joinpath("prepared")
+        prepared_dir.mkdir()
+        for name, text in PREPARED_FILES.items():
+            prepared_dir.joinpath(name).write_text(text)
+        self.db_path = root.joinpath("smart_sales.db")
+        self.patches = [
+            mock.patch.object(etl_to_dw, "DB_PATH", self.db_path),
+            mock.patch.object(etl_to_dw, "PREPARED_DATA_DIR", prepared_dir),
+            mock.patch.object(referential_integrity, "REJECTS_DIR", root.joinpath("rejects")),
+        ]
+        for patch in self.patches:
+            patch.start()
+        etl_to_dw.load_data_to_db()
+
+        self.cube_file = root.joinpath("cube.csv")
+        self.publish_cube(CUBE_CSV, "v1")
+        self.service = ReportService(self.cube_file, self.db_path)
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        warehouse.close_pools()
+        self.tmp_dir.cleanup()
+
+    def publish_cube(self, text, version):
+        self.cube_file.write_text(text)
+        cube_version_path(self.cube_file).write_text(version)
+
+
+class TestReportService(ReportServiceTestCase):
+
+    def test_repeat_queries_are_cached(self):
+        first = self.service.query("sales-by", dimension="category")
+        self.assertEqual(first, [{"category": "ELECTRONICS", "TotalSales": 893.12}])
+        self.assertIs(self.service.query("sales-by", dimension="category"), first)
+        self.assertEqual(self.service.cache.hits, 1)
+
+    def test_new_cube_version_clears_the_cache(self):
+        self.service.query("sales-by-campaign")
+        self.publish_cube(CUBE_CSV.replace("100.0,100.0", "250.0,250.0"), "v2")
+        result = self.service.query("sales-by-campaign")
+        self.assertEqual(self.service.version, "v2")
+        self.assertIn({"campaign_name": "MAY SALE", "TotalSales": 250.0}, result)
+
+    def test_sales_by_campaign_is_sorted_by_total(self):
+        self.publish_cube(CUBE_CSV.replace("100.0,100.0", "900.0,900.0"), "v2")
+        result = self.service.query("sales-by-campaign")
+        self.assertEqual([row["campaign_name"] for row in result], ["NO CAMPAIGN", "MAY SALE"])
+
+    def test_warehouse_queries_follow_new_sales(self):
+        before = self.service.query("top-customers", limit="1")
+        self.assertEqual(before[0]["name"], "WILLIAM WHITE")
+        etl_to_dw.load_new_sales_to_db("sales_new_prepared.csv")
+        after = self.service.query("top-customers", limit="1")
+        self.assertEqual(after[0]["name"], "WYLIE COYOTE", "An unchanged cube must not hide new sales")
+
+    def test_approximate_rereads_the_sample_after_new_sales(self):
+        before = self.service.query("approximate", by="campaign_name")
+        etl_to_dw.load_new_sales_to_db("sales_new_prepared.csv")
+        after = self.service.query("approximate", by="campaign_name")
+        total = {cell["campaign_name"]: cell["sale_amount_sum"] for cell in after["cells"]}
+        self.assertNotEqual(before, after)
+        self.assertAlmostEqual(total["MAY SALE"], 1686.24)
+
+    def test_invalid_parameters_raise(self):
+        with self.assertRaises(ValueError):
+            self.service.query("sales-by", dimension="store_id")
+        with self.assertRaises(ValueError):
+            self.service.query("top-customers", limit="ten")
+        with self.assertRaises(KeyError):
+            self.service.query("no-such-query")
+
+
+class TestReportEndpoints(ReportServiceTestCase):
+    """The same service behind the HTTP handler."""
+
+    def setUp(self):
+        super().setUp()
+        self.server = make_server(self.service, port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def get(self, path):
+        url = f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_health_and_version(self):
+        self.assertEqual(self.get("/health"), (200, {"status": "ok"}))
+        self.assertEqual(self.get("/version"), (200, {"version": "v1"}))
+
+    def test_query_endpoint(self):
+        status, body = self.get("/least-profitable-campaign")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["result"], {"campaign_name": "MAY SALE", "TotalSales": 100.0})
+
+    def test_errors(self):
+        self.assertEqual(self.get("/nothing")[0], 404)
+        self.assertEqual(self.get("/sales-by?dimension=store_id")[0], 400)
+        self.assertEqual(self.get("/top-customers?limit=ten")[0], 400)
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,145 @@
+r"""
+tests/test_sale_partitions.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_sale_partitions.py
+    python3 tests\test_sale_partitions.py
+
+This test suite verifies month-partitioned storage of the sale fact table.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import sale_partitions  # noqa: E402
+
+
+def make_sales(rows):
+    """Build a sales DataFrame with warehouse column names from (sale_id, sale_date, amount) rows."""
+    return pd.DataFrame(
+        [
+            {"sale_id": sale_id, "customer_id": 1001, "product_id": 101, "store_id": 401,
+             "campaign_id": 0, "sale_amount": amount, "sale_date": sale_date,
+             "date_key": int(sale_date.replace("-", "")),
+             "bonus_points": 0, "payment_type": "CASH"}
+            for sale_id, sale_date, amount in rows
+        ]
+    )
+
+
+class TestSalePartitions(unittest.TestCase):
+
+    def setUp(self):
+        """Load two months of sales into an in-memory warehouse."""
+        self.conn = sqlite3.connect(":memory:")
+        self.cursor = self.conn.cursor()
+        sales_df = make_sales([(1, "2024-01-05", 10.0), (2, "2024-01-20", 20.0), (3, "2024-02-03", 30.0)])
+        sale_partitions.write_partitions(sales_df, self.cursor)
+        sale_partitions.rebuild_sale_view(self.cursor)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def total(self):
+        return self.cursor.execute("SELECT COUNT(*), SUM(sale_amount) FROM sale").fetchone()
+
+    def test_view_covers_all_partitions(self):
+        self.assertEqual(sale_partitions.list_partitions(self.cursor), ["sale_2024_01", "sale_2024_02"])
+        self.assertEqual(self.total(), (3, 60.0), "sale view should union every partition")
+
+    def test_empty_shadow_source_needs_no_sale_view(self):
+        conn = sqlite3.connect(":memory:")
+        source = sale_partitions.sale_source(conn.cursor(), "__shadow")
+        cursor = conn.execute(f"SELECT * FROM {source}")
+        self.assertEqual([column[0] for column in cursor.description], sale_partitions.SALE_COLUMNS)
+        self.assertEqual(cursor.fetchall(), [])
+        conn.close()
+
+    def test_append_keeps_sales_for_every_month(self):
+        new_sales = make_sales([(1, "2024-01-05", 99.0), (3, "2024-02-03", 35.0), (4, "2024-03-01", 40.0)])
+        written = sale_partitions.append_sales(new_sales, self.cursor)
+        self.assertEqual(written, {"sale_2024_01": 1, "sale_2024_02": 1, "sale_2024_03": 1})
+        self.assertEqual(self.total(), (4, 194.0), "Late sales for old months are kept, not dropped")
+
+    def test_range_prunes_partitions(self):
+        partitions = sale_partitions.list_partitions(self.cursor)
+        sql, params = sale_partitions.sale_source_sql(partitions, "2024-02-01", "2024-02-28")
+        self.assertNotIn("sale_2024_01", sql, "January partition should be pruned")
+        count = self.cursor.execute(f"SELECT COUNT(*) FROM {sql}", params).fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_appends_are_staged_until_compaction(self):
+        sale_partitions.append_sales(make_sales([(3, "2024-02-03", 35.0), (4, "2024-03-01", 40.0)]), self.cursor)
+        self.assertEqual(self.cursor.execute("SELECT SUM(sale_amount) FROM sale_2024_02").fetchone(), (30.0,))
+        self.assertEqual(sale_partitions.delta_rows(self.cursor), 2)
+        self.assertEqual(self.total(), (4, 105.0), "The view should show staged rows over the rows they replace")
+
+        merged = sale_partitions.compact_delta(self.cursor)
+        self.assertEqual(merged, {"sale_2024_02": 1, "sale_2024_03": 1})
+        self.assertEqual(sale_partitions.delta_rows(self.cursor), 0)
+        self.assertEqual(self.total(), (4, 105.0), "Compaction should not change what readers see")
+        self.assertEqual(self.cursor.execute("SELECT SUM(sale_amount) FROM sale_2024_02").fetchone(), (35.0,))
+        indexes = {name for (name,) in self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_sale_2024_03_date_key", indexes)
+
+    def test_newest_staged_row_wins(self):
+        sale_partitions.append_sales(make_sales([(3, "2024-02-03", 35.0)]), self.cursor)
+        sale_partitions.append_sales(make_sales([(3, "2024-02-03", 36.0)]), self.cursor)
+        self.assertEqual(self.total(), (3, 66.0))
+        sale_partitions.compact_delta(self.cursor)
+        self.assertEqual(self.total(), (3, 66.0))
+
+    def test_late_sales_are_compacted_into_old_months(self):
+        sale_partitions.append_sales(make_sales([(4, "2024-03-01", 40.0)]), self.cursor)
+        sale_partitions.append_sales(make_sales([(5, "2024-01-10", 50.0)]), self.cursor)
+        sale_partitions.compact_delta(self.cursor)
+        self.assertEqual(self.cursor.execute("SELECT sale_id FROM sale_2024_01 ORDER BY sale_id").fetchall(),
+                         [(1,), (2,), (5,)])
+
+    def test_resent_sale_moves_to_its_new_month(self):
+        new_sales = make_sales([(2, "2024-02-05", 25.0)])
+        accepted_df, replaced_df = sale_partitions.pending_changes(new_sales, self.cursor)
+        self.assertEqual(replaced_df["date_key"].tolist(), [20240120], "The January row is replaced")
+        sale_partitions.append_sales(new_sales, self.cursor)
+        rows = self.cursor.execute("SELECT sale_id, date_key FROM sale WHERE sale_id = 2").fetchall()
+        self.assertEqual(rows, [(2, 20240205)])
+        self.assertEqual(self.total(), (3, 65.0))
+
+        sale_partitions.compact_delta(self.cursor)
+        rows = self.cursor.execute("SELECT sale_id, date_key FROM sale WHERE sale_id = 2").fetchall()
+        self.assertEqual(rows, [(2, 20240205)], "Compaction removes the row from its old month")
+        self.assertEqual(self.cursor.execute("SELECT COUNT(*) FROM sale_2024_01").fetchone(), (1,))
+
+    def test_pending_changes_keep_the_last_row_per_sale(self):
+        new_sales = make_sales([(4, "2024-03-01", 40.0), (4, "2024-03-02", 41.0)])
+        accepted_df, replaced_df = sale_partitions.pending_changes(new_sales, self.cursor)
+        self.assertEqual(accepted_df["sale_amount"].tolist(), [41.0])
+        sale_partitions.append_sales(new_sales, self.cursor)
+        self.assertEqual(self.total(), (4, 101.0))
+
+    def test_range_includes_staged_sales(self):
+        sale_partitions.append_sales(make_sales([(4, "2024-03-01", 40.0), (3, "2024-02-03", 35.0)]), self.cursor)
+        partitions = sale_partitions.list_partitions(self.cursor)
+        sql, params = sale_partitions.sale_source_sql(partitions, "2024-02-01", "2024-03-31")
+        rows = self.cursor.execute(f"SELECT sale_id, sale_amount FROM {sql} ORDER BY sale_id", params).fetchall()
+        self.assertEqual(rows, [(3, 35.0), (4, 40.0)])
+
+    def test_pending_changes_see_staged_rows(self):
+        sale_partitions.append_sales(make_sales([(3, "2024-02-03", 35.0)]), self.cursor)
+        accepted_df, replaced_df = sale_partitions.pending_changes(make_sales([(3, "2024-02-03", 36.0)]), self.cursor)
+        self.assertEqual(replaced_df["sale_amount"].tolist(), [35.0])
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,114 @@
+r"""
+tests/test_sale_sample.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_sale_sample.py
+    python3 tests\test_sale_sample.py
+
+This test suite verifies the stratified sale sample kept by the ETL.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import sale_partitions, sale_sample  # noqa: E402
+from scripts.warehouse import read_table_sql  # noqa: E402
+
+
+def make_sales(sale_ids, campaign_id=0, product_id=101, amount=10.0, sale_date="2024-01-05"):
+    """Build sales (in January by default) with warehouse column names."""
+    return pd.DataFrame(
+        [
+            {"sale_id": sale_id, "customer_id": 1001, "product_id": product_id, "store_id": 401,
+             "campaign_id": campaign_id, "sale_amount": amount, "sale_date": sale_date,
+             "date_key": int(sale_date.replace("-", "")), "bonus_points": 0, "payment_type": "CASH"}
+            for sale_id in sale_ids
+        ]
+    )
+
+
+class TestSaleSample(unittest.TestCase):
+
+    def setUp(self):
+        """An in-memory warehouse with two products (two categories) and no sales yet."""
+        self.conn = sqlite3.connect(":memory:")
+        self.cursor = self.conn.cursor()
+        for table_name in ["product", "sale_stratum", "sale_sample"]:
+            self.cursor.execute(read_table_sql(table_name))
+        self.cursor.executemany(
+            "INSERT INTO product (product_id, category) VALUES (?, ?)", [(101, "CLOTHING"), (102, "SPORTS")]
+        )
+        sale_partitions.rebuild_sale_view(self.cursor)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def load(self, sales_df):
+        accepted_df, replaced_df = sale_partitions.pending_changes(sales_df, self.cursor)
+        sale_partitions.append_sales(sales_df, self.cursor)
+        sale_sample.apply_sales_delta(self.cursor, accepted_df, replaced_df, sample_size=5)
+
+    def snapshot(self):
+        strata = self.cursor.execute("SELECT stratum, population FROM sale_stratum ORDER BY stratum").fetchall()
+        sample = self.cursor.execute("SELECT sale_id FROM sale_sample ORDER BY sale_id").fetchall()
+        return strata, sample
+
+    def test_rebuild_keeps_sample_size_per_stratum(self):
+        sales_df = pd.concat([make_sales(range(1, 21)), make_sales(range(21, 24), product_id=102)])
+        sale_partitions.append_sales(sales_df, self.cursor)
+        sale_sample.rebuild_sale_sample(self.cursor, sample_size=5)
+        strata, sample = self.snapshot()
+        self.assertEqual(strata, [("0/CLOTHING", 20), ("0/SPORTS", 3)])
+        self.assertEqual(len(sample), 8, "5 sales from the large stratum and all 3 from the small one")
+
+    def test_incremental_loads_match_rebuild(self):
+        self.load(make_sales(range(1, 16)))
+        self.load(pd.concat([make_sales(range(16, 31)), make_sales(range(31, 34), product_id=102)]))
+        incremental = self.snapshot()
+        sale_sample.rebuild_sale_sample(self.cursor, sample_size=5)
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_replaced_sales_move_strata(self):
+        self.load(make_sales(range(1, 4)))
+        self.load(make_sales([2], campaign_id=1))
+        strata, sample = self.snapshot()
+        self.assertEqual(strata, [("0/CLOTHING", 2), ("1/CLOTHING", 1)])
+        self.assertEqual(len(sample), 3)
+
+    def test_sale_resent_in_another_month_is_sampled_once(self):
+        self.load(make_sales(range(1, 4)))
+        self.load(make_sales([2], product_id=102, sale_date="2024-02-10"))
+        strata, sample = self.snapshot()
+        self.assertEqual(strata, [("0/CLOTHING", 2), ("0/SPORTS", 1)])
+        self.assertEqual(sample, [(1,), (2,), (3,)], "One sample row per sale")
+
+        sale_partitions.compact_delta(self.cursor)
+        sale_sample.rebuild_sale_sample(self.cursor, sample_size=5)
+        self.assertEqual((strata, sample), self.snapshot(), "The rebuild sees each sale once too")
+
+    def test_repeated_sale_in_a_batch_counts_once(self):
+        self.load(pd.concat([make_sales([1, 2]), make_sales([2], product_id=102)]))
+        strata, sample = self.snapshot()
+        self.assertEqual(strata, [("0/CLOTHING", 1), ("0/SPORTS", 1)])
+        self.assertEqual(len(sample), 2)
+
+    def test_priority_is_fixed_and_uniform(self):
+        self.assertEqual(sale_sample.sample_priority(42), sale_sample.sample_priority(42))
+        priorities = [sale_sample.sample_priority(sale_id) for sale_id in range(10_000)]
+        self.assertTrue(all(0 <= priority < 1 for priority in priorities))
+        self.assertAlmostEqual(sum(priorities) / len(priorities), 0.5, delta=0.02)
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
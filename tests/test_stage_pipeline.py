@@ -0,0 +1,83 @@
+r"""
+tests/test_stage_pipeline.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_stage_pipeline.py
+    python3 tests\test_stage_pipeline.py
+
+This test suite verifies the bounded-queue read/transform/write pipeline.
+"""
+
+import unittest
+import pathlib
+import sys
+import threading
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.stage_pipeline import run_stages  # noqa: E402
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+class TestStagePipeline(unittest.TestCase):
+
+    def test_results_are_written_in_order(self):
+        written = []
+        run_stages(range(20), square, written.append)
+        self.assertEqual(written, [value * value for value in range(20)])
+
+    def test_results_are_written_in_order_with_worker_processes(self):
+        written = []
+        run_stages(range(10), square, written.append, workers=2)
+        self.assertEqual(written, [value * value for value in range(10)])
+
+    def test_reader_is_held_back_by_a_slow_writer(self):
+        read, release = [], threading.Event()
+
+        def items():
+            for value in range(50):
+                read.append(value)
+                yield value
+
+        def slow_write(value):
+            release.wait(timeout=5)
+
+        worker = threading.Thread(target=run_stages, args=(items(), square, slow_write), kwargs={"queue_size": 2})
+        worker.start()
+        worker.join(timeout=0.5)
+        # write queue (2) + read queue (2) + one item in each stage, not the whole source
+        self.assertLessEqual(len(read), 8)
+        release.set()
+        worker.join(timeout=5)
+        self.assertEqual(len(read), 50)
+
+    def test_errors_in_any_stage_are_raised(self):
+        def bad_items():
+            yield 1
+            raise OSError("read failed")
+
+        def bad_transform(value):
+            raise ValueError("clean failed")
+
+        def bad_write(value):
+            raise IOError("write failed")
+
+        with self.assertRaises(OSError):
+            run_stages(bad_items(), square, lambda value: None)
+        with self.assertRaises(ValueError):
+            run_stages(range(10), bad_transform, lambda value: None)
+        with self.assertRaises(IOError):
+            run_stages(range(10), square, bad_write)
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,95 @@
+r"""
+tests/test_validation_rules.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_validation_rules.py
+    python3 tests\test_validation_rules.py
+
+This test suite verifies the declarative validation rule engine.
+"""
+
+import unittest
+import pathlib
+import sys
+import tempfile
+from unittest import mock
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import referential_integrity  # noqa: E402
+from scripts.validation_rules import (  # noqa: E402
+    apply_rules,
+    cross_column_rule,
+    enum_rule,
+    evaluate_rules,
+    range_rule,
+    referential_rule,
+    regex_rule,
+)
+
+sales_df = pd.DataFrame(
+    {
+        "saleamount": [10.0, -1.0, 5.0, None, 7.5],
+        "bonuspoints": [1, 2, -3, 4, 5],
+        "paymenttype": ["CREDIT", "CASH", "CHECK", "BARTER", "CASH"],
+        "storeid": ["S01", "S02", "X", "S04", "S05"],
+        "productid": [101, 102, 103, 999, 101],
+        "startkey": [1, 5, 3, 2, 2],
+        "endkey": [2, 4, 3, 3, 9],
+    }
+)
+
+rules = [
+    range_rule("saleamount", min_value=0),
+    range_rule("bonuspoints", min_value=0),
+    enum_rule("paymenttype", ["CREDIT", "CASH", "CHECK"]),
+    regex_rule("storeid", r"S\d{2}"),
+    referential_rule("productid", [101, 102, 103]),
+    cross_column_rule("start_before_end", lambda df: df["startkey"] <= df["endkey"]),
+]
+
+
+class TestValidationRules(unittest.TestCase):
+
+    def test_evaluate_rules_counts_each_rule(self):
+        violations, counts = evaluate_rules(sales_df, rules)
+        self.assertEqual(violations.shape, (5, 6))
+        self.assertEqual(
+            counts,
+            {
+                "saleamount_range": 2,
+                "bonuspoints_range": 1,
+                "paymenttype_enum": 1,
+                "storeid_format": 1,
+                "productid_reference": 1,
+                "start_before_end": 1,
+            },
+        )
+
+    def test_apply_rules_keeps_only_valid_rows(self):
+        valid_df = apply_rules(sales_df, rules)
+        self.assertEqual(valid_df.index.tolist(), [0, 4])
+
+    def test_apply_rules_returns_frame_when_all_valid(self):
+        clean_df = sales_df.loc[[0, 4]]
+        self.assertIs(apply_rules(clean_df, rules), clean_df)
+
+    def test_quarantine_file_lists_only_the_latest_violations(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            rejects_dir = pathlib.Path(tmp_dir)
+            with mock.patch.object(referential_integrity, "REJECTS_DIR", rejects_dir):
+                apply_rules(sales_df, rules, "sales_quarantine.csv")
+                self.assertEqual(len(pd.read_csv(rejects_dir.joinpath("sales_quarantine.csv"))), 3)
+                apply_rules(sales_df.loc[[0, 4]], rules, "sales_quarantine.csv")
+                self.assertFalse(rejects_dir.joinpath("sales_quarantine.csv").exists())
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
@@ -0,0 +1,92 @@
+r"""
+tests/test_warehouse.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_warehouse.py
+    python3 tests\test_warehouse.py
+
+This test suite verifies the shared warehouse connection helpers.
+"""
+
+import unittest
+import pathlib
+import sqlite3
+import sys
+import tempfile
+import threading
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.warehouse import ReadOnlyConnectionPool, read_sql, writer_connection, close_pools  # noqa: E402
+
+
+class TestWarehouse(unittest.TestCase):
+
+    def setUp(self):
+        """Create a small warehouse file through the writer connection."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = pathlib.Path(self.tmp_dir.name).joinpath("test.db")
+        with writer_connection(self.db_path) as conn:
+            conn.execute("CREATE TABLE sale (sale_id INTEGER PRIMARY KEY, sale_amount REAL)")
+            conn.executemany("INSERT INTO sale VALUES (?, ?)", [(1, 10.0), (2, 20.0), (3, 30.0)])
+
+    def tearDown(self):
+        close_pools()
+        self.tmp_dir.cleanup()
+
+    def test_writer_enables_wal(self):
+        conn = sqlite3.connect(self.db_path)
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+        self.assertEqual(mode, "wal", "Writer connection should switch the database to WAL mode")
+
+    def test_writer_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with writer_connection(self.db_path) as conn:
+                conn.execute("DELETE FROM sale")
+                raise RuntimeError("load failed")
+        df = read_sql("SELECT COUNT(*) AS n FROM sale", db_path=self.db_path)
+        self.assertEqual(df["n"][0], 3, "Failed load should leave existing rows in place")
+
+    def test_pool_connections_are_read_only(self):
+        pool = ReadOnlyConnectionPool(self.db_path, size=1)
+        with pool.connection() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM sale")
+        pool.close()
+
+    def test_pool_reuses_connections(self):
+        pool = ReadOnlyConnectionPool(self.db_path, size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        self.assertIs(first, second, "Released connection should be reused")
+        pool.close()
+
+    def test_pool_concurrent_readers(self):
+        pool = ReadOnlyConnectionPool(self.db_path, size=2)
+        totals = []
+
+        def reader():
+            with pool.connection() as conn:
+                totals.append(conn.execute("SELECT SUM(sale_amount) FROM sale").fetchone()[0])
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(totals, [60.0] * 8, "Every reader should see the full table")
+        self.assertLessEqual(pool._opened, 2, "Pool should not open more than its size")
+        pool.close()
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,75 @@
+r"""
+tests/test_watch_ingest.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_watch_ingest.py
+    python3 tests\test_watch_ingest.py
+
+This test suite verifies how the watch-folder ingestion picks up new files.
+"""
+
+import unittest
+import os
+import pathlib
+import sys
+import tempfile
+import time
+from unittest import mock
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import watch_ingest  # noqa: E402
+
+
+class TestWatchIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.raw_dir = pathlib.Path(self.tmp_dir.name)
+        patcher = mock.patch.object(watch_ingest, "RAW_DATA_DIR", self.raw_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ledger = watch_ingest.IngestLedger(self.raw_dir.joinpath(".ingested.json"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def drop_file(self, name: str, age_s: float) -> pathlib.Path:
+        path = self.raw_dir.joinpath(name)
+        path.write_text("TransactionID,SaleDate\n1,10/18/2026\n")
+        stamp = time.time() - age_s
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def test_only_settled_sales_files_are_picked_up(self):
+        settled = self.drop_file("sales_store1.csv", age_s=60)
+        self.drop_file("sales_store2.csv", age_s=0)
+        self.drop_file("products_data.csv", age_s=60)
+        self.assertEqual(watch_ingest.find_new_files(self.ledger), [settled])
+
+    def test_ingested_files_are_skipped_until_changed(self):
+        path = self.drop_file("sales_store1.csv", age_s=60)
+        self.ledger.record(path)
+        self.assertEqual(watch_ingest.find_new_files(self.ledger), [])
+
+        path.write_text("TransactionID,SaleDate\n1,10/18/2026\n2,10/19/2026\n")
+        os.utime(path, (time.time() - 60, time.time() - 60))
+        self.assertEqual(watch_ingest.find_new_files(self.ledger), [path])
+
+    def test_failed_file_is_retried(self):
+        self.drop_file("sales_store1.csv", age_s=60)
+        with mock.patch.object(watch_ingest, "ingest_file", side_effect=RuntimeError("boom")):
+            self.assertEqual(watch_ingest.poll_once(self.ledger), 0)
+        with mock.patch.object(watch_ingest, "ingest_file"):
+            self.assertEqual(watch_ingest.poll_once(self.ledger), 1)
+            self.assertEqual(watch_ingest.poll_once(self.ledger), 0)
+
+
+if __name__ == "__main__":
+    # Run the tests with verbosity=2 for detailed output
+    unittest.main(verbosity=2)
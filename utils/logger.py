@@ -19,11 +19,9 @@ PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent  # Navigate to the
 LOG_FOLDER: pathlib.Path = PROJECT_ROOT.joinpath("logs")  # Directory where logs will be stored
 LOG_FILE: pathlib.Path = LOG_FOLDER.joinpath("project_log.log")  # Path to the log file
 
-# Ensure the log folder exists or create it
-LOG_FOLDER.mkdir(exist_ok=True)
-
 # Configure Loguru to write to the log file
-logger.add(LOG_FILE, level="INFO")
+# delay=True opens the file (creating the log folder) on the first message, not on import
+logger.add(LOG_FILE, level="INFO", delay=True)
 
 # Optionally, add console output for logging (Uncomment the following line if needed)
 # logger.add(sys.stderr, level="DEBUG")